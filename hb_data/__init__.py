@@ -1,6 +1,11 @@
 from loguru import logger as _logger
 
 from . import gi, hsr, zzz
+from .common.cache_compression import CacheCompression
+from .common.instrumentation import Instrumentation, PrometheusInstrumentation
+from .common.peer import PeerCacheServer
+from .common.table_store import SQLiteTableStore, TableStore
+from .common.text_map import TextMapMode
 from .gi import GIClient
 from .hsr import HSRClient
 from .zzz import ZZZClient
@@ -1,32 +1,167 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import itertools
 import uuid
 from pathlib import Path
-from typing import TYPE_CHECKING, ClassVar, Self
+from typing import TYPE_CHECKING, Any, ClassVar, Self, cast
 
 import aiofiles
 import aiofiles.os
 import aiohttp
 import orjson
+from aiohttp import hdrs
 from loguru import logger
+from pydantic_core import to_json
+from yarl import URL
+
+from hb_data.common.cache_compression import (
+    CacheCompression,
+    CacheEncoder,
+    decompress,
+    ensure_supported,
+    is_compressed,
+    read_file,
+)
+from hb_data.common.dict_utils import Join, Key, index_by
+from hb_data.common.generation import DataGeneration, GenerationAttribute, get_pinned, pin, unpin
+from hb_data.common.instrumentation import Counter, Instrumentation, Stage
+from hb_data.common.localized import Translator
+from hb_data.common.manifest import Manifest, ManifestEntry
+from hb_data.common.scheduler import DownloadResult, DownloadScheduler, DownloadStatus
+from hb_data.common.snapshot import (
+    SNAPSHOT_FILE_NAME,
+    get_fingerprint,
+    read_snapshot,
+    write_snapshot,
+)
+from hb_data.common.text_map import CompactTextMaps, TextMapCache, TextMapMode
+from hb_data.common.text_map_file import MappedTextMap, ensure_text_map_file, get_text_map_file_path
+from hb_data.common.warm_cache import (
+    WARM_CACHE_FILE_NAME,
+    publish_warm_cache,
+    read_generation,
+    read_warm_cache,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Generator, Iterable, Mapping, Sequence
+    from contextlib import AbstractContextManager
+    from enum import StrEnum
     from os import PathLike
 
-    from yarl import URL
+    from hb_data.common.parsing import ParseExecutor
+    from hb_data.common.table_store import TableStore
+
+_STREAM_CHUNK_SIZE = 64 * 1024
 
 
-class BaseClient:
+class BaseClient[L: StrEnum]:  # ruff: ignore[too-many-public-methods]
+    """A game's client, parametrized by the game's text map language enum."""
+
     _FILE_CACHE: ClassVar[dict[str, dict]] = {}
+    _GAME: ClassVar[str]
+    _LANGUAGE: ClassVar[type[StrEnum]]
+    _UPSTREAM_BASE_URL: ClassVar[URL]
+    _TEXT_MAP_URL: ClassVar[URL]
+    _DATA_PATH: ClassVar[str]
+    """The directory of the data tables under the upstream URL."""
+    _DATA_FILE_NAMES: ClassVar[tuple[str, ...]]
+    _USE_SNAPSHOT: ClassVar[bool] = False
+    """Whether snapshots are used by default, only where reading the snapshot beats the JSON."""
+
+    # What the client read lives on its current generation, see `refresh`
+    _data_version = GenerationAttribute()
+    _data = GenerationAttribute()
+    _text_maps = GenerationAttribute()
+    _text_map_store = GenerationAttribute()
+    _mapped_text_maps = GenerationAttribute()
+    _catalogs = GenerationAttribute()
+    _published_catalogs = GenerationAttribute()
+    _materialized = GenerationAttribute()
+    _checked_tables = GenerationAttribute()
+    _snapshot_fingerprint = GenerationAttribute()
 
-    def __init__(self) -> None:
+    def __init__(  # ruff: ignore[too-many-arguments]
+        self,
+        *,
+        scheduler: DownloadScheduler | None = None,
+        parser: ParseExecutor | None = None,
+        use_snapshot: bool | None = None,
+        lazy: bool = False,
+        text_map_mode: TextMapMode = TextMapMode.EAGER,
+        text_map_budget: int | None = None,
+        instrumentation: Instrumentation | None = None,
+        upstream_url: URL | str | None = None,
+        text_map_url: URL | str | None = None,
+        table_store: TableStore | None = None,
+        refresh_interval: float | None = None,
+        cache_compression: CacheCompression | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            scheduler: A download scheduler to share with other clients, one is created otherwise.
+            parser: An executor to parse large JSON files in, and to share with other clients.
+                Files are parsed on the event loop otherwise.
+            use_snapshot: Load and save a snapshot of everything ``download()`` reads. Defaults
+                to ZZZ only, whose deobfuscated tables are faster to read from it, GI and HSR
+                start up as fast or faster from their JSON files.
+            lazy: Don't download anything on enter, read data tables on first use.
+            text_map_mode: How text maps are read and held in memory. Lazily read text maps
+                are kept out of ``_FILE_CACHE``, compact ones are packed into a
+                `CompactTextMaps`, which shares the hash keys between languages, and mapped
+                ones are converted to binary files that processes on a host share through
+                the page cache.
+            text_map_budget: In lazy mode, the approximate memory in bytes the loaded text maps
+                may hold before the least recently used language is evicted.
+            instrumentation: Receives timed spans of every stage of getting data and counts
+                of cache hits and misses, nothing is measured otherwise.
+            upstream_url: Where to download data tables from instead of the game's
+                ``UPSTREAM_BASE_URL``, e.g. a `PeerCacheServer` another node runs.
+            text_map_url: Where to download text maps from instead of the game's
+                ``TEXT_MAP_URL``.
+            table_store: Keep the data tables in this store, e.g. a `SQLiteTableStore`,
+                instead of in memory. Rows are then looked up through the store's indexes.
+            refresh_interval: Call `refresh` in the background every this many seconds, from
+                ``start()`` until ``close()``.
+            cache_compression: Compress downloaded files in the data directory, plain and
+                compressed files are both read either way.
+        """
+        ensure_supported(cache_compression)
         self._session: aiohttp.ClientSession | None = None
-        self._data_dir = Path(".hb_data")
+        self._owns_scheduler = scheduler is None
+        self._scheduler = scheduler or DownloadScheduler()
+        self._parser = parser
+        self._data_dir = Path(".hb_data") / self._GAME
+        self._manifest: Manifest | None = None
+        self._use_snapshot = self._USE_SNAPSHOT if use_snapshot is None else use_snapshot
+        self._warm_cache_generation = 0
+        self._live_generation = DataGeneration()
+        self._data_versions = itertools.count(1)
+        self._lazy = lazy
+        self._text_map_mode = text_map_mode
+        self._text_map_cache = TextMapCache(self._load_text_map, budget=text_map_budget)
+        # Text map file paths by language, built on first use so lazy lookups skip URL building
+        self._text_map_paths: dict[Any, Path] = {}
+        # The text map languages download() and prepare() read, None for all of them. Empty until
+        # they're called, which refresh() treats like all of them too.
+        self._read_langs: set[Any] | None = set()
+        self._instrumentation = instrumentation or Instrumentation()
+        self._upstream_url = self._UPSTREAM_BASE_URL if upstream_url is None else URL(upstream_url)
+        self._text_map_url = self._TEXT_MAP_URL if text_map_url is None else URL(text_map_url)
+        self._table_store = table_store
+        self._refresh_interval = refresh_interval
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._cache_compression = cache_compression
 
     async def __aenter__(self) -> Self:
         await self.start()
+        if not self._lazy:
+            await self.download()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # ruff: ignore[missing-type-function-argument]
@@ -39,11 +174,79 @@ class BaseClient:
             raise RuntimeError(msg)
         return self._session
 
+    @property
+    def scheduler(self) -> DownloadScheduler:
+        return self._scheduler
+
+    @property
+    def data_version(self) -> int:
+        """A token that changes whenever the client's tables or text maps change."""
+        return self._data_version
+
+    @property
+    def _generation(self) -> DataGeneration:
+        """The generation the client resolves to, the one it's pinned to or the live one."""
+        return get_pinned(self) or self._live_generation
+
+    @contextlib.contextmanager
+    def _pinned(self, generation: DataGeneration | None = None) -> Generator[DataGeneration]:
+        """Resolve the client to one generation in the block, the current one by default.
+
+        The generation stays open until the block exits, even if a refresh replaces it.
+        """
+        generation = generation or self._generation
+        # A refresh can retire the current generation right before it's pinned, pin its successor
+        while not generation.acquire():
+            generation = self._generation
+        token = pin(self, generation)
+        try:
+            yield generation
+        finally:
+            unpin(token)
+            generation.release()
+
+    def _bump_data_version(self) -> None:
+        generation = self._generation
+        generation.data_version = next(self._data_versions)
+        generation.catalogs.clear()
+        generation.published_catalogs.clear()
+        generation.materialized.clear()
+
+    def _span(
+        self, stage: Stage, *, table: str | None = None, lang: Any = None
+    ) -> AbstractContextManager[object]:
+        return self._instrumentation.span(
+            stage, game=self._GAME, table=table, lang=None if lang is None else str(lang)
+        )
+
+    def _count(self, counter: Counter, *, table: str | None = None, lang: Any = None) -> None:
+        self._instrumentation.count(
+            counter, game=self._GAME, table=table, lang=None if lang is None else str(lang)
+        )
+
+    def _materialize[T](self, key: str, builder: Callable[[], T]) -> T:
+        """Build a value derived from the client's data at most once per data version."""
+        if key not in self._materialized:
+            self._materialized[key] = builder()
+        return self._materialized[key]
+
     async def start(self) -> None:
-        self._session = aiohttp.ClientSession()
+        self._session = aiohttp.ClientSession(
+            connector=self._scheduler.connector, connector_owner=False
+        )
+        if self._refresh_interval is not None and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._auto_refresh(self._refresh_interval))
 
     async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
         await self.session.close()
+        self._live_generation.close()
+        if self._owns_scheduler:
+            await self._scheduler.close()
 
     def _create_filename_from_url(self, url: URL) -> str:
         return url.parts[-1]
@@ -51,32 +254,93 @@ class BaseClient:
     def _get_file_path(self, url: URL) -> Path:
         return self._data_dir / self._create_filename_from_url(url)
 
-    async def _download_file(self, url: URL, file_path: PathLike) -> None:
+    async def _get_manifest(self) -> Manifest:
+        if self._manifest is None:
+            self._manifest = await Manifest.load(self._data_dir)
+        return self._manifest
+
+    async def _get_conditional_headers(self, url: URL, file_path: Path) -> dict[str, str]:
+        """Build revalidation headers for a cached file, if it still matches the manifest."""
+        entry = (await self._get_manifest()).get(url)
+        if entry is None:
+            return {}
+
+        try:
+            stat = await aiofiles.os.stat(file_path)
+        except FileNotFoundError:
+            return {}
+        if entry.size is not None and stat.st_size != entry.size:
+            # The cached file no longer matches what upstream sent, don't trust it.
+            return {}
+
+        headers: dict[str, str] = {}
+        if entry.etag is not None:
+            headers[hdrs.IF_NONE_MATCH] = entry.etag
+        if entry.last_modified is not None:
+            headers[hdrs.IF_MODIFIED_SINCE] = entry.last_modified
+        return headers
+
+    async def _download_file(
+        self, url: URL, file_path: PathLike, *, revalidate: bool = False
+    ) -> DownloadStatus:
         file_path = Path(file_path)
 
         await asyncio.to_thread(file_path.parent.mkdir, parents=True, exist_ok=True)
 
         temp_filename = f".tmp_{uuid.uuid4().hex}_{file_path.name}"
         temp_path = file_path.parent / temp_filename
+        manifest = await self._get_manifest()
+        headers = await self._get_conditional_headers(url, file_path) if revalidate else {}
+
+        # aiohttp asks for gzip and deflate transfer encoding by default and decodes it. A gzip
+        # cache asks for gzip only and keeps it encoded, it's written to disk as is.
+        passthrough = self._cache_compression is CacheCompression.GZIP
+        request_headers = {**headers, hdrs.ACCEPT_ENCODING: "gzip"} if passthrough else headers
+        encoder = CacheEncoder(self._cache_compression)
 
         try:
             logger.debug(f"Downloading {url} to {file_path}...")
 
-            async with self.session.get(url) as resp:
-                if resp.status != 200:
-                    logger.error(f"Failed to download {url}: HTTP {resp.status}")
-                    return
+            with self._span(Stage.DOWNLOAD, table=file_path.stem):
+                async with self.session.get(
+                    url, headers=request_headers, auto_decompress=not passthrough
+                ) as resp:
+                    if resp.status == 304 and headers:
+                        logger.debug(f"{url} not modified, keeping {file_path}.")
+                        return DownloadStatus.NOT_MODIFIED
+                    resp.raise_for_status()
+
+                    encoding = resp.headers.get(hdrs.CONTENT_ENCODING, "identity")
+                    if passthrough and encoding not in {"identity", "gzip"}:
+                        msg = f"Unexpected Content-Encoding {encoding!r} from {url}"
+                        raise ValueError(msg)
 
-                async with aiofiles.open(temp_path, mode="wb") as f:
-                    async for chunk in resp.content.iter_chunked(1024):
-                        await f.write(chunk)
+                    size = 0
+                    async with aiofiles.open(temp_path, mode="wb") as f:
+                        async for chunk in resp.content.iter_chunked(_STREAM_CHUNK_SIZE):
+                            data = (
+                                encoder.encode(chunk)
+                                if self._cache_compression is None
+                                else await asyncio.to_thread(encoder.encode, chunk)
+                            )
+                            await f.write(data)
+                            size += len(data)
+                        data = encoder.flush()
+                        await f.write(data)
+                        size += len(data)
+
+                    entry = ManifestEntry(
+                        etag=resp.headers.get(hdrs.ETAG),
+                        last_modified=resp.headers.get(hdrs.LAST_MODIFIED),
+                        size=size,
+                    )
 
             await aiofiles.os.replace(temp_path, file_path)
             BaseClient._FILE_CACHE.pop(str(file_path.absolute()), None)
-
-        except Exception as e:
-            logger.error(f"Failed to download {url}: {e}")
-            raise
+            self._text_map_cache.discard(file_path)
+            self._bump_data_version()
+            manifest.set(url, entry)
+            return DownloadStatus.DOWNLOADED
 
         finally:
             if await aiofiles.os.path.exists(temp_path):
@@ -85,30 +349,801 @@ class BaseClient:
                 except Exception as e:
                     logger.error(f"Failed to remove temporary file {temp_path}: {e}")
 
-    async def _download_files(self, urls: Sequence[URL], *, force: bool = False) -> None:
-        async with asyncio.TaskGroup() as tg:
-            for url in urls:
-                file_path = self._get_file_path(url)
-                if not force and await aiofiles.os.path.exists(file_path):
-                    logger.debug(f"File {file_path} already exists, skipping download.")
-                    continue
-                tg.create_task(self._download_file(url, file_path))
+    async def _schedule_download(
+        self, url: URL, file_path: Path, *, revalidate: bool
+    ) -> DownloadResult:
+        try:
+            status = await self._scheduler.run(
+                url, lambda: self._download_file(url, file_path, revalidate=revalidate)
+            )
+        except Exception as e:
+            logger.error(f"Failed to download {url}: {e!r}")
+            return DownloadResult(url, file_path, DownloadStatus.FAILED, e)
+        return DownloadResult(url, file_path, status)
+
+    async def _download_files(
+        self, urls: Sequence[URL], *, force: bool = False, refresh: bool = False
+    ) -> list[DownloadResult]:
+        """Download files into the data directory.
+
+        A failed file does not affect the others; check the returned results for failures.
+
+        Args:
+            urls: The URLs to download.
+            force: Re-download every file, even if it is already cached.
+            refresh: Revalidate cached files against upstream with conditional requests and
+                only rewrite the ones that changed. Missing files are downloaded as usual.
+
+        Returns:
+            One result per URL, in the same order as ``urls``.
+        """
+        manifest = await self._get_manifest()
+        results: list[DownloadResult | None] = [None] * len(urls)
+        tasks: dict[int, asyncio.Task[DownloadResult]] = {}
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for i, url in enumerate(urls):
+                    file_path = self._get_file_path(url)
+                    exists = await aiofiles.os.path.exists(file_path)
+                    if exists and not force and not refresh:
+                        logger.debug(f"File {file_path} already exists, skipping download.")
+                        results[i] = DownloadResult(url, file_path, DownloadStatus.SKIPPED)
+                        continue
+                    tasks[i] = tg.create_task(
+                        self._schedule_download(url, file_path, revalidate=refresh and not force)
+                    )
+        finally:
+            await manifest.save()
+
+        for i, task in tasks.items():
+            results[i] = task.result()
+        return [result for result in results if result is not None]
 
     async def _read_json(self, file_path: PathLike) -> dict:
         key = str(Path(file_path).absolute())  # ruff: ignore[blocking-path-method-in-async-function]
+        table = Path(file_path).stem
         if key in BaseClient._FILE_CACHE:
+            self._count(Counter.FILE_CACHE_HITS, table=table)
             return BaseClient._FILE_CACHE[key]
+        self._count(Counter.FILE_CACHE_MISSES, table=table)
 
         try:
-            async with aiofiles.open(file_path, "rb") as f:
-                content = await f.read()
-            data = orjson.loads(content)
+            with self._span(Stage.READ, table=table):
+                async with aiofiles.open(file_path, "rb") as f:
+                    content = await f.read()
+                if is_compressed(content):
+                    content = await asyncio.to_thread(decompress, content)
         except FileNotFoundError:
             logger.warning(f"File {file_path} not found. Run `await client.download()` first.")
             return {}
+
+        try:
+            with self._span(Stage.PARSE, table=table):
+                data = await self._parser.parse(content) if self._parser else orjson.loads(content)
         except orjson.JSONDecodeError as e:
-            logger.error(f"Failed to decode JSON from {file_path}: {e}")
+            logger.error(f"Failed to decode JSON from {key}: {e}")
             return {}
 
         BaseClient._FILE_CACHE[key] = data
         return data
+
+    def _read_json_sync(self, file_path: PathLike) -> dict:
+        file_path = Path(file_path)
+        key = str(file_path.absolute())
+        if key in BaseClient._FILE_CACHE:
+            self._count(Counter.FILE_CACHE_HITS, table=file_path.stem)
+            return BaseClient._FILE_CACHE[key]
+        self._count(Counter.FILE_CACHE_MISSES, table=file_path.stem)
+
+        with self._span(Stage.READ, table=file_path.stem):
+            content = read_file(file_path)
+        with self._span(Stage.PARSE, table=file_path.stem):
+            return self._decode_json(key, content)
+
+    def _decode_json(self, key: str, content: bytes) -> dict:
+        try:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to decode JSON from {key}: {e}")
+            return {}
+
+        BaseClient._FILE_CACHE[key] = data
+        return data
+
+    def _get_langs(self, langs: Iterable[L] | None = None) -> list[L]:
+        """Get the game's languages, only those in ``langs`` if it's given."""
+        selected = None if langs is None else set(langs)
+        return cast(
+            "list[L]", [lang for lang in self._LANGUAGE if selected is None or lang in selected]
+        )
+
+    def _get_text_map_file_name(self, lang: L) -> str:
+        return f"TextMap{lang.value}.json"
+
+    def _get_data_url(self, file_name: str) -> URL:
+        return self._upstream_url / self._DATA_PATH / f"{file_name}.json"
+
+    def _get_data_urls(self) -> list[URL]:
+        return [self._get_data_url(file_name) for file_name in self._DATA_FILE_NAMES]
+
+    def _get_text_map_url(self, lang: L) -> URL:
+        return self._text_map_url / self._get_text_map_file_name(lang)
+
+    def _get_text_map_urls(self, *, langs: Iterable[L] | None = None) -> list[URL]:
+        return [self._get_text_map_url(lang) for lang in self._get_langs(langs)]
+
+    def _load_text_map(self, file_path: Path) -> dict[str, str]:
+        # Bypass _FILE_CACHE, so an evicted text map is actually freed.
+        with self._span(Stage.READ, table=file_path.stem):
+            content = read_file(file_path)
+        try:
+            with self._span(Stage.PARSE, table=file_path.stem):
+                return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to decode JSON from {file_path}: {e}")
+            return {}
+
+    @property
+    def _snapshots_text_maps(self) -> bool:
+        """Whether ``download()`` reads the text maps into memory, and so into the snapshot."""
+        return self._text_map_mode in {TextMapMode.EAGER, TextMapMode.COMPACT}
+
+    def _get_text_map(
+        self, lang: Any, generation: DataGeneration | None = None
+    ) -> Mapping[str, str]:
+        generation = generation or self._generation
+        if self._text_map_mode is TextMapMode.LAZY:
+            file_path = self._text_map_paths.get(lang)
+            if file_path is None:
+                file_path = self._get_file_path(self._get_text_map_url(lang))
+                self._text_map_paths[lang] = file_path
+            return self._text_map_cache.get(file_path)
+        if self._text_map_mode is TextMapMode.MAPPED:
+            return generation.mapped_text_maps.get(lang, {})
+        return generation.text_maps.get(lang, {})
+
+    async def _read_text_map(self, lang: Any) -> None:
+        logger.debug(f"Reading text map for language: {lang}")
+        file_path = self._get_file_path(self._get_text_map_url(lang))
+        if self._text_map_mode is TextMapMode.MAPPED:
+            await self._map_text_map(lang, file_path)
+            return
+
+        text_map = await self._read_json(file_path)
+        if self._text_maps.get(lang) is not text_map:
+            self._text_maps[lang] = text_map
+            self._bump_data_version()
+
+    async def _map_text_map(self, lang: Any, file_path: Path) -> None:
+        try:
+            if self._parser is not None:
+                written = await self._parser.run(ensure_text_map_file, file_path)
+            else:
+                written = await asyncio.to_thread(ensure_text_map_file, file_path)
+        except FileNotFoundError:
+            logger.warning(f"File {file_path} not found. Run `await client.download()` first.")
+            return
+        if not written and lang in self._mapped_text_maps:
+            return
+
+        text_map = await asyncio.to_thread(MappedTextMap.open, get_text_map_file_path(file_path))
+        previous = self._mapped_text_maps.get(lang)
+        self._mapped_text_maps[lang] = text_map
+        if previous is not None:
+            previous.close()
+        self._bump_data_version()
+
+    def _translate(self, text_map_hash: str, lang: Any) -> str:
+        if lang is None:
+            return text_map_hash
+        generation = self._generation
+        if generation.text_map_store is not None and lang not in generation.text_maps:
+            value = generation.text_map_store.get(text_map_hash, lang)
+        else:
+            value = self._get_text_map(lang, generation).get(text_map_hash)
+        if value is None and self._ensure_text_map(lang):
+            return self._translate(text_map_hash, lang)
+        if value is None:
+            self._count(Counter.TRANSLATE_MISSES, lang=lang)
+            return text_map_hash
+        return value
+
+    def _translate_name(self, text_map_hash: str, lang: Any) -> str:
+        """Translate an entity's name, for games that special-case some of them."""
+        return self._translate(text_map_hash, lang)
+
+    def get_localized_names(
+        self, method: Callable[..., Sequence[Any]], *, langs: Iterable[L]
+    ) -> dict[int, dict[L, str]]:
+        """Get the name of every entity a ``get_*`` method returns, in several languages at once.
+
+        The entities are built a single time, untranslated with ``method(lang=None)``, and only
+        their names are translated per language, e.g. for cross-language autocomplete::
+
+            names = client.get_localized_names(client.get_characters, langs=[Language.EN, Language.JA])
+            names[character_id][Language.JA]
+
+        Args:
+            method: A ``get_*`` method whose entities have an ``id`` and a ``name``.
+            langs: The languages to translate the names into.
+
+        Returns:
+            The names by entity ID, then by language.
+        """
+        langs = tuple(langs)
+        return {
+            entity.id: {lang: self._translate_name(entity.name, lang) for lang in langs}
+            for entity in method(lang=None)
+        }
+
+    def get_translator(self, lang: L) -> Translator[L]:
+        """Get a translator bound to this client and a language.
+
+        Use it to read entities from a ``get_*(lang=None)`` catalog in any language, which is
+        built once and shared by all of them, instead of building a catalog per language::
+
+            characters = client.get_characters(lang=None)
+            translator = client.get_translator(Language.JA)
+            translator.localize(characters[0]).name
+
+        Translations are looked up every time a field is read, so they follow text maps read or
+        refreshed after the catalog was built.
+
+        Args:
+            lang: The language to translate into.
+
+        Returns:
+            The translator.
+        """
+        return Translator(self._translate, lang, translate_name=self._translate_name)
+
+    def _pack_text_maps(self) -> None:
+        """Move the read text maps into the compact store, freeing their dicts."""
+        if not self._text_maps:
+            return
+
+        text_maps = {str(lang): text_map for lang, text_map in self._text_maps.items()}
+        if self._text_map_store is None:
+            self._text_map_store = CompactTextMaps.from_text_maps(text_maps)
+        else:
+            self._text_map_store = self._text_map_store.merged(text_maps)
+
+        for lang in self._text_maps:
+            file_path = self._get_file_path(self._get_text_map_url(lang))
+            BaseClient._FILE_CACHE.pop(str(file_path.absolute()), None)
+        self._text_maps.clear()
+
+    def _dump_text_map_store(self) -> dict[str, Any] | None:
+        return None if self._text_map_store is None else self._text_map_store.to_builtins()
+
+    def _restore_text_map_store(self, content: dict[str, Any] | None) -> None:
+        self._text_map_store = None if content is None else CompactTextMaps.from_builtins(content)
+        if self._text_map_mode is TextMapMode.COMPACT:
+            # The snapshot may have been written by a client that didn't pack its text maps
+            self._pack_text_maps()
+
+    async def read_text_maps(self, *, langs: Iterable[L] | None = None) -> None:
+        if self._text_map_mode is TextMapMode.LAZY:
+            # Read on demand by translate()
+            return
+
+        async with asyncio.TaskGroup() as tg:
+            for lang in self._get_langs(langs):
+                tg.create_task(self._read_text_map(lang))
+
+        if self._text_map_mode is TextMapMode.COMPACT:
+            self._pack_text_maps()
+
+    async def read_data(self) -> None:
+        async with asyncio.TaskGroup() as tg:
+            for url in self._get_data_urls():
+                tg.create_task(self._read_data(self._get_file_path(url)))
+
+    def _has_table(self, file_name: str) -> bool:
+        if self._table_store is not None:
+            return file_name in self._checked_tables
+        return file_name in self._data
+
+    def _set_data(self, file_name: str, data: Any) -> None:
+        if self._data.get(file_name) is data:
+            return
+        self._data[file_name] = data
+        self._bump_data_version()
+
+    async def _read_data(self, file_path: Path) -> None:
+        if self._table_store is not None:
+            if await asyncio.to_thread(self._store_table, file_path):
+                self._bump_data_version()
+            return
+        self._set_data(file_path.stem, await self._read_json(file_path))
+
+    def _get_store_name(self, file_name: str) -> str:
+        return f"{self._GAME}/{file_name}"
+
+    def _get_rows_to_store(self, file_name: str, data: Any) -> list[dict[str, Any]]:  # ruff: ignore[unused-method-argument]
+        """Turn a table file's content into the rows ``get_*`` methods read."""
+        return data
+
+    def _store_table(self, file_path: Path) -> bool:
+        """Put a table file into the table store, unless it's stored from the same file already.
+
+        Returns:
+            Whether the stored rows changed.
+        """
+        store = self._table_store
+        if store is None:
+            return False
+
+        file_name = file_path.stem
+        name = self._get_store_name(file_name)
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            if name in store:
+                # Keep serving what's stored
+                self._checked_tables.add(file_name)
+            else:
+                logger.warning(f"File {file_path} not found. Run `await client.download()` first.")
+            return False
+
+        self._checked_tables.add(file_name)
+        source = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if store.get_source(name) == source:
+            return False
+
+        logger.debug(f"Storing {file_path}")
+        # Bypass _FILE_CACHE, the store is meant to keep the parsed table out of memory
+        with self._span(Stage.READ, table=file_name):
+            content = read_file(file_path)
+        try:
+            with self._span(Stage.PARSE, table=file_name):
+                data = orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to decode JSON from {file_path}: {e}")
+            return False
+        del content
+
+        store.put(name, self._get_rows_to_store(file_name, data), source=source)
+        return True
+
+    def _get_table(self, file_name: str) -> Sequence[dict[str, Any]]:
+        """Get every row of a table, from the table store if the client has one."""
+        if self._table_store is not None:
+            return self._table_store.get_rows(self._get_store_name(file_name))
+        return self._data[file_name]
+
+    def _lookup(self, file_name: str, key: str, value: Any) -> dict[str, Any] | None:
+        """Get the row of a table whose ``key`` is ``value``, later rows win like `index_by`.
+
+        Goes through the table store's index if the client has one, and through an index built
+        once per data version otherwise.
+        """
+        if self._table_store is not None:
+            return self._table_store.lookup(self._get_store_name(file_name), key, value)
+        index = self._materialize(
+            f"{file_name}_by_{key}", lambda: index_by(self._get_table(file_name), key)
+        )
+        return index.get(value)
+
+    def _join_table(
+        self, file_name: str, *, left_key: Key, right_key: Key | None = None, **options: Any
+    ) -> Join:
+        """Join a table into rows being built, see `Join` for the arguments.
+
+        Single matches are looked up through the table store's index if it has one for the key,
+        in one batch per join, so only the matching rows are read from the store. Otherwise the
+        rows are indexed.
+        """
+        key = left_key if right_key is None else right_key
+        store = self._table_store
+        if (
+            store is not None
+            and isinstance(key, str)
+            and options.get("many") is None
+            and store.is_indexed(self._get_store_name(file_name), key)
+        ):
+            lookup = functools.partial(store.lookup_many, self._get_store_name(file_name), key)
+            return Join((), left_key, right_key, lookup=lookup, **options)
+        return Join(self._get_table(file_name), left_key, right_key, **options)
+
+    def _dump_tables(self) -> dict[str, Any]:
+        """Get the read tables, for the snapshot and the warm cache."""
+        if self._table_store is None:
+            return self._data
+        return {file_name: self._get_table(file_name) for file_name in self._checked_tables}
+
+    def _dump_snapshot_tables(self) -> dict[str, Any]:
+        """Get the tables for the snapshot, only their sources are recorded with a table store."""
+        return {} if self._table_store is not None else self._dump_tables()
+
+    def _dump_table_sources(self) -> dict[str, str | None]:
+        """Get the sources of the stored tables, for the snapshot and the warm cache."""
+        if self._table_store is None:
+            return {}
+        return {
+            file_name: self._table_store.get_source(self._get_store_name(file_name))
+            for file_name in self._checked_tables
+        }
+
+    def _can_restore_tables(self, tables: dict[str, Any], sources: dict[str, str | None]) -> bool:
+        """Whether every table of a snapshot either has its rows in it or is held by the store.
+
+        A client with a table store only records the sources of its tables in the snapshot, the
+        rows stay in the store.
+        """
+        store = self._table_store
+        return all(
+            file_name in tables
+            or (
+                store is not None
+                and source is not None
+                and store.get_source(self._get_store_name(file_name)) == source
+            )
+            for file_name, source in sources.items()
+        )
+
+    def _restore_tables(self, tables: dict[str, Any], sources: dict[str, str | None]) -> None:
+        """Restore tables, with a table store only those it doesn't hold from the same source."""
+        if self._table_store is None:
+            self._data = tables
+            return
+        for file_name in tables.keys() | sources.keys():
+            name = self._get_store_name(file_name)
+            source = sources.get(file_name)
+            rows = tables.get(file_name)
+            if rows is not None and (
+                source is None or self._table_store.get_source(name) != source
+            ):
+                self._table_store.put(name, rows, source=source)
+            self._checked_tables.add(file_name)
+
+    def _ensure_tables(self, file_names: Iterable[str]) -> None:
+        """Read the tables a get_* method needs that a lazy client hasn't read yet."""
+        if not self._lazy:
+            return
+
+        for file_name in file_names:
+            if self._has_table(file_name):
+                continue
+
+            file_path = self._get_file_path(self._get_data_url(file_name))
+            logger.debug(f"Lazily reading {file_path}")
+            if self._table_store is not None:
+                if self._store_table(file_path):
+                    self._bump_data_version()
+                if not self._has_table(file_name):
+                    msg = (
+                        f"Data table {file_name} is not downloaded. "
+                        "Run `await client.prepare(client.get_...)` first."
+                    )
+                    raise RuntimeError(msg)
+                continue
+
+            try:
+                data = self._read_json_sync(file_path)
+            except FileNotFoundError:
+                msg = (
+                    f"Data table {file_name} is not downloaded. "
+                    "Run `await client.prepare(client.get_...)` first."
+                )
+                raise RuntimeError(msg) from None
+            self._set_data(file_name, data)
+
+    def _has_text_map(self, lang: Any) -> bool:
+        generation = self._generation
+        if self._text_map_mode is TextMapMode.MAPPED:
+            return lang in generation.mapped_text_maps
+        if lang in generation.text_maps:
+            return True
+        store = generation.text_map_store
+        return store is not None and str(lang) in store.languages
+
+    def _ensure_text_map(self, lang: Any) -> bool:
+        """Read a text map a lazy client hasn't read yet, e.g. one ``prepare()`` didn't name.
+
+        Lazily read text maps (`TextMapMode.LAZY`) are always read on first use already.
+
+        Returns:
+            ``True`` if the text map was read.
+        """
+        if not self._lazy or lang is None or self._text_map_mode is TextMapMode.LAZY:
+            return False
+        if self._has_text_map(lang):
+            return False
+
+        file_path = self._get_file_path(self._get_text_map_url(lang))
+        logger.debug(f"Lazily reading {file_path}")
+        try:
+            if self._text_map_mode is TextMapMode.MAPPED:
+                ensure_text_map_file(file_path)
+                self._mapped_text_maps[lang] = MappedTextMap.open(get_text_map_file_path(file_path))
+            else:
+                self._text_maps[lang] = self._read_json_sync(file_path)
+        except FileNotFoundError:
+            msg = (
+                f"Text map {file_path.name} is not downloaded. "
+                "Run `await client.prepare(client.get_..., langs=[...])` first."
+            )
+            raise RuntimeError(msg) from None
+
+        if self._text_map_mode is TextMapMode.COMPACT:
+            self._pack_text_maps()
+        if self._read_langs:
+            # So refresh() keeps it up to date too
+            self._read_langs.add(lang)
+        self._bump_data_version()
+        return True
+
+    async def prepare(
+        self, *methods: Callable[..., Any], langs: Iterable[Any] | None = None
+    ) -> list[DownloadResult]:
+        """Download, if missing, and read only what the given ``get_*`` methods need.
+
+        Meant for lazy clients: a worker that only serves characters can call
+        ``await client.prepare(client.get_characters, langs=[Language.EN])`` instead of
+        ``download()``, which loads every table and text map.
+
+        Args:
+            methods: The ``get_*`` methods that will be called.
+            langs: The text map languages to download and read, defaults to all of them.
+
+        Returns:
+            The per-file download results.
+        """
+        langs = None if langs is None else tuple(langs)
+        self._record_langs(langs)
+        file_names = sorted(
+            {file_name for method in methods for file_name in getattr(method, "tables", ())}
+        )
+        data_urls = [self._get_data_url(file_name) for file_name in file_names]
+        results = await self._download_files([*self._get_text_map_urls(langs=langs), *data_urls])
+
+        await self.read_text_maps(langs=langs)
+        async with asyncio.TaskGroup() as tg:
+            for url in data_urls:
+                tg.create_task(self._read_data(self._get_file_path(url)))
+
+        return results
+
+    async def download_data_tables(
+        self, *, force: bool = False, refresh: bool = False
+    ) -> list[DownloadResult]:
+        results = await self._download_files(self._get_data_urls(), force=force, refresh=refresh)
+        await self.read_data()
+        return results
+
+    async def download(
+        self, *, langs: Iterable[L] | None = None, force: bool = False, refresh: bool = False
+    ) -> list[DownloadResult]:
+        """Download text maps and data tables, then read them into memory.
+
+        Args:
+            langs: The text map languages to download, defaults to all of them.
+            force: Re-download every file, even if it is already cached.
+            refresh: Only re-download files that changed upstream since they were cached.
+
+        Returns:
+            The per-file download results. A failed file does not stop the others.
+        """
+        langs = None if langs is None else tuple(langs)
+        self._record_langs(langs)
+        urls = [*self._get_text_map_urls(langs=langs), *self._get_data_urls()]
+        results = await self._download_files(urls, force=force, refresh=refresh)
+
+        snapshot_urls = urls if self._snapshots_text_maps else self._get_data_urls()
+        sources = [self._get_file_path(url) for url in snapshot_urls]
+        if not await self._load_snapshot(sources):
+            await self.read_text_maps(langs=langs)
+            await self.read_data()
+            await self._save_snapshot(sources)
+        elif not self._snapshots_text_maps:
+            await self.read_text_maps(langs=langs)
+
+        return results
+
+    def _record_langs(self, langs: tuple[Any, ...] | None) -> None:
+        if langs is None:
+            self._read_langs = None
+        elif self._read_langs is not None:
+            self._read_langs.update(langs)
+
+    def translate(self, text_map_hash: str, *, lang: L | None) -> str:
+        """Translate a text map hash, returning the hash itself if there's no translation.
+
+        ``lang=None`` leaves every hash untranslated, as do ``get_*`` methods called with it.
+        """
+        return self._translate(text_map_hash, lang)
+
+    async def refresh(self, *, langs: Iterable[Any] | None = None) -> bool:
+        """Pick up what changed upstream without readers ever seeing a mix of old and new data.
+
+        Cached files are revalidated like ``download(refresh=True)``. If any changed, the
+        client reads them into a new generation off to the side, which it then publishes in
+        a single step. ``get_*`` calls in flight finish on the previous generation, later ones
+        see the new one. A lazy client's new generation starts empty, its tables are read on
+        first use again.
+
+        With a table store, changed tables are replaced in the store as they're read, and lazily
+        read text maps are re-read from the new files, only the rest is swapped atomically.
+
+        Args:
+            langs: The text map languages to refresh, defaults to the ones ``download()`` and
+                ``prepare()`` read, or all of them if neither was called.
+
+        Returns:
+            ``True`` if a new generation was published.
+        """
+        async with self._refresh_lock:
+            if langs is not None:
+                langs = tuple(langs)
+            elif self._read_langs:
+                langs = tuple(self._read_langs)
+            generation = DataGeneration(data_version=next(self._data_versions))
+            with self._pinned(generation):
+                urls = [*self._get_text_map_urls(langs=langs), *self._get_data_urls()]
+                results = await self._download_files(urls, refresh=True)
+                if not any(result.status is DownloadStatus.DOWNLOADED for result in results):
+                    logger.debug(f"Nothing changed upstream for {self._GAME}")
+                    return False
+
+                # The new generation holds every language read so far, not only the refreshed ones
+                self._record_langs(langs)
+                read_langs = None if self._read_langs is None else tuple(self._read_langs)
+                if self._lazy:
+                    await self.read_text_maps(langs=read_langs)
+                else:
+                    await self.download(langs=read_langs)
+
+            # Readers pinned to the previous generation keep it, mapped text maps included,
+            # until they finish, the last one to finish closes it
+            previous = self._live_generation
+            self._live_generation = generation
+            previous.retire()
+            logger.debug(f"Published a new {self._GAME} data generation")
+            return True
+
+    async def _auto_refresh(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh {self._GAME} data: {e!r}")
+
+    def _dump_snapshot(self) -> dict[str, Any]:
+        """Return everything read by ``download()``, as plain builtins for the snapshot."""
+        return {
+            "text_maps": {str(lang): text_map for lang, text_map in self._text_maps.items()},
+            "text_map_store": self._dump_text_map_store(),
+            "data": self._dump_snapshot_tables(),
+            "table_sources": self._dump_table_sources(),
+        }
+
+    def _restore_snapshot(self, payload: dict[str, Any]) -> None:
+        self._restore_text_maps(payload)
+        self._restore_tables(payload["data"], payload["table_sources"])
+        self._bump_data_version()
+
+    def _restore_text_maps(self, payload: dict[str, Any]) -> None:
+        self._text_maps = {
+            self._LANGUAGE(lang): text_map for lang, text_map in payload["text_maps"].items()
+        }
+        self._restore_text_map_store(payload["text_map_store"])
+
+    async def _load_snapshot(self, sources: Sequence[Path]) -> bool:
+        """Load the snapshot built from ``sources``, if there is an up-to-date one.
+
+        Returns ``True`` if the client now holds the data of ``sources``, either because the
+        snapshot was loaded or because it already held it.
+        """
+        if not self._use_snapshot:
+            return False
+
+        try:
+            fingerprint = await get_fingerprint(sources)
+        except FileNotFoundError:
+            return False
+        if fingerprint == self._snapshot_fingerprint:
+            return True
+
+        path = self._data_dir / SNAPSHOT_FILE_NAME
+        payload = await read_snapshot(path, fingerprint)
+        if payload is None:
+            return False
+        if not self._can_restore_tables(payload["data"], payload["table_sources"]):
+            logger.debug(f"Ignoring snapshot {path}, the table store doesn't hold its tables")
+            return False
+
+        logger.debug(f"Loaded snapshot from {path}")
+        self._restore_snapshot(payload)
+        self._snapshot_fingerprint = fingerprint
+        return True
+
+    async def _save_snapshot(self, sources: Sequence[Path]) -> None:
+        if not self._use_snapshot:
+            return
+
+        try:
+            fingerprint = await get_fingerprint(sources)
+        except FileNotFoundError:
+            # Some source files failed to download, a snapshot of the rest would never be valid.
+            return
+
+        path = self._data_dir / SNAPSHOT_FILE_NAME
+        await write_snapshot(path, fingerprint, self._dump_snapshot())
+        self._snapshot_fingerprint = fingerprint
+
+    @property
+    def warm_cache_generation(self) -> int:
+        """The generation of the warm cache the client published or loaded, 0 if none."""
+        return self._warm_cache_generation
+
+    def _get_warm_cache_path(self) -> Path:
+        return self._data_dir / WARM_CACHE_FILE_NAME
+
+    def get_published_generation(self) -> int:
+        """Get the generation of the warm cache published for this game, cheap enough to poll.
+
+        A reader whose `warm_cache_generation` is behind it can call `load_warm_cache` to
+        catch up.
+        """
+        return read_generation(self._get_warm_cache_path())
+
+    async def publish_warm_cache(self) -> int:
+        """Publish the client's data and built catalogs for other processes to warm up from.
+
+        Call the ``get_*`` methods readers will use (e.g. for every language they serve) first,
+        so readers get those catalogs without building them. Only one process may publish to a
+        data directory.
+
+        Returns:
+            The generation of the published cache.
+        """
+        catalogs = {
+            (name, arguments): to_json(catalog, by_alias=False)
+            for (_, name, arguments, data_version), catalog in self._catalogs.items()
+            if data_version == self._data_version
+        }
+
+        await asyncio.to_thread(self._data_dir.mkdir, parents=True, exist_ok=True)
+        self._warm_cache_generation = await asyncio.to_thread(
+            publish_warm_cache,
+            self._get_warm_cache_path(),
+            self._dump_tables(),
+            self._dump_table_sources(),
+            catalogs,
+        )
+        logger.debug(f"Published warm cache generation {self._warm_cache_generation}")
+        return self._warm_cache_generation
+
+    async def load_warm_cache(self) -> bool:
+        """Load the warm cache another process published, if it's newer than the client's data.
+
+        The client reads the published tables in place, so processes loading the same cache
+        share their memory, and rebuilds a published catalog the first time it's asked for,
+        see `hb_data.common.warm_cache`. Text maps are read from the data directory, use
+        ``TextMapMode.MAPPED`` to share them too.
+
+        Returns:
+            ``True`` if newer data was loaded.
+        """
+        path = self._get_warm_cache_path()
+        if await asyncio.to_thread(read_generation, path) == self._warm_cache_generation:
+            return False
+
+        cache = await asyncio.to_thread(read_warm_cache, path)
+        if cache is None or cache.generation == self._warm_cache_generation:
+            return False
+
+        # Before the catalogs, reading a changed text map bumps the data version
+        await self.read_text_maps(langs=self._read_langs or None)
+        self._restore_tables(cache.tables, cache.table_sources)
+        self._bump_data_version()
+        self._snapshot_fingerprint = None
+        for (name, arguments), load in cache.catalogs.items():
+            self._published_catalogs[self._GAME, name, arguments, self._data_version] = load
+        self._warm_cache_generation = cache.generation
+
+        logger.debug(f"Loaded warm cache generation {cache.generation}")
+        return True
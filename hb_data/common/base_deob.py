@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+import orjson
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
@@ -12,7 +16,7 @@ def find_key_by_value(data: dict, value: Any) -> str:
 
 
 def find_key_by_position(data: dict, position: int) -> str:
-    return list(data.keys())[position]
+    return next(itertools.islice(data, position, None))
 
 
 @dataclass
@@ -31,13 +35,27 @@ class DeobfuscatorMeta(type):
 
 
 class BaseDeobfuscator(metaclass=DeobfuscatorMeta):
-    def __init__(self, data: dict) -> None:
+    def __init__(self, data: dict, *, key_map: dict[str, str] | None = None) -> None:
         self._data = data
         self._list_key: str = next(iter(data))
         self._entries: list[dict] = data[self._list_key]
-        self._key_map: dict[str, str] = {}
+        self._key_map: dict[str, str] = key_map or {}
         self._fields: dict[str, DeobfuscatedField]
 
+    @property
+    def fingerprint(self) -> str:
+        """A hash of everything key map inference looks at.
+
+        Finders only ever see the first entry, so its keys (in order) and values, together with
+        the list key and the fields being looked for, fully determine the key map.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(type(self).__name__.encode())
+        h.update(orjson.dumps(sorted(field.name for field in self._fields.values())))
+        h.update(self._list_key.encode())
+        h.update(orjson.dumps(self._entries[0]))
+        return h.hexdigest()
+
     def generate_key_map(self) -> dict[str, str]:
         sample = self._entries[0]
         self._key_map = {}
@@ -0,0 +1,134 @@
+"""Compression of the files clients download into their data directory.
+
+Compressed files keep their names, readers tell them apart from plain JSON by their magic
+number, so a data directory can hold both and switching formats doesn't invalidate it.
+
+zstd needs Python 3.14's ``compression.zstd`` or the ``zstandard`` package, gzip is always
+available.
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from enum import StrEnum
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+try:
+    from compression import zstd  # pyright: ignore[reportMissingImports]
+except ImportError:
+    zstd = None
+    try:
+        import zstandard  # pyright: ignore[reportMissingImports]
+    except ImportError:
+        zstandard = None
+else:
+    zstandard = None
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_MAGIC_LENGTH = max(len(_GZIP_MAGIC), len(_ZSTD_MAGIC))
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class CacheCompression(StrEnum):
+    GZIP = "gzip"
+    """Fast to read, and upstream's gzip transfer encoding is written to disk as is."""
+    ZSTD = "zstd"
+    """About twice as fast to read as gzip, but recompressed from what upstream sends."""
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+def ensure_supported(compression: CacheCompression | None) -> None:
+    """Raise a ``RuntimeError`` if the compression's library isn't installed."""
+    if compression is CacheCompression.ZSTD and zstd is None and zstandard is None:
+        raise _get_missing_zstd_error()
+
+
+def get_compressor(compression: CacheCompression) -> Compressor:
+    """Get an incremental compressor, to compress a file as it's written in chunks."""
+    if compression is CacheCompression.GZIP:
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if zstd is not None:
+        return zstd.ZstdCompressor(level=ZSTD_LEVEL)
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    raise _get_missing_zstd_error()
+
+
+class CacheEncoder:
+    """Turns a downloaded body into the file written to the data directory, chunk by chunk.
+
+    A body that arrives compressed already, in upstream's gzip transfer encoding or from a
+    peer's compressed cache, is written as is, whatever the client's own format.
+
+    Args:
+        compression: The format to compress plain bodies into, ``None`` to keep them plain.
+    """
+
+    def __init__(self, compression: CacheCompression | None) -> None:
+        self._compression = compression
+        self._compressor: Compressor | None = None
+        # The first bytes, until there are enough of them to tell whether they're compressed
+        self._head: bytes | None = None if compression is None else b""
+
+    def encode(self, chunk: bytes) -> bytes:
+        if self._head is not None:
+            self._head += chunk
+            if len(self._head) < _MAGIC_LENGTH:
+                return b""
+            chunk = self._start()
+        return chunk if self._compressor is None else self._compressor.compress(chunk)
+
+    def flush(self) -> bytes:
+        """Get the rest of the file, once the whole body was encoded."""
+        chunk = b"" if self._head is None else self._start()
+        if self._compressor is None:
+            return chunk
+        return self._compressor.compress(chunk) + self._compressor.flush()
+
+    def _start(self) -> bytes:
+        head, self._head = self._head or b"", None
+        if self._compression is not None and not is_compressed(head):
+            self._compressor = get_compressor(self._compression)
+        return head
+
+
+def is_compressed(content: bytes) -> bool:
+    """Whether content, or its first bytes, is compressed in a format `decompress` reads."""
+    return content.startswith((_GZIP_MAGIC, _ZSTD_MAGIC))
+
+
+def decompress(content: bytes) -> bytes:
+    """Decompress a file's content, content that isn't compressed is returned unchanged."""
+    if content.startswith(_GZIP_MAGIC):
+        return gzip.decompress(content)
+    if not content.startswith(_ZSTD_MAGIC):
+        return content
+
+    if zstd is not None:
+        return zstd.decompress(content)
+    if zstandard is not None:
+        # Streamed frames don't record their size, which ZstdDecompressor.decompress requires
+        return zstandard.ZstdDecompressor().decompressobj().decompress(content)
+    raise _get_missing_zstd_error()
+
+
+def read_file(path: Path) -> bytes:
+    """Read a file from the data directory, decompressing it if it's compressed."""
+    return decompress(path.read_bytes())
+
+
+def _get_missing_zstd_error() -> RuntimeError:
+    msg = "zstd compression requires Python 3.14 or the zstandard package."
+    return RuntimeError(msg)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import copy
+import enum
+import functools
+import inspect
+import types
+import typing
+from typing import TYPE_CHECKING, Any, Concatenate
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from hb_data.common.base_client import BaseClient
+
+type CatalogKey = tuple[str, str, tuple[tuple[str, Any], ...], int]
+
+
+def rebuild_catalog(tp: Any, value: Any) -> Any:
+    """Rebuild a catalog of type ``tp`` from its JSON, e.g. one published to a warm cache.
+
+    Models are constructed without validation, their validators already ran when the catalog
+    was built and aren't idempotent, e.g. ZZZ's rarity offset.
+    """
+    if value is None:
+        return None
+
+    if typing.get_origin(tp) is types.UnionType:
+        # Optional fields, the only unions models have
+        (tp,) = (arg for arg in typing.get_args(tp) if arg is not types.NoneType)
+
+    origin = typing.get_origin(tp)
+    if origin is list:
+        (item_tp,) = typing.get_args(tp)
+        return [rebuild_catalog(item_tp, item) for item in value]
+    if origin is dict:
+        key_tp, value_tp = typing.get_args(tp)
+        # JSON object keys are always strings
+        return {
+            rebuild_catalog(key_tp, key): rebuild_catalog(value_tp, item)
+            for key, item in value.items()
+        }
+
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        fields = tp.model_fields
+        return tp.model_construct(
+            **{name: rebuild_catalog(fields[name].annotation, item) for name, item in value.items()}
+        )
+    if isinstance(tp, type) and issubclass(tp, (enum.Enum, int, float)):
+        return tp(value)
+    return value
+
+
+def cached_catalog[C: BaseClient, **P, R](
+    func: Callable[Concatenate[C, P], R],
+) -> Callable[Concatenate[C, P], R]:
+    """Memoize a ``get_*`` method per game, entity, arguments (e.g. ``lang``) and data version.
+
+    The client's data version changes whenever a table or text map is re-read with different
+    content, so a cached catalog is only rebuilt after the underlying data actually changed.
+    Callers get a shallow copy of the cached container, but the entities inside it are shared
+    by every caller, and changing one would change it for all of them until the data version
+    changes. Copy an entity with ``model_copy(deep=True)`` before changing it. Entities aren't
+    copied for each caller because that would cost more than building the catalog again.
+
+    Catalogs loaded from a warm cache (see `BaseClient.load_warm_cache`) are rebuilt from their
+    JSON on the first call instead of being built.
+    """
+    signature = inspect.signature(func)
+
+    @functools.cache
+    def get_return_type() -> Any:
+        return typing.get_type_hints(func)["return"]
+
+    @functools.wraps(func)
+    def wrapper(self: C, *args: P.args, **kwargs: P.kwargs) -> R:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple((k, v) for k, v in bound.arguments.items() if k != "self")
+        key: CatalogKey = (self._GAME, func.__name__, arguments, self.data_version)
+
+        if key not in self._catalogs:
+            load = self._published_catalogs.pop(key, None)
+            self._catalogs[key] = (
+                func(self, *args, **kwargs)
+                if load is None
+                else rebuild_catalog(get_return_type(), load())
+            )
+        return copy.copy(self._catalogs[key])
+
+    return wrapper
+
+
+def requires_tables[C: BaseClient, **P, R](
+    *file_names: str,
+) -> Callable[[Callable[Concatenate[C, P], R]], Callable[Concatenate[C, P], R]]:
+    """Declare the data tables a ``get_*`` method reads.
+
+    Lazy clients read the tables, and the text map of the ``lang`` argument, on the first call,
+    and ``BaseClient.prepare`` uses the declaration to download and read only what the method
+    needs. Apply it above `cached_catalog`, so tables and text maps are in place before the
+    catalog's data version is taken.
+
+    The client is pinned to its current data generation for the whole call, so a refresh
+    publishing a new one meanwhile doesn't change the data under it.
+    """
+
+    def decorator(func: Callable[Concatenate[C, P], R]) -> Callable[Concatenate[C, P], R]:
+        lang = inspect.signature(func).parameters.get("lang")
+
+        @functools.wraps(func)
+        def wrapper(self: C, *args: P.args, **kwargs: P.kwargs) -> R:
+            with self._pinned():
+                self._ensure_tables(file_names)
+                if lang is not None:
+                    self._ensure_text_map(kwargs.get("lang", lang.default))
+                return func(self, *args, **kwargs)
+
+        wrapper.tables = file_names  # pyright: ignore[reportFunctionMemberAccess]
+        return wrapper
+
+    return decorator
@@ -1,4 +1,132 @@
+from __future__ import annotations
+
 from collections import defaultdict
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+
+type Key = str | tuple[str, ...]
+
+_MISSING = object()
+
+
+def _key_getter(key: Key) -> Callable[[dict], Any]:
+    """Return a getter for a (possibly composite) key, raising ``KeyError`` if it's missing."""
+    if isinstance(key, str):
+        return itemgetter(key)
+    return itemgetter(*key)
+
+
+def index_by(rows: Iterable[dict], key: Key) -> dict[Any, dict]:
+    """Index rows by a unique key. Rows missing the key are skipped, later rows win."""
+    get = _key_getter(key)
+    index: dict[Any, dict] = {}
+    for row in rows:
+        try:
+            index[get(row)] = row
+        except KeyError:
+            continue
+    return index
+
+
+def group_by(rows: Iterable[dict], key: Key) -> dict[Any, list[dict]]:
+    """Group rows by a non-unique key, preserving their order. Rows missing the key are skipped."""
+    get = _key_getter(key)
+    groups: defaultdict[Any, list[dict]] = defaultdict(list)
+    for row in rows:
+        try:
+            groups[get(row)].append(row)
+        except KeyError:
+            continue
+    return dict(groups)
+
+
+@dataclass(frozen=True, slots=True)
+class Join:
+    """One stage of a `join`.
+
+    Args:
+        rows: The right-hand rows.
+        left_key: The key (or composite key) to look up on the row being built.
+        right_key: The matching key on ``rows``, defaults to ``left_key``.
+        how: ``"inner"`` drops rows without a match, ``"left"`` keeps them unchanged.
+        columns: Only copy these columns from the match, defaults to all of them.
+        many: Collect every match into a list under this field instead of merging a single
+            match into the row (one-to-many). Rows without matches get an empty list.
+        lookup: Finds the matches for a set of left key values, by value, instead of
+            indexing ``rows``, e.g. through a table store's index. It's called once per join
+            with every left key value of the stage. Can't be combined with ``many``.
+    """
+
+    rows: Sequence[dict]
+    left_key: Key
+    right_key: Key | None = None
+    how: Literal["inner", "left"] = "inner"
+    columns: Sequence[str] | None = None
+    many: str | None = None
+    lookup: Callable[[set[Any]], Mapping[Any, dict]] | None = None
+
+    def __post_init__(self) -> None:
+        if self.lookup is not None and self.many is not None:
+            msg = "A join with a lookup can't collect many matches"
+            raise ValueError(msg)
+
+
+def _get_key(get: Callable[[dict], Any], row: dict) -> Any:
+    try:
+        return get(row)
+    except KeyError:
+        return _MISSING
+
+
+def _project(row: dict, columns: Sequence[str] | None) -> dict:
+    if columns is None:
+        return row
+    return {column: row[column] for column in columns if column in row}
+
+
+def _get_finder(stage: Join, keys: list[Any]) -> Callable[[Any], Any]:
+    if stage.lookup is not None:
+        return stage.lookup({key for key in keys if key is not _MISSING}).get
+    right_key = stage.left_key if stage.right_key is None else stage.right_key
+    if stage.many is None:
+        return index_by(stage.rows, right_key).get
+    return group_by(stage.rows, right_key).get
+
+
+def join(rows: Iterable[dict], *joins: Join) -> list[dict]:
+    """Hash join ``rows`` with every stage in ``joins``, in order.
+
+    Each right-hand side is indexed once, or looked up once if its stage has a ``lookup``.
+    Every output row is a single new dict, created the first time a stage adds to it, so the
+    input rows are never mutated. Later stages can join on columns added by earlier ones, and on
+    key collisions the right-hand side wins.
+    """
+    # Each row as it was passed in, and the dict built from it, if any
+    current: list[tuple[dict, dict | None]] = [(row, None) for row in rows]
+    for stage in joins:
+        get = _key_getter(stage.left_key)
+        keys = [_get_key(get, row if merged is None else merged) for row, merged in current]
+        find = _get_finder(stage, keys)
+
+        joined: list[tuple[dict, dict | None]] = []
+        for (row, built), key in zip(current, keys, strict=True):
+            match = None if key is _MISSING else find(key)
+            if match is None and stage.how == "inner":
+                continue
+            merged = dict(row) if built is None else built
+
+            if stage.many is not None:
+                merged[stage.many] = [_project(m, stage.columns) for m in match or ()]
+            elif match is not None:
+                merged.update(_project(match, stage.columns))
+            joined.append((row, merged))
+        current = joined
+
+    return [row if merged is None else merged for row, merged in current]
 
 
 def merge_dicts_by_key(lists: list[list[dict]], *, key: str) -> list[dict]:
@@ -14,15 +142,4 @@ def merge_dicts_by_key(lists: list[list[dict]], *, key: str) -> list[dict]:
 
 def merge_dicts_by_different_keys(dicts: dict[str, list[dict]]) -> list[dict]:
     (first_key, first_list), *rest = dicts.items()
-
-    result = list(first_list)
-    for key, lst in rest:
-        index = {item[key]: item for item in lst}
-        merged = []
-        for item in result:
-            match = index.get(item[first_key])
-            if match:
-                merged.append({**item, **match})
-        result = merged
-
-    return result
+    return join(first_list, *(Join(lst, left_key=first_key, right_key=key) for key, lst in rest))
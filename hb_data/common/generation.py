@@ -0,0 +1,123 @@
+"""Generations of the data a client read, swapped in as a whole when it's refreshed.
+
+Everything a client reads, its tables, text maps and the catalogs built from them, lives in a
+`DataGeneration`. ``BaseClient.refresh`` reads a new one off to the side and publishes it by
+replacing the client's reference to the current one, so a reader never sees new text maps next
+to old tables.
+
+Readers that have to see a single generation across several lookups, e.g. a ``get_*`` method
+running in a thread while the event loop swaps generations, pin the client to the generation
+they started with. Pins are context-local, the tasks and threads started in a pinned context
+see the same generation. A generation a refresh replaced is closed once its last pin is
+released, which unmaps its mapped text maps.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from contextvars import Token
+
+    from hb_data.common.catalog import CatalogKey
+    from hb_data.common.text_map import CompactTextMaps
+    from hb_data.common.text_map_file import MappedTextMap
+
+# Replaced rather than mutated, so a pin never leaks into the contexts copied from this one
+_PINNED: ContextVar[dict[object, DataGeneration] | None] = ContextVar(
+    "hb_data_pinned_generations", default=None
+)
+
+
+@dataclass(slots=True, eq=False)
+class DataGeneration:
+    """Everything a client read, and what it built from it."""
+
+    data_version: int = 0
+    data: dict[str, Any] = field(default_factory=dict)
+    tables: dict[str, Any] = field(default_factory=dict)
+    """Tables derived from ``data`` that survive a version bump, e.g. ZZZ's deobfuscated ones."""
+    text_maps: dict[Any, dict[str, str]] = field(default_factory=dict)
+    text_map_store: CompactTextMaps | None = None
+    mapped_text_maps: dict[Any, MappedTextMap] = field(default_factory=dict)
+    catalogs: dict[CatalogKey, Any] = field(default_factory=dict)
+    published_catalogs: dict[CatalogKey, Callable[[], Any]] = field(default_factory=dict)
+    """Decoders of the catalogs a warm cache holds, each is rebuilt on its first use."""
+    materialized: dict[str, Any] = field(default_factory=dict)
+    checked_tables: set[str] = field(default_factory=set)
+    snapshot_fingerprint: list[list[Any]] | None = None
+    pins: int = 0
+    """The readers pinned to the generation, see `acquire`."""
+    retired: bool = False
+    """Whether a newer generation replaced this one."""
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def acquire(self) -> bool:
+        """Keep the generation open until `release` is called.
+
+        Returns:
+            ``False`` if the generation is closed already, it was retired without pins.
+        """
+        with self._lock:
+            if self.retired and not self.pins:
+                return False
+            self.pins += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.pins -= 1
+            closing = self.retired and not self.pins
+        if closing:
+            self.close()
+
+    def retire(self) -> None:
+        """Mark the generation as replaced, it's closed once its last pin is released."""
+        with self._lock:
+            self.retired = True
+            closing = not self.pins
+        if closing:
+            self.close()
+
+    def close(self) -> None:
+        """Unmap the generation's mapped text maps."""
+        for text_map in self.mapped_text_maps.values():
+            text_map.close()
+        self.mapped_text_maps.clear()
+
+
+class GenerationAttribute:
+    """A client attribute stored on the generation the client currently resolves to.
+
+    ``_data = GenerationAttribute()`` on a client class reads and writes ``generation.data``.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._field = name.removeprefix("_")
+
+    def __get__(self, client: Any, owner: type | None = None) -> Any:
+        if client is None:
+            return self
+        return getattr(client._generation, self._field)
+
+    def __set__(self, client: Any, value: Any) -> None:
+        setattr(client._generation, self._field, value)
+
+
+def get_pinned(owner: object) -> DataGeneration | None:
+    """Get the generation ``owner`` is pinned to in the current context, if any."""
+    pinned = _PINNED.get()
+    return None if pinned is None else pinned.get(owner)
+
+
+def pin(owner: object, generation: DataGeneration) -> Token[dict[object, DataGeneration] | None]:
+    """Pin ``owner`` to a generation in the current context, until `unpin` is called."""
+    return _PINNED.set({**(_PINNED.get() or {}), owner: generation})
+
+
+def unpin(token: Token[dict[object, DataGeneration] | None]) -> None:
+    _PINNED.reset(token)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import time
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterator, Sequence
+    from contextlib import AbstractContextManager
+
+type Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Upper bounds of the duration histogram's buckets, in seconds."""
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class Stage(StrEnum):
+    """A stage of getting data, timed as a span."""
+
+    DOWNLOAD = "download"
+    READ = "read"
+    """Reading a file from disk, and decompressing it if it's compressed."""
+    PARSE = "parse"
+    """Decoding a file's JSON."""
+    DEOBFUSCATE = "deobfuscate"
+    MERGE = "merge"
+    """Joining or merging tables into the rows a ``get_*`` method validates."""
+    VALIDATE = "validate"
+    TRANSLATE = "translate"
+    """Translating the entities a ``get_*`` method returns."""
+
+
+class Counter(StrEnum):
+    FILE_CACHE_HITS = "file_cache_hits"
+    FILE_CACHE_MISSES = "file_cache_misses"
+    TRANSLATE_MISSES = "translate_misses"
+    """A text map hash without a translation, returned unchanged."""
+
+
+class Instrumentation:
+    """Receives timed spans and counters from clients.
+
+    This base class discards everything and is every client's default, so an uninstrumented
+    client only pays for a method call per span. Subclass it to bridge to a metrics system::
+
+        class LoggingInstrumentation(Instrumentation):
+            @contextlib.contextmanager
+            def span(self, stage, *, game, table=None, lang=None):
+                start = time.perf_counter()
+                yield
+                print(stage, game, table, lang, time.perf_counter() - start)
+
+        client = GIClient(instrumentation=LoggingInstrumentation())
+
+    ``table`` is the data table or file a span or count is about, ``lang`` the language a
+    ``get_*`` method translates into. Either is ``None`` when it doesn't apply.
+    """
+
+    def span(
+        self,
+        stage: Stage,  # ruff: ignore[unused-method-argument]
+        *,
+        game: str,  # ruff: ignore[unused-method-argument]
+        table: str | None = None,  # ruff: ignore[unused-method-argument]
+        lang: str | None = None,  # ruff: ignore[unused-method-argument]
+    ) -> AbstractContextManager[object]:
+        """Time the code run in the returned context manager."""
+        return _NULL_SPAN
+
+    def count(
+        self, counter: Counter, *, game: str, table: str | None = None, lang: str | None = None
+    ) -> None:
+        """Count one occurrence of an event."""
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """Aggregates spans into duration histograms and counters, in Prometheus' data model.
+
+    Nothing is exported by itself: ``render()`` returns the text exposition format, to serve
+    from a metrics endpoint, and ``samples()`` yields the raw samples, to bridge into an
+    existing exporter, e.g. from a ``prometheus_client`` custom collector.
+
+    Spans are aggregated into ``<namespace>_stage_duration_seconds``, labelled by stage, game,
+    table and lang, and every `Counter` into ``<namespace>_<counter>_total``.
+
+    Args:
+        namespace: The prefix of every metric name.
+        buckets: The upper bounds of the duration histogram's buckets, in seconds.
+    """
+
+    def __init__(
+        self, *, namespace: str = "hb_data", buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self._namespace = namespace
+        self._buckets = tuple(sorted(buckets))
+        # Per label set, the observation count of every bucket, not cumulative, and their sum
+        self._histograms: dict[Labels, tuple[list[int], list[float]]] = {}
+        self._counters: dict[tuple[Counter, Labels], int] = {}
+
+    @contextlib.contextmanager
+    def span(
+        self, stage: Stage, *, game: str, table: str | None = None, lang: str | None = None
+    ) -> Generator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            labels = _get_labels(stage=stage, game=game, table=table, lang=lang)
+            self.observe(labels, time.perf_counter() - start)
+
+    def count(
+        self, counter: Counter, *, game: str, table: str | None = None, lang: str | None = None
+    ) -> None:
+        key = (counter, _get_labels(game=game, table=table, lang=lang))
+        self._counters[key] = self._counters.get(key, 0) + 1
+
+    def observe(self, labels: Labels, duration: float) -> None:
+        """Record a span's duration in seconds."""
+        histogram = self._histograms.get(labels)
+        if histogram is None:
+            histogram = self._histograms[labels] = ([0] * (len(self._buckets) + 1), [0.0])
+        counts, total = histogram
+        counts[bisect.bisect_left(self._buckets, duration)] += 1
+        total[0] += duration
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yield every sample as its metric name, labels and value."""
+        name = f"{self._namespace}_stage_duration_seconds"
+        for labels, (counts, total) in self._histograms.items():
+            cumulative = 0
+            for bound, count in zip((*self._buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                yield f"{name}_bucket", {**dict(labels), "le": _format_value(bound)}, cumulative
+            yield f"{name}_sum", dict(labels), total[0]
+            yield f"{name}_count", dict(labels), cumulative
+
+        # Grouped by counter, the exposition format wants a metric's samples together
+        for (counter, labels), value in sorted(self._counters.items()):
+            yield f"{self._namespace}_{counter}_total", dict(labels), value
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        typed: set[str] = set()
+        for name, labels, value in self.samples():
+            if name.endswith("_total"):
+                metric, kind = name.removesuffix("_total"), "counter"
+            else:
+                metric, kind = name.rsplit("_", maxsplit=1)[0], "histogram"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} {kind}")
+
+            label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _get_labels(**labels: str | None) -> Labels:
+    # Every sample of a metric has the same label names, Prometheus treats empty ones as unset
+    return tuple((key, value or "") for key, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import uuid
+from typing import TYPE_CHECKING
+
+import orjson
+from loguru import logger
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from hb_data.common.base_deob import BaseDeobfuscator
+
+
+def get_key_map_path(table_path: Path) -> Path:
+    return table_path.with_name(f"{table_path.stem}.keymap.json")
+
+
+def _read_key_map_file(path: Path) -> dict | None:
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except orjson.JSONDecodeError as e:
+        logger.warning(f"Ignoring corrupt key map {path}: {e}")
+        return None
+
+
+def _write_key_map_file(path: Path, content: dict) -> None:
+    temp_path = path.parent / f".tmp_{uuid.uuid4().hex}_{path.name}"
+    temp_path.write_bytes(orjson.dumps(content, option=orjson.OPT_INDENT_2))
+    temp_path.replace(path)
+
+
+def resolve_key_map(deobfuscator: BaseDeobfuscator, table_path: Path) -> dict[str, str]:
+    """Get the deobfuscator's key map, persisted next to the table it was inferred from.
+
+    Inference only runs again when the table's fingerprint changes. If the re-inferred key
+    map differs from the persisted one, upstream reshuffled the obfuscated keys.
+    """
+    path = get_key_map_path(table_path)
+    fingerprint = deobfuscator.fingerprint
+    stored = _read_key_map_file(path)
+    if stored is not None and stored.get("fingerprint") == fingerprint:
+        return stored["key_map"]
+
+    key_map = deobfuscator.generate_key_map()
+    if stored is not None and stored.get("key_map") != key_map:
+        logger.info(f"Obfuscated keys of {table_path.stem} were reshuffled upstream: {key_map}")
+
+    _write_key_map_file(path, {"fingerprint": fingerprint, "key_map": key_map})
+    return key_map
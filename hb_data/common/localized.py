@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pydantic import BaseModel
+
+
+def get_localized_fields(model: type[BaseModel]) -> frozenset[str]:
+    """The fields of a model that hold text map hashes, declared as ``LOCALIZED_FIELDS``."""
+    return getattr(model, "LOCALIZED_FIELDS", frozenset())
+
+
+class Translator[L]:
+    """Translates text map hashes into one language, bound to a client.
+
+    Get one with ``client.get_translator(lang)``. Together with a catalog built by
+    ``get_*(lang=None)``, whose entities keep their text map hashes, one shared catalog serves
+    every language::
+
+        characters = client.get_characters(lang=None)
+        ja = client.get_translator(Language.JA)
+        names = [ja.localize(character).name for character in characters]
+    """
+
+    __slots__ = ("_lang", "_translate", "_translate_name")
+
+    def __init__(
+        self,
+        translate: Callable[[str, L], str],
+        lang: L,
+        *,
+        translate_name: Callable[[str, L], str] | None = None,
+    ) -> None:
+        self._translate = translate
+        self._translate_name = translate_name or translate
+        self._lang = lang
+
+    @property
+    def lang(self) -> L:
+        return self._lang
+
+    def __call__(self, text_map_hash: str) -> str:
+        return self._translate(text_map_hash, self._lang)
+
+    def translate_field(self, field: str, text_map_hash: str) -> str:
+        """Translate the value of an entity's field, names may be special-cased by the game."""
+        if field == "name":
+            return self._translate_name(text_map_hash, self._lang)
+        return self._translate(text_map_hash, self._lang)
+
+    def localize[M: BaseModel](self, entity: M) -> Localized[M]:
+        return Localized(entity, self)
+
+
+class Localized[M: BaseModel]:
+    """A read-only view of a language-agnostic entity in one language.
+
+    Localized fields are translated each time they are read, every other attribute, including
+    properties, comes from the entity unchanged.
+    """
+
+    __slots__ = ("_entity", "_translator")
+
+    def __init__(self, entity: M, translator: Translator[Any]) -> None:
+        self._entity = entity
+        self._translator = translator
+
+    @property
+    def entity(self) -> M:
+        return self._entity
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._entity, name)
+        if name in get_localized_fields(type(self._entity)):
+            return self._translator.translate_field(name, value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"Localized({self._entity!r}, lang={self._translator.lang!r})"
+
+    def to_model(self) -> M:
+        """Copy the entity with its localized fields translated, e.g. to serialize it."""
+        fields = get_localized_fields(type(self._entity))
+        return self._entity.model_copy(
+            update={
+                field: self._translator.translate_field(field, getattr(self._entity, field))
+                for field in fields
+            }
+        )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from typing import Self
+
+
+class LoopMonitor:
+    """Measures how long the event loop is blocked while it's active.
+
+    A background task asks to be woken up every ``interval`` seconds, and any delay past that is
+    time the loop spent running something else without yielding::
+
+        async with LoopMonitor() as monitor:
+            await client.read_text_maps()
+        print(monitor.max_lag, monitor.total_lag)
+
+    Args:
+        interval: How often the loop is probed in seconds, lags shorter than this are missed.
+    """
+
+    def __init__(self, *, interval: float = 0.001) -> None:
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+        self.max_lag = 0.0
+        """The longest the loop was blocked at once, in seconds."""
+        self.total_lag = 0.0
+        """The total time the loop was blocked, in seconds."""
+        self.samples = 0
+        """How many times the loop was probed."""
+
+    async def __aenter__(self) -> Self:
+        self.start()
+        # Let the probe take its first timestamp before the measured code runs
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # ruff: ignore[missing-type-function-argument]
+        await self.stop()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._probe())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _probe(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            self._record(time.perf_counter() - start - self._interval)
+
+    def _record(self, lag: float) -> None:
+        lag = max(lag, 0.0)
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+
+import aiofiles
+import aiofiles.os
+import orjson
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from yarl import URL
+
+MANIFEST_FILE_NAME = ".manifest.json"
+
+
+@dataclass(slots=True)
+class ManifestEntry:
+    etag: str | None = None
+    last_modified: str | None = None
+    size: int | None = None
+
+
+class Manifest:
+    """Per-directory record of the validators upstream sent for each downloaded URL."""
+
+    def __init__(self, path: Path, entries: dict[str, ManifestEntry] | None = None) -> None:
+        self._path = path
+        self._entries: dict[str, ManifestEntry] = entries or {}
+        self._dirty = False
+
+    @classmethod
+    async def load(cls, directory: Path) -> Manifest:
+        path = directory / MANIFEST_FILE_NAME
+        try:
+            async with aiofiles.open(path, "rb") as f:
+                raw: dict[str, dict] = orjson.loads(await f.read())
+        except FileNotFoundError:
+            return cls(path)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Ignoring corrupt manifest {path}: {e}")
+            return cls(path)
+
+        return cls(path, {url: ManifestEntry(**entry) for url, entry in raw.items()})
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the URLs with an entry."""
+        return iter(self._entries)
+
+    def get(self, url: URL) -> ManifestEntry | None:
+        return self._entries.get(str(url))
+
+    def set(self, url: URL, entry: ManifestEntry) -> None:
+        self._entries[str(url)] = entry
+        self._dirty = True
+
+    def pop(self, url: URL) -> None:
+        if self._entries.pop(str(url), None) is not None:
+            self._dirty = True
+
+    async def save(self) -> None:
+        if not self._dirty:
+            return
+
+        temp_path = self._path.parent / f".tmp_{uuid.uuid4().hex}_{self._path.name}"
+        content = orjson.dumps(
+            {url: asdict(entry) for url, entry in self._entries.items()},
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS,
+        )
+        await aiofiles.os.makedirs(self._path.parent, exist_ok=True)
+        async with aiofiles.open(temp_path, "wb") as f:
+            await f.write(content)
+        await aiofiles.os.replace(temp_path, self._path)
+        self._dirty = False
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Self
+
+import orjson
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEFAULT_PARSE_THRESHOLD = 1024 * 1024
+
+
+class ParseExecutor:
+    """Parses large JSON files in an executor instead of on the event loop, shareable between clients.
+
+    Content smaller than ``threshold`` is parsed inline, where handing it off would cost more
+    than parsing it.
+
+    orjson holds the GIL while parsing, so on a regular CPython build a thread pool only moves
+    the parse to another thread, the event loop still waits for it. A process pool parses
+    without the GIL, but the parsed data is then unpickled in this process, which costs most of
+    what parsing does. It pays off for work whose result is small, like converting text maps to
+    binary files in `TextMapMode.MAPPED`. Measure with `LoopMonitor` before choosing one.
+
+    Args:
+        max_workers: Size of the pool, the executor's default if ``None``.
+        threshold: Size in bytes from which content is parsed in the pool.
+        use_processes: Use a process pool instead of a thread pool.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        threshold: int = DEFAULT_PARSE_THRESHOLD,
+        use_processes: bool = False,
+    ) -> None:
+        self._max_workers = max_workers
+        self._threshold = threshold
+        self._use_processes = use_processes
+        self._executor: Executor | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # ruff: ignore[missing-type-function-argument]
+        self.close()
+
+    @property
+    def threshold(self) -> int:
+        return self._threshold
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self._use_processes:
+                self._executor = ProcessPoolExecutor(self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self._max_workers, thread_name_prefix="hb_data-parse"
+                )
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run[T](self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func`` in the pool, it must be picklable if the pool uses processes."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    async def parse(self, content: bytes) -> Any:
+        """Parse JSON, in the pool if it's at least ``threshold`` bytes long.
+
+        Raises:
+            orjson.JSONDecodeError: If the content isn't valid JSON.
+        """
+        if len(content) < self._threshold:
+            return orjson.loads(content)
+        return await self.run(orjson.loads, content)
@@ -0,0 +1,131 @@
+"""Serve downloaded data to the other nodes of a cluster, so only one of them hits upstream.
+
+One node downloads as usual and runs a `PeerCacheServer` over its data directory. The other
+nodes point their clients at it instead of upstream::
+
+    # On the serving node
+    async with GIClient() as client, PeerCacheServer(host="0.0.0.0", port=8080):
+        ...  # Keep the data fresh with ``await client.download(refresh=True)``
+
+    # On every other node
+    client = GIClient(upstream_url="http://node:8080/gi", text_map_url="http://node:8080/gi")
+
+Each game's files are served under ``/<game>/`` by file name, whatever the path in between, so
+a peer mirrors any upstream layout: the data URL ``<upstream_url>/ExcelBinOutput/<table>.json``
+serves ``.hb_data/gi/<table>.json``. Responses carry an ETag and Last-Modified and conditional
+requests are answered with 304, so refreshing clients only transfer files that changed.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+import aiofiles.os
+from aiohttp import web
+from loguru import logger
+from yarl import URL
+
+from hb_data.common.manifest import MANIFEST_FILE_NAME, Manifest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class PeerCacheServer:
+    """Serves a data directory's downloaded files and manifest over HTTP.
+
+    Only files the directory's manifest records as downloaded, and the manifest itself at
+    ``/<game>/.manifest.json``, are served, never snapshots, warm caches or temporary files.
+
+    Args:
+        directory: The data directory the serving node's clients download into.
+        host: The interface to listen on, ``"0.0.0.0"`` to serve other hosts.
+        port: The port to listen on, 0 picks a free one.
+    """
+
+    def __init__(
+        self, *, directory: Path = Path(".hb_data"), host: str = "127.0.0.1", port: int = 8080
+    ) -> None:
+        self._directory = directory
+        self._host = host
+        self._port = port
+        self._runner: web.AppRunner | None = None
+        # The served file names per game, with the manifest's modification time they're from
+        self._file_names: dict[str, tuple[int, frozenset[str]]] = {}
+
+        self._app = web.Application()
+        self._app.router.add_get("/{game:[a-z0-9_]+}/{path:.+}", self._handle)
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # ruff: ignore[missing-type-function-argument]
+        await self.close()
+
+    @property
+    def app(self) -> web.Application:
+        """The application, e.g. to run it on an existing runner or a test server."""
+        return self._app
+
+    @property
+    def url(self) -> URL:
+        """The server's base URL, append the game to get a client's ``upstream_url``."""
+        if self._runner is None:
+            msg = "The server is not running. Run `await server.start()` first."
+            raise RuntimeError(msg)
+
+        host, port = self._runner.addresses[0][:2]
+        return URL.build(scheme="http", host=host, port=port)
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+
+        runner = web.AppRunner(self._app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, self._host, self._port).start()
+        self._runner = runner
+        logger.info(f"Serving {self._directory} at {self.url}")
+
+    async def close(self) -> None:
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
+
+    async def _get_file_names(self, directory: Path) -> frozenset[str]:
+        """Get the names of the files the manifest records, re-read when it changes."""
+        try:
+            mtime = (await aiofiles.os.stat(directory / MANIFEST_FILE_NAME)).st_mtime_ns
+        except FileNotFoundError:
+            return frozenset()
+
+        cached = self._file_names.get(directory.name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        manifest = await Manifest.load(directory)
+        file_names = frozenset(_get_file_names(manifest))
+        self._file_names[directory.name] = (mtime, file_names)
+        return file_names
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        directory = self._directory / request.match_info["game"]
+        file_name = request.match_info["path"].rsplit("/", maxsplit=1)[-1]
+
+        served = await self._get_file_names(directory)
+        if file_name != MANIFEST_FILE_NAME and file_name not in served:
+            raise web.HTTPNotFound
+
+        file_path = directory / file_name
+        if not await aiofiles.os.path.isfile(file_path):
+            raise web.HTTPNotFound
+        # Handles If-None-Match and If-Modified-Since, and sends the ETag and Last-Modified
+        return web.FileResponse(file_path)
+
+
+def _get_file_names(urls: Iterable[str]) -> Iterable[str]:
+    # Clients name downloaded files after the last part of their URL
+    return (URL(url).parts[-1] for url in urls)
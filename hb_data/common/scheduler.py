@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Self
+
+import aiohttp
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from pathlib import Path
+
+    from yarl import URL
+
+RETRYABLE_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class DownloadStatus(StrEnum):
+    DOWNLOADED = "downloaded"
+    NOT_MODIFIED = "not_modified"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class DownloadResult:
+    url: URL
+    path: Path
+    status: DownloadStatus
+    error: BaseException | None = None
+
+
+def _is_retryable(error: BaseException) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, (aiohttp.ClientError, TimeoutError))
+
+
+class DownloadScheduler:
+    """Bounded-concurrency request scheduler that can be shared between clients.
+
+    Requests are capped per host, retried with jittered exponential backoff on transient
+    failures, and every client started with the same scheduler shares its pooled connector.
+    A scheduler is bound to the event loop it is first used in.
+
+    Args:
+        limit: Maximum number of open connections across all hosts.
+        limit_per_host: Maximum number of concurrent requests to a single host.
+        max_retries: How many times a failed request is retried before giving up.
+        backoff_base: Base delay in seconds, doubled on every retry.
+        backoff_max: Upper bound for a single backoff delay in seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = 32,
+        limit_per_host: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ) -> None:
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+
+        self._connector: aiohttp.TCPConnector | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:  # ruff: ignore[missing-type-function-argument]
+        await self.close()
+
+    @property
+    def connector(self) -> aiohttp.TCPConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self._limit, limit_per_host=self._limit_per_host
+            )
+        return self._connector
+
+    async def close(self) -> None:
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+
+    def _get_host_semaphore(self, url: URL) -> asyncio.Semaphore:
+        host = url.host or ""
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self._limit_per_host)
+        return self._host_semaphores[host]
+
+    def _get_backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self._backoff_max, self._backoff_base * 2**attempt))
+
+    async def run[T](self, url: URL, func: Callable[[], Awaitable[T]]) -> T:
+        """Run a request to ``url`` under the host's concurrency limit, retrying on failure.
+
+        ``func`` is called again for every attempt. Non-transient errors, and the last error
+        once retries are exhausted, are re-raised.
+        """
+        semaphore = self._get_host_semaphore(url)
+        attempt = 0
+        while True:
+            try:
+                async with semaphore:
+                    return await func()
+            except Exception as e:
+                if attempt >= self._max_retries or not _is_retryable(e):
+                    raise
+
+                delay = self._get_backoff(attempt)
+                attempt += 1
+                logger.warning(
+                    f"Request to {url} failed ({e!r}), retrying in {delay:.2f}s "
+                    f"({attempt}/{self._max_retries})"
+                )
+                await asyncio.sleep(delay)
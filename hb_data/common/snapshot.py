@@ -0,0 +1,104 @@
+"""Versioned binary snapshots of the tables and text maps a client has read.
+
+A snapshot is a single file per game holding everything ``download()`` would otherwise parse
+from the individual JSON files, already deobfuscated where applicable. It records the size and
+mtime of every source file, so it is ignored as soon as any of them is re-downloaded.
+
+Snapshots hold rows, not the models ``get_*`` methods build from them, so catalogs are still
+validated after a restore. Only ``BaseClient.load_warm_cache`` restores built catalogs.
+
+A client with a table store records only the store's sources of its tables, not their rows, so
+its snapshot is only restored while the store still holds those tables.
+
+Layout::
+
+    MAGIC | u16 format version | u32 header length | header (JSON) | body (marshal)
+"""
+
+from __future__ import annotations
+
+import marshal
+import struct
+import sys
+import uuid
+from typing import TYPE_CHECKING, Any
+
+import aiofiles
+import aiofiles.os
+import orjson
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+SNAPSHOT_FILE_NAME = "snapshot.bin"
+# Bump whenever the payload layout, or the deobfuscated shape of any table, changes.
+SNAPSHOT_VERSION = 4
+
+_MAGIC = b"HBSNAP\x00\x00"
+_PREFIX = struct.Struct("<HI")
+
+
+async def get_fingerprint(sources: Sequence[Path]) -> list[list[Any]]:
+    """Identify the current state of the source files, raises if any of them is missing."""
+    fingerprint: list[list[Any]] = []
+    for path in sorted(sources):
+        stat = await aiofiles.os.stat(path)
+        fingerprint.append([path.name, stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+
+def _encode(fingerprint: list[list[Any]], payload: dict[str, Any]) -> bytes:
+    # marshal's format is tied to the interpreter version, so record it alongside the sources.
+    header = orjson.dumps({"python": list(sys.version_info[:2]), "sources": fingerprint})
+    return b"".join(
+        (_MAGIC, _PREFIX.pack(SNAPSHOT_VERSION, len(header)), header, marshal.dumps(payload))
+    )
+
+
+def _decode(content: bytes, fingerprint: list[list[Any]]) -> dict[str, Any] | None:
+    if not content.startswith(_MAGIC):
+        return None
+
+    offset = len(_MAGIC)
+    version, header_len = _PREFIX.unpack_from(content, offset)
+    if version != SNAPSHOT_VERSION:
+        return None
+
+    offset += _PREFIX.size
+    header = orjson.loads(content[offset : offset + header_len])
+    if header["python"] != list(sys.version_info[:2]) or header["sources"] != fingerprint:
+        return None
+
+    return marshal.loads(content[offset + header_len :])  # ruff: ignore[suspicious-marshal-usage]
+
+
+async def read_snapshot(path: Path, fingerprint: list[list[Any]]) -> dict[str, Any] | None:
+    """Read a snapshot, returning ``None`` if it is missing or was built from other sources."""
+    try:
+        async with aiofiles.open(path, "rb") as f:
+            content = await f.read()
+    except FileNotFoundError:
+        return None
+
+    try:
+        payload = _decode(content, fingerprint)
+    except (struct.error, orjson.JSONDecodeError, EOFError, ValueError, TypeError) as e:
+        logger.warning(f"Ignoring corrupt snapshot {path}: {e}")
+        return None
+
+    if payload is None:
+        logger.debug(f"Snapshot {path} is stale, ignoring it.")
+    return payload
+
+
+async def write_snapshot(path: Path, fingerprint: list[list[Any]], payload: dict[str, Any]) -> None:
+    temp_path = path.parent / f".tmp_{uuid.uuid4().hex}_{path.name}"
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            await f.write(_encode(fingerprint, payload))
+        await aiofiles.os.replace(temp_path, path)
+    finally:
+        if await aiofiles.os.path.exists(temp_path):
+            await aiofiles.os.remove(temp_path)
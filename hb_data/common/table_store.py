@@ -0,0 +1,229 @@
+"""Storage for a client's data tables outside of Python objects.
+
+By default clients hold every table they read as a list of dicts. A `TableStore` keeps them
+elsewhere instead, so memory doesn't grow with the number of tables, and indexes the keys rows
+are looked up and joined by::
+
+    store = SQLiteTableStore(".hb_data/tables.sqlite3")
+    async with GIClient(table_store=store) as client:
+        client.get_traveler_elements()  # Looks the Traveler up by ID in the index
+    store.close()
+
+Tables are stored as ``get_*`` methods read them, ZZZ's deobfuscated. Each is tagged with the
+source file it was read from, so a store that outlives the process skips tables whose file
+didn't change.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from itertools import starmap
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+from hb_data.common.dict_utils import index_by
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from pathlib import Path
+
+INDEXED_KEYS = ("id", "ID", "ItemID", "AvatarID", "SuitID", "skillDepotId")
+"""The keys rows are indexed by, in every table that has them."""
+
+_SCALARS = (int, float, str)
+# SQLite's default limit on the parameters of a statement, before 3.32
+_MAX_VARIABLES = 999
+
+
+class TableStore:
+    """Where a client keeps its data tables, subclass it to add a backend.
+
+    Names are unique across games, a store can be shared by every client.
+    """
+
+    def __contains__(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the stored tables."""
+        raise NotImplementedError
+
+    def get_source(self, name: str) -> str | None:
+        """Get the source a table was stored from, ``None`` if it isn't stored."""
+        raise NotImplementedError
+
+    def put(self, name: str, rows: Sequence[dict[str, Any]], *, source: str | None = None) -> None:
+        """Store a table, replacing the previous one with the same name.
+
+        Args:
+            name: The table's name.
+            rows: The table's rows.
+            source: Identifies what the rows were read from, e.g. the file's size and
+                modification time.
+        """
+        raise NotImplementedError
+
+    def get_rows(self, name: str) -> list[dict[str, Any]]:
+        """Get every row of a table, in the order they were stored."""
+        raise NotImplementedError
+
+    def lookup(self, name: str, key: str, value: Any) -> dict[str, Any] | None:
+        """Get the last row of a table whose ``key`` is ``value``, like `index_by`."""
+        raise NotImplementedError
+
+    def lookup_many(self, name: str, key: str, values: Iterable[Any]) -> dict[Any, dict[str, Any]]:
+        """Get the last row of a table for each of ``values`` of ``key`` that has one, by value."""
+        matches = {value: self.lookup(name, key, value) for value in values}
+        return {value: row for value, row in matches.items() if row is not None}
+
+    def is_indexed(self, name: str, key: str) -> bool:  # ruff: ignore[unused-method-argument]
+        """Whether `lookup` and `lookup_many` find a table's rows by ``key`` without scanning the table.
+
+        Clients join tables through `lookup_many` for indexed keys, and load the rows otherwise.
+        """
+        return False
+
+    def close(self) -> None:
+        """Release the store's resources."""
+
+
+class SQLiteTableStore(TableStore):
+    """Tables stored in a SQLite database, each row as JSON alongside its indexed keys.
+
+    Point lookups by an `INDEXED_KEYS` key go through a B-tree index. Lookups by any other key
+    scan the table. The connection is shared between threads, serialized by a lock, so clients
+    can store tables from a worker thread.
+
+    Args:
+        path: The database file, created if missing, or ``":memory:"``.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS hb_tables "
+            "(name TEXT PRIMARY KEY, source TEXT, keys TEXT NOT NULL)"
+        )
+        # The indexed keys of every stored table, in the order of its key columns
+        self._keys: dict[str, list[str]] = {
+            name: orjson.loads(keys)
+            for name, keys in self._connection.execute("SELECT name, keys FROM hb_tables")
+        }
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._keys))
+
+    def get_source(self, name: str) -> str | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT source FROM hb_tables WHERE name = ?", (name,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, name: str, rows: Sequence[dict[str, Any]], *, source: str | None = None) -> None:
+        table = _get_table_name(name)
+        keys = [key for key in INDEXED_KEYS if any(key in row for row in rows)]
+        columns = "".join(f", k{i}" for i in range(len(keys)))
+        placeholders = ", ?" * len(keys)
+
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                cursor.execute(f"CREATE TABLE {table} (data BLOB NOT NULL{columns})")
+                cursor.executemany(
+                    f"INSERT INTO {table} (data{columns}) VALUES (?{placeholders})",  # ruff: ignore[hardcoded-sql-expression]
+                    ((orjson.dumps(row), *_get_key_values(row, keys)) for row in rows),
+                )
+                for i in range(len(keys)):
+                    index = _quote(f"t_{name}_k{i}")
+                    cursor.execute(f"CREATE INDEX {index} ON {table} (k{i})")
+                cursor.execute(
+                    "INSERT OR REPLACE INTO hb_tables (name, source, keys) VALUES (?, ?, ?)",
+                    (name, source, orjson.dumps(keys).decode()),
+                )
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+            self._keys[name] = keys
+
+    def get_rows(self, name: str) -> list[dict[str, Any]]:
+        if name not in self._keys:
+            raise KeyError(name)
+
+        with self._lock:
+            cursor = self._connection.execute(
+                f"SELECT data FROM {_get_table_name(name)} ORDER BY rowid"  # ruff: ignore[hardcoded-sql-expression]
+            )
+            return list(starmap(orjson.loads, cursor))
+
+    def lookup(self, name: str, key: str, value: Any) -> dict[str, Any] | None:
+        keys = self._keys.get(name)
+        if keys is None:
+            raise KeyError(name)
+        if key not in keys:
+            return next(
+                (row for row in reversed(self.get_rows(name)) if row.get(key) == value), None
+            )
+
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT data FROM {_get_table_name(name)} WHERE k{keys.index(key)} = ? "  # ruff: ignore[hardcoded-sql-expression]
+                "ORDER BY rowid DESC LIMIT 1",
+                (value,),
+            ).fetchone()
+        return None if row is None else orjson.loads(row[0])
+
+    def lookup_many(self, name: str, key: str, values: Iterable[Any]) -> dict[Any, dict[str, Any]]:
+        keys = self._keys.get(name)
+        if keys is None:
+            raise KeyError(name)
+        values = list(values)
+        if key not in keys:
+            index = index_by(self.get_rows(name), key)
+            return {value: index[value] for value in values if value in index}
+
+        column = f"k{keys.index(key)}"
+        matches: dict[Any, dict[str, Any]] = {}
+        with self._lock:
+            for i in range(0, len(values), _MAX_VARIABLES):
+                chunk = values[i : i + _MAX_VARIABLES]
+                cursor = self._connection.execute(
+                    f"SELECT {column}, data FROM {_get_table_name(name)} "  # ruff: ignore[hardcoded-sql-expression]
+                    f"WHERE {column} IN ({', '.join('?' * len(chunk))}) ORDER BY rowid",
+                    chunk,
+                )
+                # Later rows win
+                matches.update((value, orjson.loads(data)) for value, data in cursor)
+        return matches
+
+    def is_indexed(self, name: str, key: str) -> bool:
+        return key in self._keys.get(name, ())
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _get_table_name(name: str) -> str:
+    return _quote(f"t_{name}")
+
+
+def _get_key_values(row: dict[str, Any], keys: Sequence[str]) -> Iterator[Any]:
+    for key in keys:
+        value = row.get(key)
+        # Only scalars can be indexed, a row can't be looked up by anything else anyway
+        yield value if isinstance(value, _SCALARS) else None
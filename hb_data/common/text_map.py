@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import bisect
+import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, Self
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from pathlib import Path
+
+# Unsigned 32-bit, so a language's values may take up to 4 GiB
+_OFFSET_TYPECODE = "I"
+
+
+class TextMapMode(StrEnum):
+    EAGER = "eager"
+    """Read every text map in ``download()``, a dict per language."""
+    LAZY = "lazy"
+    """Read a language on its first ``translate()``, within an optional memory budget."""
+    COMPACT = "compact"
+    """Read every text map in ``download()`` and pack them into a `CompactTextMaps`."""
+    MAPPED = "mapped"
+    """Convert every text map to a binary file and look values up in it through ``mmap``."""
+
+
+def estimate_text_map_size(text_map: dict[str, str]) -> int:
+    """Approximate the memory held by a text map: the dict plus its key and value strings."""
+    return sys.getsizeof(text_map) + sum(
+        sys.getsizeof(k) + sys.getsizeof(v) for k, v in text_map.items()
+    )
+
+
+class TextMapCache:
+    """Text maps read on first use and evicted least recently used first.
+
+    Args:
+        loader: Reads a text map file, raising ``FileNotFoundError`` if it's missing.
+        budget: Approximate memory, in bytes, the cached text maps may hold. The most recently
+            used text map is always kept, even if it alone exceeds the budget. ``None`` never
+            evicts.
+    """
+
+    def __init__(
+        self, loader: Callable[[Path], dict[str, str]], *, budget: int | None = None
+    ) -> None:
+        self._loader = loader
+        self._budget = budget
+        self._text_maps: OrderedDict[Path, dict[str, str]] = OrderedDict()
+        self._sizes: dict[Path, int] = {}
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._text_maps
+
+    @property
+    def size(self) -> int:
+        """The estimated memory held by the cached text maps, 0 without a budget."""
+        return sum(self._sizes.values())
+
+    def get(self, path: Path) -> dict[str, str]:
+        text_map = self._text_maps.get(path)
+        if text_map is not None:
+            self._text_maps.move_to_end(path)
+            return text_map
+
+        logger.debug(f"Reading text map {path}")
+        try:
+            text_map = self._loader(path)
+        except FileNotFoundError:
+            logger.warning(f"File {path} not found. Run `await client.download()` first.")
+            return {}
+
+        self._text_maps[path] = text_map
+        self._sizes[path] = estimate_text_map_size(text_map) if self._budget is not None else 0
+        self._evict()
+        return text_map
+
+    def _evict(self) -> None:
+        if self._budget is None:
+            return
+
+        while len(self._text_maps) > 1 and self.size > self._budget:
+            path, _ = self._text_maps.popitem(last=False)
+            del self._sizes[path]
+            logger.debug(f"Evicted text map {path}")
+
+    def discard(self, path: Path) -> None:
+        """Drop a text map, e.g. because its file was re-downloaded."""
+        self._text_maps.pop(path, None)
+        self._sizes.pop(path, None)
+
+    def clear(self) -> None:
+        self._text_maps.clear()
+        self._sizes.clear()
+
+
+@dataclass(frozen=True, slots=True)
+class PackedValues:
+    """One language's values, UTF-8 encoded back to back.
+
+    ``blob[offsets[i] : offsets[i + 1]]`` is the value of the i-th key of the shared index.
+    ``missing`` holds the indexes of keys the language has no value for.
+    """
+
+    blob: bytes
+    offsets: array[int]
+    missing: frozenset[int]
+
+
+class CompactTextMaps:
+    """Every language's text map of a game, sharing one sorted key index.
+
+    A dict per language repeats every hash key and keeps a separate string object per value.
+    Here the keys are stored once, looked up with a binary search, and each language only
+    adds its packed values.
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys: list[str], values: dict[str, PackedValues]) -> None:
+        self._keys = keys
+        self._values = values
+
+    @classmethod
+    def from_text_maps(cls, text_maps: Mapping[str, Mapping[str, str]]) -> Self:
+        keys = sorted(set().union(*text_maps.values()))
+        values: dict[str, PackedValues] = {}
+
+        for lang, text_map in text_maps.items():
+            parts: list[bytes] = []
+            offsets = array(_OFFSET_TYPECODE, [0])
+            missing: set[int] = set()
+            end = 0
+
+            for i, key in enumerate(keys):
+                value = text_map.get(key)
+                if value is None:
+                    missing.add(i)
+                else:
+                    encoded = value.encode()
+                    parts.append(encoded)
+                    end += len(encoded)
+                offsets.append(end)
+
+            values[lang] = PackedValues(b"".join(parts), offsets, frozenset(missing))
+
+        return cls(keys, values)
+
+    @property
+    def languages(self) -> list[str]:
+        return list(self._values)
+
+    def index(self, key: str) -> int | None:
+        """Find a key in the shared index, ``None`` if no language has it."""
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return None
+
+    def get(self, key: str, lang: str) -> str | None:
+        packed = self._values.get(lang)
+        if packed is None:
+            return None
+
+        i = self.index(key)
+        if i is None or i in packed.missing:
+            return None
+        return packed.blob[packed.offsets[i] : packed.offsets[i + 1]].decode()
+
+    def to_dict(self, lang: str) -> dict[str, str]:
+        """Unpack a language back into a plain text map."""
+        packed = self._values[lang]
+        return {
+            key: packed.blob[packed.offsets[i] : packed.offsets[i + 1]].decode()
+            for i, key in enumerate(self._keys)
+            if i not in packed.missing
+        }
+
+    def merged(self, text_maps: Mapping[str, Mapping[str, str]]) -> CompactTextMaps:
+        """Return a copy with ``text_maps`` added, replacing languages it already holds."""
+        kept = {lang: self.to_dict(lang) for lang in self._values if lang not in text_maps}
+        return CompactTextMaps.from_text_maps({**kept, **text_maps})
+
+    def to_builtins(self) -> dict[str, Any]:
+        """Convert to builtins ``marshal`` can serialize, e.g. for a snapshot."""
+        return {
+            "keys": self._keys,
+            "values": {
+                lang: [packed.blob, packed.offsets.tobytes(), sorted(packed.missing)]
+                for lang, packed in self._values.items()
+            },
+        }
+
+    @classmethod
+    def from_builtins(cls, content: dict[str, Any]) -> Self:
+        values: dict[str, PackedValues] = {}
+        for lang, (blob, offsets_bytes, missing) in content["values"].items():
+            offsets = array(_OFFSET_TYPECODE)
+            offsets.frombytes(offsets_bytes)
+            values[lang] = PackedValues(blob, offsets, frozenset(missing))
+        return cls(content["keys"], values)
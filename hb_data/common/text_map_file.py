@@ -0,0 +1,197 @@
+"""Binary text map files, looked up in place through ``mmap``.
+
+Every process that maps the same file shares its pages in the page cache, instead of holding
+its own parsed copy of the text map on the heap.
+
+Layout, with little-endian integers::
+
+    MAGIC | u32 format version | u32 entry count
+    | u32 key offsets[count + 1] | u32 value offsets[count + 1] | keys | values
+
+Keys and values are UTF-8 encoded back to back, keys sorted by their encoded bytes. Offsets
+are relative to the start of their blob.
+"""
+
+from __future__ import annotations
+
+import bisect
+import mmap
+import struct
+import sys
+import uuid
+from array import array
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Self
+
+import orjson
+
+from hb_data.common.cache_compression import read_file
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from pathlib import Path
+
+TEXT_MAP_FILE_SUFFIX = ".bin"
+# Bump whenever the layout changes.
+TEXT_MAP_FILE_VERSION = 1
+
+_MAGIC = b"HBTMAP\x00\x00"
+_HEADER = struct.Struct("<II")
+_U32 = struct.Struct("<I")
+
+
+def get_text_map_file_path(json_path: Path) -> Path:
+    return json_path.with_suffix(TEXT_MAP_FILE_SUFFIX)
+
+
+def encode_text_map(text_map: Mapping[str, str]) -> bytes:
+    entries = sorted((k.encode(), v.encode()) for k, v in text_map.items())
+
+    key_offsets = [0]
+    value_offsets = [0]
+    for key, value in entries:
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(value))
+
+    offsets = struct.pack(f"<{len(key_offsets) * 2}I", *key_offsets, *value_offsets)
+    return b"".join(
+        (
+            _MAGIC,
+            _HEADER.pack(TEXT_MAP_FILE_VERSION, len(entries)),
+            offsets,
+            *(key for key, _ in entries),
+            *(value for _, value in entries),
+        )
+    )
+
+
+def write_text_map_file(path: Path, text_map: Mapping[str, str]) -> None:
+    temp_path = path.parent / f".tmp_{uuid.uuid4().hex}_{path.name}"
+    try:
+        temp_path.write_bytes(encode_text_map(text_map))
+        temp_path.replace(path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def ensure_text_map_file(json_path: Path) -> bool:
+    """Convert a JSON text map to a binary one next to it, unless it's already up to date.
+
+    Returns ``True`` if the binary file was (re)written, raises ``FileNotFoundError`` if the
+    JSON text map is missing.
+    """
+    path = get_text_map_file_path(json_path)
+    json_mtime = json_path.stat().st_mtime_ns
+    try:
+        if path.stat().st_mtime_ns >= json_mtime:
+            return False
+    except FileNotFoundError:
+        pass
+
+    write_text_map_file(path, orjson.loads(read_file(json_path)))
+    return True
+
+
+def view_offsets(view: memoryview, start: int, count: int) -> Sequence[int]:
+    """View an offset table in place, big-endian machines get a byte-swapped copy instead."""
+    table = view[start : start + count * _U32.size]
+    if sys.byteorder == "little":
+        return table.cast("I")
+
+    offsets = array("I")
+    offsets.frombytes(table)
+    offsets.byteswap()
+    table.release()
+    return offsets
+
+
+class MappedTextMap(Mapping[str, str]):
+    """A read-only text map backed by a memory-mapped binary text map file.
+
+    Lookups binary search the offset tables in place, through memoryviews of the mapping, so
+    nothing but the looked up key and value is copied to the heap.
+    """
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        if buffer[: len(_MAGIC)] != _MAGIC:
+            msg = "Not a binary text map file"
+            raise ValueError(msg)
+
+        start = len(_MAGIC) + _HEADER.size
+        if len(buffer) < start:
+            msg = "Truncated binary text map file"
+            raise ValueError(msg)
+
+        version, count = _HEADER.unpack_from(buffer, len(_MAGIC))
+        if version != TEXT_MAP_FILE_VERSION:
+            msg = f"Unsupported binary text map version {version}"
+            raise ValueError(msg)
+
+        keys = start + 2 * (count + 1) * _U32.size
+        if len(buffer) < keys:
+            msg = "Truncated binary text map file"
+            raise ValueError(msg)
+
+        # The last offset of each table is its blob's length
+        (keys_size,) = _U32.unpack_from(buffer, start + count * _U32.size)
+        (values_size,) = _U32.unpack_from(buffer, keys - _U32.size)
+        if len(buffer) < keys + keys_size + values_size:
+            msg = "Truncated binary text map file"
+            raise ValueError(msg)
+
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._count = count
+        self._key_offsets = view_offsets(self._view, start, count + 1)
+        self._value_offsets = view_offsets(self._view, start + (count + 1) * _U32.size, count + 1)
+        self._keys = keys
+        self._values = self._keys + self._key_offsets[count]
+
+    @classmethod
+    def open(cls, path: Path) -> Self:
+        with path.open("rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer)
+        except (ValueError, struct.error):
+            buffer.close()
+            raise
+
+    def close(self) -> None:
+        # The mapping can't be closed while views of it are alive
+        for view in (self._key_offsets, self._value_offsets, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        self._buffer.close()
+
+    def _get_key(self, i: int) -> bytes:
+        offsets = self._key_offsets
+        return self._buffer[self._keys + offsets[i] : self._keys + offsets[i + 1]]
+
+    def _get_value(self, i: int) -> str:
+        offsets = self._value_offsets
+        return self._buffer[self._values + offsets[i] : self._values + offsets[i + 1]].decode()
+
+    def _find(self, key: bytes) -> int | None:
+        i = bisect.bisect_left(range(self._count), key, key=self._get_key)
+        if i < self._count and self._get_key(i) == key:
+            return i
+        return None
+
+    def __getitem__(self, key: str) -> str:
+        i = self._find(key.encode())
+        if i is None:
+            raise KeyError(key)
+        return self._get_value(i)
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        # Skip Mapping.get's KeyError round trip, misses are common in translate()
+        i = self._find(key.encode())
+        return default if i is None else self._get_value(i)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._get_key(i).decode()
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import functools
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+
+
+@functools.cache
+def get_list_adapter[M: BaseModel](model: type[M]) -> TypeAdapter[list[M]]:
+    return TypeAdapter(list[model])
+
+
+def validate_rows[M: BaseModel](
+    model: type[M], rows: Sequence[dict[str, Any]], *, item_fields: Collection[str] = ()
+) -> list[M]:
+    """Validate every row in a single call, skipping the ones that fail.
+
+    Pydantic reports the errors of all rows at once, indexed by their position, so invalid rows
+    cost one extra call for the whole batch instead of an exception per row.
+
+    Args:
+        model: The model to validate the rows as.
+        rows: The rows, they are never mutated.
+        item_fields: List fields whose invalid items are dropped, keeping the rest of their row,
+            e.g. a character's skins.
+
+    Returns:
+        The models of the valid rows.
+    """
+    adapter = get_list_adapter(model)
+    try:
+        return adapter.validate_python(rows)
+    except ValidationError as e:
+        errors = e.errors()
+
+    invalid: set[int] = set()
+    invalid_items: defaultdict[int, defaultdict[str, set[int]]] = defaultdict(
+        lambda: defaultdict(set)
+    )
+    for error in errors:
+        loc = error["loc"]
+        if len(loc) > 2 and loc[1] in item_fields and isinstance(loc[2], int):
+            invalid_items[loc[0]][loc[1]].add(loc[2])
+        else:
+            invalid.add(loc[0])
+
+    item_count = sum(
+        len(items)
+        for i, fields in invalid_items.items()
+        if i not in invalid
+        for items in fields.values()
+    )
+    logger.warning(
+        f"Skipped {len(invalid)} invalid {model.__name__} row(s) and {item_count} invalid "
+        f"item(s) of other rows, first error: {errors[0]}"
+    )
+    return adapter.validate_python(
+        [
+            _drop_items(row, invalid_items[i]) if i in invalid_items else row
+            for i, row in enumerate(rows)
+            if i not in invalid
+        ]
+    )
+
+
+def _drop_items(row: dict[str, Any], invalid_items: dict[str, set[int]]) -> dict[str, Any]:
+    return {
+        **row,
+        **{
+            field: [item for i, item in enumerate(row[field]) if i not in items]
+            for field, items in invalid_items.items()
+        },
+    }
@@ -0,0 +1,244 @@
+"""A warm-start cache one process publishes and other processes on the same host map.
+
+The publisher writes the tables its ``get_*`` methods read, e.g. ZZZ's deobfuscated ones, and
+the catalogs it built into a single file per game, tagged with a generation number that
+increases with every publish. Readers map the file instead of downloading, parsing,
+deobfuscating and validating on warm-up, and comparing generations lets them notice when the
+publisher refreshed the data.
+
+Readers use the tables in place: a row is only decoded when it's read, so every process that
+maps the file shares its pages in the page cache, like `MappedTextMap` does for text maps.
+A catalog is decoded the first time a reader asks for it, since ``get_*`` methods hand out
+model instances. Text maps aren't part of the cache, readers share them through
+``TextMapMode.MAPPED`` files.
+
+The file holds JSON and offsets only, never anything that runs code when it's read.
+
+Layout, with little-endian integers::
+
+    MAGIC | u16 format version | u64 generation | u32 header length | header (JSON) | sections
+
+The header locates the sections, relative to the end of the header. A table section is
+``u32 row offsets[count + 1] | rows``, each row JSON encoded, and a catalog section is the
+catalog's JSON.
+"""
+
+from __future__ import annotations
+
+import functools
+import mmap
+import struct
+import uuid
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple, overload
+
+import orjson
+from loguru import logger
+
+from hb_data.common.text_map_file import view_offsets
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping
+    from pathlib import Path
+
+WARM_CACHE_FILE_NAME = "warm_cache.bin"
+# Bump whenever the layout changes.
+WARM_CACHE_VERSION = 2
+
+_MAGIC = b"HBWARM\x00\x00"
+_PREFIX = struct.Struct("<HQI")
+_U32 = struct.Struct("<I")
+
+type CatalogId = tuple[str, tuple[tuple[str, Any], ...]]
+"""A catalog's ``get_*`` method name and arguments."""
+
+
+class MappedRows(Sequence[dict[str, Any]]):
+    """A read-only table in a mapped warm cache, each row is decoded when it's read."""
+
+    def __init__(self, buffer: mmap.mmap, start: int, count: int) -> None:
+        rows = start + (count + 1) * _U32.size
+        # The last offset is the rows' length
+        if len(buffer) < rows or len(buffer) < rows + _U32.unpack_from(buffer, rows - _U32.size)[0]:
+            msg = "Truncated warm cache table"
+            raise ValueError(msg)
+
+        self._buffer = buffer
+        self._offsets = view_offsets(memoryview(buffer), start, count + 1)
+        self._rows = rows
+        self._count = count
+
+    def _decode(self, i: int) -> dict[str, Any]:
+        offsets = self._offsets
+        return orjson.loads(self._buffer[self._rows + offsets[i] : self._rows + offsets[i + 1]])
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            msg = "Row index out of range"
+            raise IndexError(msg)
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for i in range(self._count):
+            yield self._decode(i)
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class WarmCache(NamedTuple):
+    generation: int
+    tables: dict[str, MappedRows]
+    table_sources: dict[str, str | None]
+    catalogs: dict[CatalogId, Callable[[], Any]]
+    """Decodes each catalog's JSON."""
+
+
+def read_generation(path: Path) -> int:
+    """Get the generation of the published data, 0 if nothing was published yet."""
+    try:
+        with path.open("rb") as f:
+            prefix = f.read(len(_MAGIC) + _PREFIX.size)
+    except FileNotFoundError:
+        return 0
+
+    if not prefix.startswith(_MAGIC) or len(prefix) < len(_MAGIC) + _PREFIX.size:
+        return 0
+    version, generation, _ = _PREFIX.unpack_from(prefix, len(_MAGIC))
+    return generation if version == WARM_CACHE_VERSION else 0
+
+
+def read_warm_cache(path: Path) -> WarmCache | None:
+    """Map the published cache, ``None`` if there is none this version can read.
+
+    The mapping is closed once nothing references its tables and catalogs anymore.
+    """
+    try:
+        with path.open("rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logger.warning(f"Ignoring corrupt warm cache {path}: {e}")
+        return None
+
+    try:
+        return _decode(buffer)
+    except (ValueError, struct.error, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring corrupt warm cache {path}: {e}")
+        return None
+
+
+def _load_json(buffer: mmap.mmap, start: int, end: int) -> Any:
+    if len(buffer) < end:
+        msg = "Truncated warm cache catalog"
+        raise ValueError(msg)
+    return orjson.loads(buffer[start:end])
+
+
+def _decode(buffer: mmap.mmap) -> WarmCache | None:
+    if buffer[: len(_MAGIC)] != _MAGIC:
+        return None
+
+    offset = len(_MAGIC)
+    version, generation, header_len = _PREFIX.unpack_from(buffer, offset)
+    if version != WARM_CACHE_VERSION:
+        return None
+
+    offset += _PREFIX.size
+    header = orjson.loads(buffer[offset : offset + header_len])
+    body = offset + header_len
+    return WarmCache(
+        generation,
+        {
+            file_name: MappedRows(buffer, body + start, count)
+            for file_name, (start, count) in header["tables"].items()
+        },
+        header["table_sources"],
+        {
+            (name, tuple(map(tuple, arguments))): functools.partial(
+                _load_json, buffer, body + start, body + start + length
+            )
+            for name, arguments, start, length in header["catalogs"]
+        },
+    )
+
+
+def _encode_table(rows: Sequence[dict[str, Any]]) -> bytes:
+    encoded = [orjson.dumps(row) for row in rows]
+    offsets = [0]
+    for row in encoded:
+        offsets.append(offsets[-1] + len(row))
+    return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(encoded)
+
+
+def publish_warm_cache(
+    path: Path,
+    tables: Mapping[str, Sequence[dict[str, Any]]],
+    table_sources: Mapping[str, str | None],
+    catalogs: Mapping[CatalogId, bytes],
+) -> int:
+    """Publish data under the next generation, replacing the file atomically.
+
+    Only one process may publish to a path.
+
+    Args:
+        path: The cache file.
+        tables: The rows of each table.
+        table_sources: The table store's sources of the tables, see `TableStore.get_source`.
+        catalogs: The JSON of each catalog.
+
+    Returns:
+        The new generation.
+    """
+    sections: list[bytes] = []
+    size = 0
+
+    def add(section: bytes) -> int:
+        nonlocal size
+        start = size
+        # Keep the offset tables aligned
+        padding = -len(section) % _U32.size
+        sections.extend((section, b"\x00" * padding))
+        size += len(section) + padding
+        return start
+
+    header = {
+        "tables": {
+            file_name: [add(_encode_table(rows)), len(rows)] for file_name, rows in tables.items()
+        },
+        "table_sources": table_sources,
+        "catalogs": [
+            [name, arguments, add(content), len(content)]
+            for (name, arguments), content in catalogs.items()
+        ],
+    }
+    encoded_header = orjson.dumps(header)
+    # Pad the header too, so sections start aligned
+    encoded_header += b" " * (-(len(_MAGIC) + _PREFIX.size + len(encoded_header)) % _U32.size)
+
+    generation = read_generation(path) + 1
+    content = b"".join(
+        (
+            _MAGIC,
+            _PREFIX.pack(WARM_CACHE_VERSION, generation, len(encoded_header)),
+            encoded_header,
+            *sections,
+        )
+    )
+
+    temp_path = path.parent / f".tmp_{uuid.uuid4().hex}_{path.name}"
+    try:
+        temp_path.write_bytes(content)
+        temp_path.replace(path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return generation
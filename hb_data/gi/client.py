@@ -1,20 +1,17 @@
 from __future__ import annotations
 
-import asyncio
 from enum import StrEnum
-from typing import TYPE_CHECKING, Any, Self
+from typing import Any
 
-from loguru import logger
-from pydantic import ValidationError
 from yarl import URL
 
 from hb_data.common.base_client import BaseClient
+from hb_data.common.catalog import cached_catalog, requires_tables
+from hb_data.common.dict_utils import join
+from hb_data.common.instrumentation import Stage
+from hb_data.common.validation import get_list_adapter, validate_rows
 from hb_data.gi import models
 
-if TYPE_CHECKING:
-    from collections.abc import Iterable
-    from pathlib import Path
-
 
 class Language(StrEnum):
     CHS = "CHS"
@@ -36,7 +33,7 @@ class Language(StrEnum):
 
 UPSTREAM_BASE_URL = URL("https://gitlab.com/Dimbreath/AnimeGameData2/-/raw/main")
 TEXT_MAP_URL = URL("https://raw.githubusercontent.com/seriaati/hb-data/refs/heads/main/textmaps/gi")
-DATA_URL = UPSTREAM_BASE_URL / "ExcelBinOutput"
+DATA_PATH = "ExcelBinOutput"
 DATA_FILE_NAMES = (
     "AvatarExcelConfigData",  # Characters
     "AvatarSkillDepotExcelConfigData",  # Character skill depots (for element)
@@ -47,138 +44,122 @@ DATA_FILE_NAMES = (
 TRAVELER_ID = 10000005
 
 
-class GIClient(BaseClient):
-    def __init__(self) -> None:
-        super().__init__()
-        self._text_maps: dict[Language, dict[str, str]] = {}
-        self._data: dict[str, Any] = {}
-        self._data_dir /= "gi"
-
-    async def __aenter__(self) -> Self:
-        await super().__aenter__()
-        await self.download()
-        return self
-
-    def _get_text_map_file_names(self, *, langs: Iterable[Language] | None = None) -> list[str]:
-        return [f"TextMap{lang.value}.json" for lang in Language if langs is None or lang in langs]
-
-    async def _read_text_map(self, lang: Language) -> None:
-        logger.debug(f"Reading text map for language: {lang}")
-        file_name = f"TextMap{lang.value}.json"
-        file_path = self._get_file_path(TEXT_MAP_URL / file_name)
-        self._text_maps[lang] = await self._read_json(file_path)
-
-    async def _read_data(self, file_path: Path) -> None:
-        file_name = file_path.stem
-        self._data[file_name] = await self._read_json(file_path)
-
-    async def read_text_maps(self, *, langs: Iterable[Language] | None = None) -> None:
-        async with asyncio.TaskGroup() as tg:
-            for lang in Language:
-                if langs is not None and lang not in langs:
-                    continue
-                tg.create_task(self._read_text_map(lang))
-
-    async def read_data(self) -> None:
-        async with asyncio.TaskGroup() as tg:
-            for file_name in DATA_FILE_NAMES:
-                file_path = self._get_file_path(DATA_URL / f"{file_name}.json")
-                tg.create_task(self._read_data(file_path))
-
-    async def download_data_tables(self, *, force: bool = False) -> None:
-        await self._download_files(
-            [DATA_URL / f"{file_name}.json" for file_name in DATA_FILE_NAMES], force=force
-        )
-        await self.read_data()
-
-    async def download(
-        self, *, langs: Iterable[Language] | None = None, force: bool = False
-    ) -> None:
-        await self._download_files(
-            [TEXT_MAP_URL / file_name for file_name in self._get_text_map_file_names(langs=langs)],
-            force=force,
-        )
-        await self.read_text_maps(langs=langs)
-        await self.download_data_tables(force=force)
-
-    def translate(self, text_map_hash: str, *, lang: Language) -> str:
-        return self._text_maps.get(lang, {}).get(text_map_hash, text_map_hash)
-
-    def get_characters(self, *, lang: Language = Language.EN) -> list[models.Character]:
-        result: list[models.Character] = []
-        data: list[dict[str, Any]] = self._data["AvatarExcelConfigData"]
-        skill_depots: dict[int, dict[str, Any]] = {
-            depot["id"]: depot for depot in self._data["AvatarSkillDepotExcelConfigData"]
-        }
-        skills: dict[int, dict[str, Any]] = {
-            skill["id"]: skill for skill in self._data["AvatarSkillExcelConfigData"]
-        }
-
-        for item in data:
-            if item.get("useType") != "AVATAR_FORMAL":
-                continue
-
-            character = models.Character.model_validate(item)
-            character.name = self.translate(character.name, lang=lang)
-
-            depot = skill_depots.get(item.get("skillDepotId", 0), {})
-            energy_skill = skills.get(depot.get("energySkill", 0), {})
-            element = energy_skill.get("costElemType")
+class GIClient(BaseClient[Language]):
+    _GAME = "gi"
+    _UPSTREAM_BASE_URL = UPSTREAM_BASE_URL
+    _TEXT_MAP_URL = TEXT_MAP_URL
+
+    _LANGUAGE = Language
+    _DATA_PATH = DATA_PATH
+    _DATA_FILE_NAMES = DATA_FILE_NAMES
+
+    def _get_character_rows(self) -> list[dict[str, Any]]:
+        return self._materialize("character_rows", self._join_character_rows)
+
+    def _join_character_rows(self) -> list[dict[str, Any]]:
+        with self._span(Stage.MERGE, table="AvatarExcelConfigData"):
+            return join(
+                (
+                    item
+                    for item in self._get_table("AvatarExcelConfigData")
+                    if item.get("useType") == "AVATAR_FORMAL"
+                ),
+                self._join_table(
+                    "AvatarSkillDepotExcelConfigData",
+                    left_key="skillDepotId",
+                    right_key="id",
+                    how="left",
+                    columns=("energySkill",),
+                ),
+                self._join_table(
+                    "AvatarSkillExcelConfigData",
+                    left_key="energySkill",
+                    right_key="id",
+                    how="left",
+                    columns=("costElemType",),
+                ),
+            )
+
+    @requires_tables(
+        "AvatarExcelConfigData", "AvatarSkillDepotExcelConfigData", "AvatarSkillExcelConfigData"
+    )
+    @cached_catalog
+    def get_characters(self, *, lang: Language | None = Language.EN) -> list[models.Character]:
+        """Get the playable characters.
+
+        The returned characters are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        data = self._get_character_rows()
+        with self._span(Stage.VALIDATE, table="AvatarExcelConfigData"):
+            result = get_list_adapter(models.Character).validate_python(data)
+
+        for item, character in zip(data, result, strict=True):
+            element = item.get("costElemType")
             if element is not None and element != "None":
                 character.element = models.Element(element)
 
-            result.append(character)
+        with self._span(Stage.TRANSLATE, table="AvatarExcelConfigData", lang=lang):
+            for character in result:
+                character.name = self.translate(character.name, lang=lang)
 
         return result
 
+    @requires_tables(
+        "AvatarExcelConfigData", "AvatarSkillDepotExcelConfigData", "AvatarSkillExcelConfigData"
+    )
+    @cached_catalog
     def get_traveler_elements(self) -> list[models.Element]:
         """Get the elements the Traveler can currently switch to.
 
         Derived from the Traveler's candidate skill depots: a depot with an energy
         skill corresponds to a released element.
+
+        Raises:
+            KeyError: If the Traveler isn't in AvatarExcelConfigData.
         """
-        data: list[dict[str, Any]] = self._data["AvatarExcelConfigData"]
-        skill_depots: dict[int, dict[str, Any]] = {
-            depot["id"]: depot for depot in self._data["AvatarSkillDepotExcelConfigData"]
-        }
-        skills: dict[int, dict[str, Any]] = {
-            skill["id"]: skill for skill in self._data["AvatarSkillExcelConfigData"]
-        }
-
-        traveler = next(item for item in data if item["id"] == TRAVELER_ID)
+        traveler = self._lookup("AvatarExcelConfigData", "id", TRAVELER_ID)
+        if traveler is None:
+            msg = f"Traveler ({TRAVELER_ID}) not found in AvatarExcelConfigData"
+            raise KeyError(msg)
+
         elements: list[models.Element] = []
         for depot_id in traveler.get("candSkillDepotIds", []):
-            depot = skill_depots.get(depot_id, {})
-            energy_skill = skills.get(depot.get("energySkill", 0), {})
+            depot = self._lookup("AvatarSkillDepotExcelConfigData", "id", depot_id) or {}
+            energy_skill_id = depot.get("energySkill", 0)
+            energy_skill = self._lookup("AvatarSkillExcelConfigData", "id", energy_skill_id) or {}
             element = energy_skill.get("costElemType")
             if element is not None and element != "None":
                 elements.append(models.Element(element))
 
         return elements
 
-    def get_mw_costumes(self, *, lang: Language = Language.EN) -> list[models.MWCostume]:
-        result: list[models.MWCostume] = []
-        data: list[dict[str, Any]] = self._data["BeyondCostumeExcelConfigData"]
-        for item in data:
-            try:
-                costume = models.MWCostume.model_validate(item)
-            except ValidationError as e:
-                logger.warning("Failed to validate MW costume: {}", e)
-                continue
-            costume.name = self.translate(costume.name, lang=lang)
-            result.append(costume)
+    @requires_tables("BeyondCostumeExcelConfigData")
+    @cached_catalog
+    def get_mw_costumes(self, *, lang: Language | None = Language.EN) -> list[models.MWCostume]:
+        """Get the Miliastra Wonderland costumes.
+
+        The returned costumes are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        with self._span(Stage.VALIDATE, table="BeyondCostumeExcelConfigData"):
+            result = validate_rows(
+                models.MWCostume, self._get_table("BeyondCostumeExcelConfigData")
+            )
+        with self._span(Stage.TRANSLATE, table="BeyondCostumeExcelConfigData", lang=lang):
+            for costume in result:
+                costume.name = self.translate(costume.name, lang=lang)
         return result
 
-    def get_mw_items(self, *, lang: Language = Language.EN) -> list[models.MWItem]:
-        result: list[models.MWItem] = []
-        data: list[dict[str, Any]] = self._data["BydMaterialExcelConfigData"]
-        for item in data:
-            try:
-                mw_item = models.MWItem.model_validate(item)
-            except ValidationError as e:
-                logger.warning("Failed to validate MW item: {}", e)
-                continue
-            mw_item.name = self.translate(mw_item.name, lang=lang)
-            mw_item.description = self.translate(mw_item.description, lang=lang)
-            result.append(mw_item)
+    @requires_tables("BydMaterialExcelConfigData")
+    @cached_catalog
+    def get_mw_items(self, *, lang: Language | None = Language.EN) -> list[models.MWItem]:
+        """Get the Miliastra Wonderland items.
+
+        The returned items are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        with self._span(Stage.VALIDATE, table="BydMaterialExcelConfigData"):
+            result = validate_rows(models.MWItem, self._get_table("BydMaterialExcelConfigData"))
+        with self._span(Stage.TRANSLATE, table="BydMaterialExcelConfigData", lang=lang):
+            for mw_item in result:
+                mw_item.name = self.translate(mw_item.name, lang=lang)
+                mw_item.description = self.translate(mw_item.description, lang=lang)
         return result
@@ -1,4 +1,5 @@
 from enum import StrEnum
+from typing import ClassVar
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -18,6 +19,8 @@ class Element(StrEnum):
 
 
 class Character(BaseModel):
+    LOCALIZED_FIELDS: ClassVar[frozenset[str]] = frozenset({"name"})
+
     id: int
     name: str = Field(alias="nameTextMapHash", coerce_numbers_to_str=True)
     rarity: int = Field(alias="qualityType")
@@ -1,14 +1,20 @@
+from typing import ClassVar
+
 from pydantic import BaseModel, Field, field_validator
 
 __all__ = ("MWCostume", "MWItem")
 
 
 class MWCostume(BaseModel):
+    LOCALIZED_FIELDS: ClassVar[frozenset[str]] = frozenset({"name"})
+
     id: int = Field(alias="costumeId")
     name: str = Field(alias="nameTextMapHash", coerce_numbers_to_str=True)
 
 
 class MWItem(BaseModel):
+    LOCALIZED_FIELDS: ClassVar[frozenset[str]] = frozenset({"name", "description"})
+
     id: int = Field(alias="id")
     name: str = Field(alias="nameTextMapHash", coerce_numbers_to_str=True)
     description: str = Field(alias="descTextMapHash", coerce_numbers_to_str=True)
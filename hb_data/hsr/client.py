@@ -1,19 +1,15 @@
 from __future__ import annotations
 
-import asyncio
 from enum import StrEnum
-from typing import TYPE_CHECKING, Any, Self
 
-from loguru import logger
 from yarl import URL
 
 from hb_data.common.base_client import BaseClient
+from hb_data.common.catalog import cached_catalog, requires_tables
+from hb_data.common.instrumentation import Stage
+from hb_data.common.validation import get_list_adapter
 from hb_data.hsr import models
 
-if TYPE_CHECKING:
-    from collections.abc import Iterable
-    from pathlib import Path
-
 
 class Language(StrEnum):
     CHS = "CHS"
@@ -35,7 +31,7 @@ UPSTREAM_BASE_URL = URL("https://gitlab.com/Dimbreath/turnbasedgamedata/-/raw/ma
 TEXT_MAP_URL = URL(
     "https://raw.githubusercontent.com/seriaati/hb-data/refs/heads/main/textmaps/hsr"
 )
-DATA_URL = UPSTREAM_BASE_URL / "ExcelOutput"
+DATA_PATH = "ExcelOutput"
 DATA_FILE_NAMES = ("AvatarConfig", "AvatarConfigLD")  # Characters (LD = collab characters)
 
 # Trailblazer names resolve to the "{NICKNAME}" placeholder; this sentinel key
@@ -45,72 +41,35 @@ DATA_FILE_NAMES = ("AvatarConfig", "AvatarConfigLD")  # Characters (LD = collab
 TRAILBLAZER_NAME_HASH = "6354779731002018877"
 
 
-class HSRClient(BaseClient):
-    def __init__(self) -> None:
-        super().__init__()
-        self._text_maps: dict[Language, dict[str, str]] = {}
-        self._data: dict[str, Any] = {}
-        self._data_dir /= "hsr"
-
-    async def __aenter__(self) -> Self:
-        await super().__aenter__()
-        await self.download()
-        return self
-
-    def _get_text_map_file_names(self, *, langs: Iterable[Language] | None = None) -> list[str]:
-        return [f"TextMap{lang.value}.json" for lang in Language if langs is None or lang in langs]
-
-    async def _read_text_map(self, lang: Language) -> None:
-        logger.debug(f"Reading text map for language: {lang}")
-        file_name = f"TextMap{lang.value}.json"
-        file_path = self._get_file_path(TEXT_MAP_URL / file_name)
-        self._text_maps[lang] = await self._read_json(file_path)
-
-    async def _read_data(self, file_path: Path) -> None:
-        file_name = file_path.stem
-        self._data[file_name] = await self._read_json(file_path)
-
-    async def read_text_maps(self, *, langs: Iterable[Language] | None = None) -> None:
-        async with asyncio.TaskGroup() as tg:
-            for lang in Language:
-                if langs is not None and lang not in langs:
-                    continue
-                tg.create_task(self._read_text_map(lang))
-
-    async def read_data(self) -> None:
-        async with asyncio.TaskGroup() as tg:
-            for file_name in DATA_FILE_NAMES:
-                file_path = self._get_file_path(DATA_URL / f"{file_name}.json")
-                tg.create_task(self._read_data(file_path))
-
-    async def download_data_tables(self, *, force: bool = False) -> None:
-        await self._download_files(
-            [DATA_URL / f"{file_name}.json" for file_name in DATA_FILE_NAMES], force=force
-        )
-        await self.read_data()
-
-    async def download(
-        self, *, langs: Iterable[Language] | None = None, force: bool = False
-    ) -> None:
-        await self._download_files(
-            [TEXT_MAP_URL / file_name for file_name in self._get_text_map_file_names(langs=langs)],
-            force=force,
-        )
-        await self.read_text_maps(langs=langs)
-        await self.download_data_tables(force=force)
-
-    def translate(self, text_map_hash: str, *, lang: Language) -> str:
-        return self._text_maps.get(lang, {}).get(text_map_hash, text_map_hash)
-
-    def get_characters(self, *, lang: Language = Language.EN) -> list[models.Character]:
-        result: list[models.Character] = []
-        data: list[dict[str, Any]] = self._data["AvatarConfig"] + self._data["AvatarConfigLD"]
-
-        for item in data:
-            character = models.Character.model_validate(item)
-            character.name = self.translate(character.name, lang=lang)
-            if character.name == "{NICKNAME}":
-                character.name = self.translate(TRAILBLAZER_NAME_HASH, lang=lang)
-            result.append(character)
+class HSRClient(BaseClient[Language]):
+    _GAME = "hsr"
+    _UPSTREAM_BASE_URL = UPSTREAM_BASE_URL
+    _TEXT_MAP_URL = TEXT_MAP_URL
+
+    _LANGUAGE = Language
+    _DATA_PATH = DATA_PATH
+    _DATA_FILE_NAMES = DATA_FILE_NAMES
+
+    def _translate_name(self, text_map_hash: str, lang: Language | None) -> str:
+        name = self.translate(text_map_hash, lang=lang)
+        if name == "{NICKNAME}":
+            return self.translate(TRAILBLAZER_NAME_HASH, lang=lang)
+        return name
+
+    @requires_tables("AvatarConfig", "AvatarConfigLD")
+    @cached_catalog
+    def get_characters(self, *, lang: Language | None = Language.EN) -> list[models.Character]:
+        """Get the playable characters.
+
+        The returned characters are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        with self._span(Stage.MERGE, table="AvatarConfig"):
+            data = [*self._get_table("AvatarConfig"), *self._get_table("AvatarConfigLD")]
+        with self._span(Stage.VALIDATE, table="AvatarConfig"):
+            result = get_list_adapter(models.Character).validate_python(data)
+
+        with self._span(Stage.TRANSLATE, table="AvatarConfig", lang=lang):
+            for character in result:
+                character.name = self._translate_name(character.name, lang)
 
         return result
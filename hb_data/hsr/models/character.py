@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import Any
+from typing import Any, ClassVar
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -31,6 +31,8 @@ class Path(StrEnum):
 
 
 class Character(BaseModel):
+    LOCALIZED_FIELDS: ClassVar[frozenset[str]] = frozenset({"name"})
+
     id: int = Field(alias="AvatarID")
     name: str = Field(alias="AvatarName")
     rarity: int = Field(alias="Rarity")
@@ -1,20 +1,23 @@
 from __future__ import annotations
 
-import asyncio
 from enum import StrEnum
-from typing import TYPE_CHECKING, Any, Self
+from typing import TYPE_CHECKING, Any
 
-from loguru import logger
-from pydantic import ValidationError
 from yarl import URL
 
 from hb_data.common.base_client import BaseClient
-from hb_data.common.dict_utils import merge_dicts_by_different_keys, merge_dicts_by_key
+from hb_data.common.catalog import cached_catalog, requires_tables
+from hb_data.common.dict_utils import join
+from hb_data.common.generation import GenerationAttribute
+from hb_data.common.instrumentation import Stage
+from hb_data.common.key_map import resolve_key_map
+from hb_data.common.validation import validate_rows
 from hb_data.zzz import deob, models
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
-    from pathlib import Path
+    from collections.abc import Callable, Iterable, Sequence
+
+    from hb_data.common.dict_utils import Join
 
 
 class Language(StrEnum):
@@ -37,7 +40,7 @@ UPSTREAM_BASE_URL = URL("https://git.mero.moe/dimbreath/ZenlessData/raw/branch/m
 TEXT_MAP_URL = URL(
     "https://raw.githubusercontent.com/seriaati/hb-data/refs/heads/main/textmaps/zzz"
 )
-DATA_URL = UPSTREAM_BASE_URL / "FileCfg"
+DATA_PATH = "FileCfg"
 DATA_FILE_NAMES = (
     "AvatarBaseTemplateTb",  # Characters
     "AvatarBattleTemplateTb",  # Character battle properties
@@ -52,230 +55,237 @@ DATA_FILE_NAMES = (
 )
 
 
-class ZZZClient(BaseClient):
-    def __init__(self) -> None:
-        super().__init__()
-        self._text_maps: dict[Language, dict[str, str]] = {}
-        self._data: dict[str, Any] = {}
-        self._data_dir /= "zzz"
+class ZZZClient(BaseClient[Language]):
+    _GAME = "zzz"
+    _UPSTREAM_BASE_URL = UPSTREAM_BASE_URL
+    _TEXT_MAP_URL = TEXT_MAP_URL
+
+    _LANGUAGE = Language
+    _DATA_PATH = DATA_PATH
+    _DATA_FILE_NAMES = DATA_FILE_NAMES
+    _USE_SNAPSHOT = True
 
-    async def __aenter__(self) -> Self:
-        await super().__aenter__()
-        await self.download()
-        return self
+    # Deobfuscated tables, built on first use or restored from the snapshot
+    _tables = GenerationAttribute()
 
     def _get_text_map_file_name(self, lang: Language) -> str:
         if lang is Language.CHS:
             return "TextMapTemplateTb.json"
         return f"TextMap_{lang.value}TemplateTb.json"
 
-    def _get_text_map_file_names(self, *, langs: Iterable[Language] | None = None) -> list[str]:
-        file_names = []
-        for lang in Language:
-            if langs is not None and lang not in langs:
-                continue
-            file_names.append(self._get_text_map_file_name(lang))
-        return file_names
-
-    async def _read_text_map(self, lang: Language) -> None:
-        logger.debug(f"Reading text map for language: {lang}")
-        file_name = self._get_text_map_file_name(lang)
-        file_path = self._get_file_path(TEXT_MAP_URL / file_name)
-        self._text_maps[lang] = await self._read_json(file_path)
-
-    async def _read_data(self, file_path: Path) -> None:
-        file_name = file_path.stem
-        self._data[file_name] = await self._read_json(file_path)
-
-    async def read_text_maps(self, *, langs: Iterable[Language] | None = None) -> None:
-        async with asyncio.TaskGroup() as tg:
-            for lang in Language:
-                if langs is not None and lang not in langs:
-                    continue
-                tg.create_task(self._read_text_map(lang))
-
-    async def read_data(self) -> None:
-        async with asyncio.TaskGroup() as tg:
-            for file_name in DATA_FILE_NAMES:
-                file_path = self._get_file_path(DATA_URL / f"{file_name}.json")
-                tg.create_task(self._read_data(file_path))
-
-    async def download_data_tables(self, *, force: bool = False) -> None:
-        await self._download_files(
-            [DATA_URL / f"{file_name}.json" for file_name in DATA_FILE_NAMES], force=force
-        )
-        await self.read_data()
-
-    async def download(
-        self, *, langs: Iterable[Language] | None = None, force: bool = False
-    ) -> None:
-        await self._download_files(
-            [TEXT_MAP_URL / file_name for file_name in self._get_text_map_file_names(langs=langs)],
-            force=force,
-        )
-        await self.read_text_maps(langs=langs)
-        await self.download_data_tables(force=force)
-
-    def translate(self, text_map_hash: str, *, lang: Language) -> str:
-        return self._text_maps.get(lang, {}).get(text_map_hash, text_map_hash)
+    def _has_table(self, file_name: str) -> bool:
+        if self._table_store is not None:
+            return super()._has_table(file_name)
+        return file_name in self._data or file_name in self._tables
+
+    def _set_data(self, file_name: str, data: Any) -> None:
+        if self._data.get(file_name) is not data:
+            self._tables.pop(file_name, None)
+        super()._set_data(file_name, data)
+
+    def _get_table(self, file_name: str) -> Sequence[dict[str, Any]]:
+        """Get a deobfuscated table, shared by every get_* method. Don't mutate the result."""
+        if self._table_store is not None:
+            # Deobfuscated when stored
+            return super()._get_table(file_name)
+        if file_name not in self._tables:
+            self._tables[file_name] = self._get_rows_to_store(file_name, self._data[file_name])
+        return self._tables[file_name]
+
+    def _get_rows_to_store(self, file_name: str, data: Any) -> list[dict[str, Any]]:
+        deobfuscator_cls = deob.DEOBFUSCATORS[file_name]
+        with self._span(Stage.DEOBFUSCATE, table=file_name):
+            key_map = resolve_key_map(
+                deobfuscator_cls(data), self._get_file_path(self._get_data_url(file_name))
+            )
+            return deobfuscator_cls(data, key_map=key_map).deobfuscate()
 
-    def _get_gacha_image_names(self) -> dict[int, str]:
-        d_gacha = deob.GachaItemResourceTemplateTbDeobfuscator(
-            self._data["GachaItemResourceTemplateTb"]
-        )
+    def _dump_tables(self) -> dict[str, Any]:
+        if self._table_store is not None:
+            return super()._dump_tables()
         return {
-            entry["ItemID"]: entry["ImagePath"]
-            .rsplit("/", maxsplit=1)[-1]
-            .split(".", maxsplit=1)[0]
-            for entry in d_gacha.deobfuscate()
+            file_name: self._get_table(file_name)
+            for file_name in deob.DEOBFUSCATORS
+            if self._data.get(file_name) or file_name in self._tables
         }
 
-    def get_characters(self, *, lang: Language = Language.EN) -> list[models.Character]:
-        result: list[models.Character] = []
-
-        d_avatar_base = deob.AvatarBaseTemplateTbDeobfuscator(self._data["AvatarBaseTemplateTb"])
-        avatar_base = d_avatar_base.deobfuscate()
-
-        d_avatar_battle = deob.AvatarBattleTemplateTbDeobfuscator(
-            self._data["AvatarBattleTemplateTb"]
+    def _restore_tables(self, tables: dict[str, Any], sources: dict[str, str | None]) -> None:
+        self._data = {}
+        if self._table_store is not None:
+            super()._restore_tables(tables, sources)
+        else:
+            self._tables = tables
+
+    def _get_gacha_image_name(self, item_id: int) -> str | None:
+        entry = self._lookup("GachaItemResourceTemplateTb", "ItemID", item_id)
+        if entry is None:
+            return None
+        return entry["ImagePath"].rsplit("/", maxsplit=1)[-1].split(".", maxsplit=1)[0]
+
+    def _get_joined_rows(
+        self, file_name: str, get_joins: Callable[[], Iterable[Join]]
+    ) -> list[dict[str, Any]]:
+        """Join deobfuscated tables once per data version, every language validates the result.
+
+        The joins are only built, and their tables read, when the rows aren't materialized yet.
+        """
+
+        def _join() -> list[dict[str, Any]]:
+            rows = self._get_table(file_name)
+            joins = get_joins()
+            with self._span(Stage.MERGE, table=file_name):
+                return join(rows, *joins)
+
+        return self._materialize(f"{file_name}_rows", _join)
+
+    @requires_tables(
+        "AvatarBaseTemplateTb",
+        "AvatarBattleTemplateTb",
+        "AvatarUITemplateTb",
+        "ItemTemplateTb",
+        "AvatarSkinBaseTemplateTb",
+        "GachaItemResourceTemplateTb",
+    )
+    @cached_catalog
+    def get_characters(self, *, lang: Language | None = Language.EN) -> list[models.Character]:
+        """Get the playable agents, with their skins.
+
+        The returned agents are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        avatar_data = self._get_joined_rows(
+            "AvatarBaseTemplateTb",
+            lambda: (
+                self._join_table("AvatarBattleTemplateTb", left_key="ID"),
+                self._join_table("AvatarUITemplateTb", left_key="ID"),
+                self._join_table("ItemTemplateTb", left_key="ID", right_key="ItemID"),
+                self._join_table(
+                    "AvatarSkinBaseTemplateTb",
+                    left_key="ID",
+                    right_key="AvatarID",
+                    how="left",
+                    many="skins",
+                ),
+            ),
         )
-        avatar_battle = d_avatar_battle.deobfuscate()
-
-        d_avatar_ui = deob.AvatarUITemplateTbDeobfuscator(self._data["AvatarUITemplateTb"])
-        avatar_ui = d_avatar_ui.deobfuscate()
-
-        d_item = deob.ItemTemplateTbDeobfuscator(self._data["ItemTemplateTb"])
-        item_data = d_item.deobfuscate()
-
-        avatar_base = merge_dicts_by_key([avatar_base, avatar_battle, avatar_ui], key="ID")
-        avatar_base = merge_dicts_by_different_keys({"ID": avatar_base, "ItemID": item_data})
-
-        d_skin = deob.AvatarSkinBaseTemplateTbDeobfuscator(self._data["AvatarSkinBaseTemplateTb"])
-        skins = [models.CharacterSkin.model_validate(skin) for skin in d_skin.deobfuscate()]
-
-        gacha_images = self._get_gacha_image_names()
+        with self._span(Stage.VALIDATE, table="AvatarBaseTemplateTb"):
+            result = validate_rows(models.Character, avatar_data, item_fields=("skins",))
 
-        for item in avatar_base:
-            try:
-                character = models.Character.model_validate(item)
-            except ValidationError:
-                continue
-
-            character.name = self.translate(character.name, lang=lang)
-            character.full_name = self.translate(character.full_name, lang=lang)
-            character.faction_name = self.translate(character.faction_name, lang=lang)
-            character.skins = [
-                skin
-                for skin in skins
-                if skin.character_id == character.id and "DefaultSkin" not in skin.tags
-            ]
+        with self._span(Stage.TRANSLATE, table="AvatarBaseTemplateTb", lang=lang):
+            for character in result:
+                character.name = self.translate(character.name, lang=lang)
+                character.full_name = self.translate(character.full_name, lang=lang)
+                character.faction_name = self.translate(character.faction_name, lang=lang)
 
+        for character in result:
             default_skin = next(
-                (
-                    skin
-                    for skin in skins
-                    if skin.character_id == character.id and "DefaultSkin" in skin.tags
-                ),
-                None,
+                (skin for skin in character.skins if "DefaultSkin" in skin.tags), None
             )
+            character.skins = [skin for skin in character.skins if "DefaultSkin" not in skin.tags]
             image_name = (
                 default_skin.image_name
                 if default_skin is not None
-                else gacha_images.get(character.id)
+                else self._get_gacha_image_name(character.id)
             )
             if image_name is not None:
                 character.image = f"https://static.nanoka.cc/assets/zzz/{image_name}.webp"
                 character.icon = f"https://static.nanoka.cc/assets/zzz/{image_name.replace('Role', 'RoleSelect')}.webp"
 
-            result.append(character)
-
         return result
 
-    def get_weapons(self, *, lang: Language = Language.EN) -> list[models.Weapon]:
-        result: list[models.Weapon] = []
-
-        d_weapon = deob.WeaponTemplateTbDeobfuscator(self._data["WeaponTemplateTb"])
-        weapon_data = d_weapon.deobfuscate()
-        d_item = deob.ItemTemplateTbDeobfuscator(self._data["ItemTemplateTb"])
-        item_data = d_item.deobfuscate()
-        weapon_data = merge_dicts_by_key([weapon_data, item_data], key="ItemID")
+    @requires_tables("WeaponTemplateTb", "ItemTemplateTb")
+    @cached_catalog
+    def get_weapons(self, *, lang: Language | None = Language.EN) -> list[models.Weapon]:
+        """Get the W-Engines.
 
-        for item in weapon_data:
-            try:
-                weapon = models.Weapon.model_validate(item)
-            except ValidationError:
-                continue
+        The returned W-Engines are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        weapon_data = self._get_joined_rows(
+            "WeaponTemplateTb", lambda: (self._join_table("ItemTemplateTb", left_key="ItemID"),)
+        )
+        with self._span(Stage.VALIDATE, table="WeaponTemplateTb"):
+            result = validate_rows(models.Weapon, weapon_data)
 
-            weapon.name = self.translate(weapon.name, lang=lang)
-            result.append(weapon)
+        with self._span(Stage.TRANSLATE, table="WeaponTemplateTb", lang=lang):
+            for weapon in result:
+                weapon.name = self.translate(weapon.name, lang=lang)
 
         return result
 
-    def get_drive_discs(self, *, lang: Language = Language.EN) -> list[models.DriveDisc]:  # ruff: ignore[unused-method-argument]
-        result: list[models.DriveDisc] = []
-        d_equipment = deob.EquipmentTemplateTbDeobfuscator(self._data["EquipmentTemplateTb"])
-        equipment_data = d_equipment.deobfuscate()
-
-        d_item = deob.ItemTemplateTbDeobfuscator(self._data["ItemTemplateTb"])
-        item_data = d_item.deobfuscate()
-        equipment_data = merge_dicts_by_key([equipment_data, item_data], key="ItemID")
-
-        for item in equipment_data:
-            try:
-                drive_disc = models.DriveDisc.model_validate(item)
-            except ValidationError:
-                continue
+    @requires_tables("EquipmentTemplateTb", "ItemTemplateTb")
+    @cached_catalog
+    def get_drive_discs(self, *, lang: Language | None = Language.EN) -> list[models.DriveDisc]:  # ruff: ignore[unused-method-argument]
+        """Get the drive discs.
 
-            result.append(drive_disc)
-
-        return result
-
-    def get_drive_disc_sets(self, *, lang: Language = Language.EN) -> list[models.DriveDiscSet]:
-        result: list[models.DriveDiscSet] = []
-        d_suit = deob.EquipmentSuitTemplateTbDeobfuscator(self._data["EquipmentSuitTemplateTb"])
-        suit_data = d_suit.deobfuscate()
-
-        for item in suit_data:
-            try:
-                drive_disc_set = models.DriveDiscSet.model_validate(item)
-            except ValidationError:
-                continue
-
-            drive_disc_set.name = self.translate(drive_disc_set.name, lang=lang)
-            drive_disc_set.two_set_effect = self.translate(drive_disc_set.two_set_effect, lang=lang)
-            drive_disc_set.four_set_effect = self.translate(
-                drive_disc_set.four_set_effect, lang=lang
-            )
-            drive_disc_set.story = self.translate(drive_disc_set.story, lang=lang)
-            result.append(drive_disc_set)
+        The returned drive discs are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        equipment_data = self._get_joined_rows(
+            "EquipmentTemplateTb", lambda: (self._join_table("ItemTemplateTb", left_key="ItemID"),)
+        )
+        with self._span(Stage.VALIDATE, table="EquipmentTemplateTb"):
+            return validate_rows(models.DriveDisc, equipment_data)
+
+    @requires_tables("EquipmentSuitTemplateTb")
+    @cached_catalog
+    def get_drive_disc_sets(
+        self, *, lang: Language | None = Language.EN
+    ) -> list[models.DriveDiscSet]:
+        """Get the drive disc sets.
+
+        The returned sets are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        suit_data = self._get_table("EquipmentSuitTemplateTb")
+        with self._span(Stage.VALIDATE, table="EquipmentSuitTemplateTb"):
+            result = validate_rows(models.DriveDiscSet, suit_data)
+
+        with self._span(Stage.TRANSLATE, table="EquipmentSuitTemplateTb", lang=lang):
+            for drive_disc_set in result:
+                drive_disc_set.name = self.translate(drive_disc_set.name, lang=lang)
+                drive_disc_set.two_set_effect = self.translate(
+                    drive_disc_set.two_set_effect, lang=lang
+                )
+                drive_disc_set.four_set_effect = self.translate(
+                    drive_disc_set.four_set_effect, lang=lang
+                )
+                drive_disc_set.story = self.translate(drive_disc_set.story, lang=lang)
 
         return result
 
-    def get_bangboos(self, *, lang: Language = Language.EN) -> list[models.Bangboo]:
-        result: list[models.Bangboo] = []
-        d_buddy = deob.BuddyBaseTemplateTbDeobfuscator(self._data["BuddyBaseTemplateTb"])
-        buddy_data = d_buddy.deobfuscate()
-
-        d_item = deob.ItemTemplateTbDeobfuscator(self._data["ItemTemplateTb"])
-        item_data = d_item.deobfuscate()
-        buddy_data = merge_dicts_by_different_keys({"ID": buddy_data, "ItemID": item_data})
+    @requires_tables("BuddyBaseTemplateTb", "ItemTemplateTb", "GachaItemResourceTemplateTb")
+    @cached_catalog
+    def get_bangboos(self, *, lang: Language | None = Language.EN) -> list[models.Bangboo]:
+        """Get the Bangboos.
 
-        gacha_images = self._get_gacha_image_names()
+        The returned Bangboos are shared by every caller, don't mutate them, see `cached_catalog`.
+        """
+        buddy_data = self._get_joined_rows(
+            "BuddyBaseTemplateTb",
+            lambda: (self._join_table("ItemTemplateTb", left_key="ID", right_key="ItemID"),),
+        )
+        with self._span(Stage.VALIDATE, table="BuddyBaseTemplateTb"):
+            result = validate_rows(models.Bangboo, buddy_data)
 
-        for item in buddy_data:
-            try:
-                bangboo = models.Bangboo.model_validate(item)
-            except ValidationError:
-                continue
+        with self._span(Stage.TRANSLATE, table="BuddyBaseTemplateTb", lang=lang):
+            for bangboo in result:
+                bangboo.name = self.translate(bangboo.name, lang=lang)
 
-            bangboo.name = self.translate(bangboo.name, lang=lang)
-            image_name = gacha_images.get(bangboo.id)
+        for bangboo in result:
+            image_name = self._get_gacha_image_name(bangboo.id)
             if image_name is not None:
                 bangboo.icon = f"https://static.nanoka.cc/assets/zzz/{image_name}.webp"
-            result.append(bangboo)
 
         return result
 
+    @requires_tables(
+        "AvatarBaseTemplateTb",
+        "AvatarBattleTemplateTb",
+        "AvatarUITemplateTb",
+        "ItemTemplateTb",
+        "AvatarSkinBaseTemplateTb",
+        "GachaItemResourceTemplateTb",
+        "BuddyBaseTemplateTb",
+        "WeaponTemplateTb",
+    )
+    @cached_catalog
     def get_rarity_map(self) -> dict[int, int]:
         characters = self.get_characters()
         bangboos = self.get_bangboos()
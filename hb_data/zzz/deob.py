@@ -96,3 +96,17 @@ class BuddyBaseTemplateTbDeobfuscator(BaseDeobfuscator):
 class GachaItemResourceTemplateTbDeobfuscator(BaseDeobfuscator):
     item_id = DeobfuscatedField("ItemID", lambda data: find_key_by_value(data, 1011))
     image_path = DeobfuscatedField("ImagePath", lambda data: find_key_by_value(data, "IconRole01"))
+
+
+DEOBFUSCATORS: dict[str, type[BaseDeobfuscator]] = {
+    "AvatarBaseTemplateTb": AvatarBaseTemplateTbDeobfuscator,
+    "AvatarBattleTemplateTb": AvatarBattleTemplateTbDeobfuscator,
+    "AvatarUITemplateTb": AvatarUITemplateTbDeobfuscator,
+    "AvatarSkinBaseTemplateTb": AvatarSkinBaseTemplateTbDeobfuscator,
+    "WeaponTemplateTb": WeaponTemplateTbDeobfuscator,
+    "ItemTemplateTb": ItemTemplateTbDeobfuscator,
+    "EquipmentTemplateTb": EquipmentTemplateTbDeobfuscator,
+    "EquipmentSuitTemplateTb": EquipmentSuitTemplateTbDeobfuscator,
+    "BuddyBaseTemplateTb": BuddyBaseTemplateTbDeobfuscator,
+    "GachaItemResourceTemplateTb": GachaItemResourceTemplateTbDeobfuscator,
+}
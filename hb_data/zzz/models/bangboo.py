@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import ClassVar, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -6,6 +6,8 @@ __all__ = ("Bangboo",)
 
 
 class Bangboo(BaseModel):
+    LOCALIZED_FIELDS: ClassVar[frozenset[str]] = frozenset({"name"})
+
     id: int = Field(alias="ID")
     name: str = Field(alias="Name")
     rarity: int = Field(alias="Rarity")
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import ClassVar, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -25,6 +25,8 @@ class CharacterSkin(BaseModel):
 
 
 class Character(BaseModel):
+    LOCALIZED_FIELDS: ClassVar[frozenset[str]] = frozenset({"name", "full_name", "faction_name"})
+
     id: int = Field(alias="ID")
     name: str = Field(alias="Name")
     full_name: str = Field(alias="FullName")
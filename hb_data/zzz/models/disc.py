@@ -1,3 +1,5 @@
+from typing import ClassVar
+
 from pydantic import BaseModel, Field, field_validator
 
 __all__ = ("DriveDisc", "DriveDiscSet")
@@ -17,6 +19,10 @@ class DriveDisc(BaseModel):
 
 
 class DriveDiscSet(BaseModel):
+    LOCALIZED_FIELDS: ClassVar[frozenset[str]] = frozenset(
+        {"name", "two_set_effect", "four_set_effect", "story"}
+    )
+
     id: int = Field(alias="ID")
     name: str = Field(alias="Name")
     two_set_effect: str = Field(alias="TwoSetEffect")
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import ClassVar, Literal
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -8,6 +8,8 @@ __all__ = ("Weapon",)
 
 
 class Weapon(BaseModel):
+    LOCALIZED_FIELDS: ClassVar[frozenset[str]] = frozenset({"name"})
+
     id: int = Field(alias="ItemID")
     name: str = Field(alias="Name")
     specialty: Specialty = Field(alias="WeaponSpecialty")
@@ -0,0 +1,750 @@
+"""Benchmark hb_data's hot paths on synthetic game data, fully offline.
+
+Fixtures shaped like the upstream data tables and the stripped text maps are generated for all
+three games, ZZZ's with obfuscated keys the deobfuscators resolve, and clients read them from
+disk without touching the network. Every benchmark reports its timings and the peak memory it
+allocated, as JSON that can be compared between commits:
+
+    uv run python scripts/benchmark.py --output before.json
+    git checkout my-branch
+    uv run python scripts/benchmark.py --output after.json --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import inspect
+import os
+import platform
+import random
+import statistics
+import string
+import subprocess  # ruff: ignore[suspicious-subprocess-import]
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from loguru import logger
+
+from hb_data.common.base_client import BaseClient
+from hb_data.common.dict_utils import (
+    Join,
+    group_by,
+    index_by,
+    join,
+    merge_dicts_by_different_keys,
+    merge_dicts_by_key,
+)
+from hb_data.common.text_map import TextMapMode
+from hb_data.gi.client import TRAVELER_ID, GIClient
+from hb_data.gi.client import Language as GILanguage
+from hb_data.hsr.client import TRAILBLAZER_NAME_HASH, HSRClient
+from hb_data.hsr.client import Language as HSRLanguage
+from hb_data.zzz import deob as zzz_deob
+from hb_data.zzz.client import Language as ZZZLanguage
+from hb_data.zzz.client import ZZZClient
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+RESULTS_VERSION = 1
+
+_SEED = 0
+_WORDS = (
+    "abyss", "anemo", "blade", "bloom", "bright", "crystal", "dawn", "ember", "field", "frost",
+    "gale", "glory", "harbor", "hollow", "ivory", "jade", "lantern", "lunar", "meadow", "mist",
+    "night", "oath", "pearl", "quill", "river", "sigil", "spark", "tide", "umbra", "verdant",
+    "whisper", "zenith",
+)  # fmt: skip
+
+_ZZZ_ITEM_ICON = "Assets/NapResources/UI/Sprite/A1DynamicLoad/Hollow/ItemIcon/UnPacker/IconFund.png"
+_ZZZ_SUIT_ICON = "UI/Sprite/A1DynamicLoad/IconSuit/UnPacker/SuitWoodpeckerElectro.png"
+
+
+def _write_json(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps(data))
+
+
+def _get_text(rng: random.Random, lang: str, words: int) -> str:
+    return f"[{lang}] " + " ".join(rng.choices(_WORDS, k=words))
+
+
+def _get_padding(rng: random.Random, count: int) -> dict[str, Any]:
+    """Fields no get_* method reads, which upstream rows have plenty of."""
+    padding: dict[str, Any] = {}
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            padding[f"field{i}"] = rng.randrange(10**9)
+        elif kind == 1:
+            padding[f"field{i}"] = rng.random()
+        elif kind == 2:
+            padding[f"field{i}"] = "".join(rng.choices(string.ascii_letters, k=12))
+        else:
+            padding[f"field{i}"] = [rng.randrange(1000) for _ in range(3)]
+    return padding
+
+
+def _write_text_maps[L](
+    client: BaseClient, langs: Iterable[L], texts: dict[str, int], rng: random.Random
+) -> None:
+    """Write a text map per language, translating each hash into a text of the given words."""
+    for lang in langs:
+        text_map = {
+            text_map_hash: _get_text(rng, str(lang), words)
+            for text_map_hash, words in texts.items()
+        }
+        _write_json(client._get_file_path(client._get_text_map_url(lang)), text_map)
+
+
+def _write_tables(client: BaseClient, tables: dict[str, Any]) -> None:
+    for file_name, data in tables.items():
+        _write_json(client._get_file_path(client._get_data_url(file_name)), data)
+
+
+def _write_gi_fixtures(scale: int, rng: random.Random) -> int:
+    """Write GI data tables and text maps, returns how many hashes the text maps hold."""
+    elements = ("Fire", "Water", "Wind", "Electric", "Grass", "Ice", "Rock")
+    character_count = 120 * scale
+    ids = [i for i in range(10000002, 10000002 + character_count + 1) if i != TRAVELER_ID]
+
+    depots = [
+        {"id": 100 + i, "energySkill": 5000 + i, **_get_padding(rng, 20)}
+        for i in range(character_count + len(elements))
+    ]
+    skills = [
+        {"id": 5000 + i, "costElemType": elements[i % len(elements)], **_get_padding(rng, 20)}
+        for i in range(len(depots) * 4)
+    ]
+    characters = [
+        {
+            "id": character_id,
+            "nameTextMapHash": 1_000_000 + i,
+            "qualityType": "QUALITY_ORANGE" if i % 3 == 0 else "QUALITY_PURPLE",
+            "iconName": f"UI_AvatarIcon_{i}",
+            # Test characters upstream keeps around
+            "useType": "AVATAR_FORMAL" if i % 10 else "AVATAR_SYNC_TEST",
+            "skillDepotId": 100 + i,
+            **_get_padding(rng, 60),
+        }
+        for i, character_id in enumerate(ids)
+    ]
+    characters.append(
+        {
+            "id": TRAVELER_ID,
+            "nameTextMapHash": 999_999,
+            "qualityType": "QUALITY_ORANGE",
+            "iconName": "UI_AvatarIcon_PlayerBoy",
+            "useType": "AVATAR_FORMAL",
+            "skillDepotId": 100,
+            "candSkillDepotIds": [100 + character_count + i for i in range(len(elements))],
+            **_get_padding(rng, 60),
+        }
+    )
+    costumes = [
+        {"costumeId": 300000 + i, "nameTextMapHash": 2_000_000 + i, **_get_padding(rng, 10)}
+        for i in range(2000 * scale)
+    ]
+    items = [
+        {
+            "id": 400000 + i,
+            "nameTextMapHash": 3_000_000 + i,
+            "descTextMapHash": 4_000_000 + i,
+            "rankLevel": 1 + i % 5,
+            "icon": f"UI_Byd_Item_{i}",
+            **_get_padding(rng, 20),
+        }
+        for i in range(3000 * scale)
+    ]
+
+    client = GIClient(use_snapshot=False)
+    _write_tables(
+        client,
+        {
+            "AvatarExcelConfigData": characters,
+            "AvatarSkillDepotExcelConfigData": depots,
+            "AvatarSkillExcelConfigData": skills,
+            "BeyondCostumeExcelConfigData": costumes,
+            "BydMaterialExcelConfigData": items,
+        },
+    )
+
+    texts = {str(character["nameTextMapHash"]): 2 for character in characters}
+    texts |= {str(costume["nameTextMapHash"]): 3 for costume in costumes}
+    for item in items:
+        texts[str(item["nameTextMapHash"])] = 3
+        texts[str(item["descTextMapHash"])] = 40
+    _write_text_maps(client, GILanguage, texts, rng)
+    return len(texts)
+
+
+def _write_hsr_fixtures(scale: int, rng: random.Random) -> int:
+    """Write HSR data tables and text maps, returns how many hashes the text maps hold."""
+    paths = ("Warrior", "Rogue", "Mage", "Shaman", "Warlock", "Knight", "Priest", "Memory")
+    elements = ("Physical", "Fire", "Ice", "Thunder", "Wind", "Quantum", "Imaginary")
+
+    def _get_character(i: int) -> dict[str, Any]:
+        return {
+            "AvatarID": 1001 + i,
+            "AvatarName": {"Hash": 5_000_000 + i},
+            "Rarity": f"CombatPowerAvatarRarityType{4 + i % 2}",
+            "DamageType": elements[i % len(elements)],
+            "AvatarBaseType": paths[i % len(paths)],
+            "AvatarSideIconPath": f"SpriteOutput/AvatarRoundIcon/Avatar/{1001 + i}.png",
+            **_get_padding(rng, 40),
+        }
+
+    characters = [_get_character(i) for i in range(80 * scale)]
+    collab_characters = [_get_character(10000 + i) for i in range(5)]
+
+    client = HSRClient(use_snapshot=False)
+    _write_tables(client, {"AvatarConfig": characters, "AvatarConfigLD": collab_characters})
+
+    texts = {str(c["AvatarName"]["Hash"]): 2 for c in characters + collab_characters}
+    texts[TRAILBLAZER_NAME_HASH] = 1
+    _write_text_maps(client, HSRLanguage, texts, rng)
+
+    # The Trailblazers' names are a placeholder, translated through TRAILBLAZER_NAME_HASH
+    for lang in HSRLanguage:
+        path = client._get_file_path(client._get_text_map_url(lang))
+        text_map = orjson.loads(path.read_bytes())
+        for character in characters[:4]:
+            text_map[str(character["AvatarName"]["Hash"])] = "{NICKNAME}"
+        _write_json(path, text_map)
+    return len(texts)
+
+
+def _obfuscate(
+    rng: random.Random,
+    fields: Sequence[tuple[Any, Callable[[int], Any]]],
+    count: int,
+    *,
+    padding: int,
+) -> dict[str, list[dict[str, Any]]]:
+    """Build an obfuscated ZZZ table, like upstream's a single list under a random key.
+
+    Args:
+        rng: The random number generator.
+        fields: Per field, in order, the value the deobfuscator looks for in the first row and
+            a function returning its value in every other row.
+        count: The number of rows.
+        padding: How many fields no deobfuscator looks for to add after them.
+    """
+    keys: dict[str, None] = {}
+    while len(keys) < len(fields) + padding + 1:
+        keys["".join(rng.choices(string.ascii_uppercase, k=11))] = None
+    list_key, *field_keys = keys
+
+    rows: list[dict[str, Any]] = []
+    for i in range(count):
+        row = {
+            key: sample if i == 0 else get_value(i)
+            for key, (sample, get_value) in zip(field_keys, fields, strict=False)
+        }
+        # Zero in the first row, so no padding matches a value a deobfuscator looks for
+        for key in field_keys[len(fields) :]:
+            row[key] = 0 if i == 0 else rng.randrange(10**6)
+        rows.append(row)
+    return {list_key: rows}
+
+
+def _write_zzz_fixtures(scale: int, rng: random.Random) -> int:
+    """Write ZZZ data tables and text maps, returns how many hashes the text maps hold."""
+    character_ids = [1011 + 10 * i for i in range(60 * scale)]
+    weapon_ids = [12001 + i for i in range(150 * scale)]
+    bangboo_ids = [50001 + i for i in range(40 * scale)]
+    suit_ids = [31000 + 100 * i for i in range(50 * scale)]
+    # The first disc of the first set must be 31021, at position 1
+    disc_ids = [suit_id + 21 + position for suit_id in suit_ids for position in range(6)]
+    item_ids = [*character_ids, *weapon_ids, *bangboo_ids, *disc_ids]
+    item_ids = [item_ids[0], 10, *item_ids[1:]]  # Coins come with the sample name
+    item_ids += [900000 + i for i in range(12000 * scale - len(item_ids))]
+    skin_count = len(character_ids) * 3
+
+    def _get_skin_character(i: int) -> int:
+        return character_ids[i % len(character_ids)]
+
+    tables = {
+        "AvatarBaseTemplateTb": _obfuscate(
+            rng,
+            [
+                (1011, lambda i: character_ids[i]),
+                ("Avatar_Female_Size02_Anbi", lambda i: f"Avatar_{character_ids[i]}"),
+                (
+                    "Avatar_Female_Size02_Anbi_FullName",
+                    lambda i: f"Avatar_{character_ids[i]}_FullName",
+                ),
+            ],
+            len(character_ids),
+            padding=30,
+        ),
+        "AvatarBattleTemplateTb": _obfuscate(
+            rng,
+            [
+                (1011, lambda i: character_ids[i]),
+                ([203], lambda i: [200 + i % 6]),
+                (2, lambda i: 1 + i % 6),
+            ],
+            len(character_ids),
+            padding=60,
+        ),
+        "AvatarUITemplateTb": _obfuscate(
+            rng,
+            [(1011, lambda i: character_ids[i]), ("CampGentleHouse", lambda i: f"Camp_{i % 12}")],
+            len(character_ids),
+            padding=40,
+        ),
+        "AvatarSkinBaseTemplateTb": _obfuscate(
+            rng,
+            [
+                (3110110, lambda i: 3110110 + i),
+                (1011, _get_skin_character),
+                ("AvatarSkin_Anbi_Name_000", lambda i: f"AvatarSkin_{i}_Name"),
+                ("AvatarSkin_Anbi_Desc_000", lambda i: f"AvatarSkin_{i}_Desc"),
+                ("IconRole01", lambda i: f"IconRole{i:03}"),
+                # One default skin per character
+                (["DefaultSkin"], lambda i: ["DefaultSkin"] if i < len(character_ids) else []),
+            ],
+            skin_count,
+            padding=10,
+        ),
+        "WeaponTemplateTb": _obfuscate(
+            rng,
+            [
+                (12001, lambda i: weapon_ids[i]),
+                # The specialty is found by its position
+                *[(f"Weapon_{j}", lambda i, j=j: f"Weapon_{j}_{i}") for j in range(12)],
+                (1, lambda i: 1 + i % 6),
+            ],
+            len(weapon_ids),
+            padding=10,
+        ),
+        "ItemTemplateTb": _obfuscate(
+            rng,
+            [
+                (item_ids[0], lambda i: item_ids[i]),
+                ("Item_Coin", lambda i: f"Item_{item_ids[i]}"),
+                (3, lambda i: 1 + i % 3),
+                (_ZZZ_ITEM_ICON, lambda i: f"Assets/UI/Sprite/ItemIcon/Item{item_ids[i]}.png"),
+            ],
+            len(item_ids),
+            padding=25,
+        ),
+        "EquipmentTemplateTb": _obfuscate(
+            rng,
+            [
+                (31021, lambda i: disc_ids[i]),
+                (1, lambda i: 1 + i % 6),
+                (31000, lambda i: suit_ids[i // 6]),
+            ],
+            len(disc_ids),
+            padding=15,
+        ),
+        "EquipmentSuitTemplateTb": _obfuscate(
+            rng,
+            [
+                (31000, lambda i: suit_ids[i]),
+                ("EquipmentSuit_31000_name", lambda i: f"EquipmentSuit_{suit_ids[i]}_name"),
+                ("EquipmentSuit_31000_2_des", lambda i: f"EquipmentSuit_{suit_ids[i]}_2_des"),
+                ("EquipmentSuit_31000_4_des", lambda i: f"EquipmentSuit_{suit_ids[i]}_4_des"),
+                ("EquipmentSuit_31000_story", lambda i: f"EquipmentSuit_{suit_ids[i]}_story"),
+                (_ZZZ_SUIT_ICON, lambda i: f"UI/Sprite/IconSuit/Suit{suit_ids[i]}.png"),
+            ],
+            len(suit_ids),
+            padding=15,
+        ),
+        "BuddyBaseTemplateTb": _obfuscate(
+            rng,
+            [
+                (50001, lambda i: bangboo_ids[i]),
+                ("Bangboo_Name_en_50001", lambda i: f"Bangboo_Name_{bangboo_ids[i]}"),
+            ],
+            len(bangboo_ids),
+            padding=30,
+        ),
+        "GachaItemResourceTemplateTb": _obfuscate(
+            rng,
+            [
+                (1011, lambda i: [*character_ids, *bangboo_ids][i]),
+                ("IconRole01", lambda i: f"Assets/Gacha/IconRole{i:03}.png"),
+            ],
+            len(character_ids) + len(bangboo_ids),
+            padding=5,
+        ),
+    }
+
+    client = ZZZClient(use_snapshot=False)
+    _write_tables(client, tables)
+
+    # Text maps translate the names the deobfuscated tables hold
+    texts: dict[str, int] = {}
+    words = {
+        "Name": 3,
+        "FullName": 5,
+        "CampName": 2,
+        "SkinName": 3,
+        "SkinDesc": 40,
+        "TwoSetEffect": 30,
+        "FourSetEffect": 50,
+        "SuitStory": 120,
+    }
+    for file_name, data in tables.items():
+        for row in zzz_deob.DEOBFUSCATORS[file_name](data).deobfuscate():
+            texts |= {row[field]: count for field, count in words.items() if field in row}
+    _write_text_maps(client, ZZZLanguage, texts, rng)
+    return len(texts)
+
+
+def write_fixtures(directory: Path, *, scale: int) -> dict[str, int]:
+    """Write fixtures for every game into ``directory``'s ``.hb_data``.
+
+    Returns:
+        Per game, how many hashes its text maps hold.
+    """
+    cwd = Path.cwd()
+    os.chdir(directory)
+    try:
+        return {
+            "gi": _write_gi_fixtures(scale, random.Random(_SEED)),
+            "hsr": _write_hsr_fixtures(scale, random.Random(_SEED)),
+            "zzz": _write_zzz_fixtures(scale, random.Random(_SEED)),
+        }
+    finally:
+        os.chdir(cwd)
+
+
+@dataclass(slots=True)
+class Benchmark:
+    name: str
+    func: Callable[[], Any]
+    """What's measured, awaited if it returns an awaitable."""
+    setup: Callable[[], Any] | None = None
+    """Run before every run of ``func``, untimed, e.g. to drop caches."""
+    ops: int | None = None
+    """How many operations a run does, to report throughput."""
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    name: str
+    runs: int
+    min_s: float
+    median_s: float
+    mean_s: float
+    peak_memory_bytes: int
+    """The most memory allocated at once during a run, on top of what was allocated before."""
+    ops: int | None
+    ops_per_s: float | None
+
+
+async def _call(func: Callable[[], Any]) -> None:
+    result = func()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def run_benchmark(benchmark: Benchmark, *, repeat: int) -> BenchmarkResult:
+    """Time ``repeat`` runs, then measure the peak memory of one more under tracemalloc."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        if benchmark.setup is not None:
+            benchmark.setup()
+        gc.collect()
+        start = time.perf_counter()
+        await _call(benchmark.func)
+        timings.append(time.perf_counter() - start)
+
+    # Measured separately, tracing slows allocations down
+    if benchmark.setup is not None:
+        benchmark.setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await _call(benchmark.func)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(timings)
+    return BenchmarkResult(
+        name=benchmark.name,
+        runs=repeat,
+        min_s=best,
+        median_s=statistics.median(timings),
+        mean_s=statistics.fmean(timings),
+        peak_memory_bytes=peak,
+        ops=benchmark.ops,
+        ops_per_s=benchmark.ops / best if benchmark.ops and best > 0 else None,
+    )
+
+
+def _drop_catalogs(client: BaseClient) -> None:
+    """Make the next get_* call build its catalog from the tables, as after a fresh read."""
+    client._bump_data_version()
+    if isinstance(client, ZZZClient):
+        client._tables.clear()
+
+
+def _get_read_json_benchmarks(client: BaseClient, file_names: Iterable[str]) -> list[Benchmark]:
+    game = client._GAME
+    benchmarks: list[Benchmark] = []
+    for file_name in file_names:
+        path = client._get_file_path(client._get_data_url(file_name))
+
+        def _setup(path: Path = path) -> None:
+            BaseClient._FILE_CACHE.pop(str(path.absolute()), None)
+
+        benchmarks.append(
+            Benchmark(
+                f"read_json/{game}/{file_name}",
+                lambda path=path: client._read_json(path),
+                setup=_setup,
+            )
+        )
+    return benchmarks
+
+
+def _get_catalog_benchmarks(client: BaseClient) -> list[Benchmark]:
+    """Every get_* method reading data tables, each building its catalog from scratch."""
+    return [
+        Benchmark(
+            f"get/{client._GAME}/{name}",
+            getattr(client, name),
+            setup=lambda: _drop_catalogs(client),
+        )
+        for name, method in inspect.getmembers(type(client), inspect.isfunction)
+        if name.startswith("get_") and hasattr(method, "tables")
+    ]
+
+
+def _get_deobfuscate_benchmarks(client: ZZZClient) -> list[Benchmark]:
+    return [
+        Benchmark(
+            f"deobfuscate/zzz/{file_name}",
+            lambda cls=cls, data=client._data[file_name]: cls(data).deobfuscate(),
+        )
+        for file_name, cls in zzz_deob.DEOBFUSCATORS.items()
+    ]
+
+
+def _get_dict_utils_benchmarks(gi: GIClient, zzz: ZZZClient) -> list[Benchmark]:
+    tables = {file_name: zzz._get_table(file_name) for file_name in zzz_deob.DEOBFUSCATORS}
+    avatars = tables["AvatarBaseTemplateTb"]
+    items = tables["ItemTemplateTb"]
+    skins = tables["AvatarSkinBaseTemplateTb"]
+
+    return [
+        Benchmark("dict_utils/index_by", lambda: index_by(items, "ItemID")),
+        Benchmark("dict_utils/group_by", lambda: group_by(skins, "AvatarID")),
+        Benchmark(
+            "dict_utils/join/zzz_characters",
+            lambda: join(
+                avatars,
+                Join(tables["AvatarBattleTemplateTb"], left_key="ID"),
+                Join(tables["AvatarUITemplateTb"], left_key="ID"),
+                Join(items, left_key="ID", right_key="ItemID"),
+                Join(skins, left_key="ID", right_key="AvatarID", how="left", many="skins"),
+            ),
+        ),
+        Benchmark(
+            "dict_utils/join/gi_characters", gi._get_character_rows, setup=gi._bump_data_version
+        ),
+        Benchmark(
+            "dict_utils/merge_dicts_by_key",
+            lambda: merge_dicts_by_key(
+                [avatars, tables["AvatarBattleTemplateTb"], tables["AvatarUITemplateTb"]], key="ID"
+            ),
+        ),
+        Benchmark(
+            "dict_utils/merge_dicts_by_different_keys",
+            lambda: merge_dicts_by_different_keys({"ID": avatars, "ItemID": items}),
+        ),
+    ]
+
+
+def _get_translate_benchmark[L](
+    name: str, client: BaseClient, lang: L, hashes: Sequence[str]
+) -> Benchmark:
+    """Translate every hash in the text map, and as many that aren't in it."""
+    misses = [f"missing_{i}" for i in range(len(hashes))]
+
+    def _translate() -> None:
+        translate = client._translate
+        for text_map_hash in hashes:
+            translate(text_map_hash, lang)
+        for text_map_hash in misses:
+            translate(text_map_hash, lang)
+
+    return Benchmark(name, _translate, ops=len(hashes) + len(misses))
+
+
+async def _open_client[C: BaseClient](cls: type[C], mode: TextMapMode) -> C:
+    """Read a client's fixtures, without ``download()`` and so without any network access."""
+    client = cls(use_snapshot=False, lazy=True, text_map_mode=mode)
+    await client.start()
+    await client.read_text_maps()
+    await client.read_data()
+    return client
+
+
+async def run_benchmarks(*, repeat: int, name_filter: str | None = None) -> list[BenchmarkResult]:
+    """Run every benchmark on the fixtures in the working directory."""
+    clients: list[BaseClient] = []
+    results: list[BenchmarkResult] = []
+
+    async def _run(benchmarks: Iterable[Benchmark]) -> None:
+        for benchmark in benchmarks:
+            if name_filter is not None and name_filter not in benchmark.name:
+                continue
+            result = await run_benchmark(benchmark, repeat=repeat)
+            logger.info(
+                f"{result.name}: {result.median_s * 1000:.2f} ms median, "
+                f"{result.peak_memory_bytes / 2**20:.2f} MiB peak"
+            )
+            results.append(result)
+
+    try:
+        gi = await _open_client(GIClient, TextMapMode.EAGER)
+        hsr = await _open_client(HSRClient, TextMapMode.EAGER)
+        zzz = await _open_client(ZZZClient, TextMapMode.EAGER)
+        clients += [gi, hsr, zzz]
+
+        await _run(
+            _get_read_json_benchmarks(gi, ("AvatarExcelConfigData", "BydMaterialExcelConfigData"))
+        )
+        await _run(_get_read_json_benchmarks(hsr, ("AvatarConfig",)))
+        await _run(_get_read_json_benchmarks(zzz, ("ItemTemplateTb", "AvatarSkinBaseTemplateTb")))
+        await _run(_get_deobfuscate_benchmarks(zzz))
+        await _run(_get_dict_utils_benchmarks(gi, zzz))
+        for client in (gi, hsr, zzz):
+            await _run(_get_catalog_benchmarks(client))
+
+        langs = {gi: GILanguage.EN, hsr: HSRLanguage.EN, zzz: ZZZLanguage.EN}
+        for mode in TextMapMode:
+            for eager_client, lang in langs.items():
+                client = eager_client
+                if mode is not TextMapMode.EAGER:
+                    client = await _open_client(type(eager_client), mode)
+                    clients.append(client)
+                path = client._get_file_path(client._get_text_map_url(lang))
+                hashes = list(orjson.loads(path.read_bytes()))
+                name = f"translate/{client._GAME}/{mode}"
+                await _run([_get_translate_benchmark(name, client, lang, hashes)])
+    finally:
+        for client in clients:
+            await client.close()
+
+    return results
+
+
+def _get_commit() -> str | None:
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # ruff: ignore[start-process-with-partial-path]
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    return None
+
+
+def compare_results(current: dict[str, Any], baseline: dict[str, Any]) -> None:
+    """Log how every benchmark's median time and peak memory changed against a baseline."""
+    previous = {result["name"]: result for result in baseline["results"]}
+    for result in current["results"]:
+        old = previous.get(result["name"])
+        if old is None:
+            continue
+        time_change = result["median_s"] / old["median_s"] - 1 if old["median_s"] else 0.0
+        memory_change = (
+            result["peak_memory_bytes"] / old["peak_memory_bytes"] - 1
+            if old["peak_memory_bytes"]
+            else 0.0
+        )
+        logger.info(f"{result['name']}: time {time_change:+.1%}, peak memory {memory_change:+.1%}")
+
+
+async def main(
+    *, scale: int, repeat: int, fixtures: Path | None, name_filter: str | None
+) -> dict[str, Any]:
+    """Entry point: write fixtures, run the benchmarks on them and return the results."""
+    with contextlib.ExitStack() as stack:
+        if fixtures is None:
+            fixtures = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="hb_data-")))
+        fixtures.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f"Writing fixtures at scale {scale} to {fixtures}")
+        hashes = await asyncio.to_thread(write_fixtures, fixtures, scale=scale)
+
+        cwd = Path.cwd()
+        os.chdir(fixtures)
+        try:
+            results = await run_benchmarks(repeat=repeat, name_filter=name_filter)
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "commit": _get_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "repeat": repeat,
+        "text_map_hashes": hashes,
+        "results": [asdict(result) for result in results],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Multiply the fixtures' row counts (default: 1)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="How many times each benchmark runs (default: 5)"
+    )
+    parser.add_argument(
+        "--fixtures",
+        type=Path,
+        help="Write the fixtures here and keep them, instead of to a temporary directory",
+    )
+    parser.add_argument(
+        "-k", "--filter", dest="name_filter", help="Only run benchmarks whose name contains this"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write the results here as JSON, instead of to stdout"
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="Log how the results changed against earlier results"
+    )
+    args = parser.parse_args()
+
+    output = asyncio.run(
+        main(
+            scale=args.scale,
+            repeat=args.repeat,
+            fixtures=args.fixtures,
+            name_filter=args.name_filter,
+        )
+    )
+    content = orjson.dumps(output, option=orjson.OPT_INDENT_2)
+    if args.output is None:
+        sys.stdout.buffer.write(content + b"\n")
+    else:
+        args.output.write_bytes(content)
+    if args.compare is not None:
+        compare_results(output, orjson.loads(args.compare.read_bytes()))
@@ -2,15 +2,24 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
+import functools
+import uuid
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import aiofiles
-import aiohttp
+import aiofiles.os
 import orjson
+from aiohttp import hdrs
 from loguru import logger
 from yarl import URL
 
+from hb_data.common.manifest import MANIFEST_FILE_NAME, Manifest, ManifestEntry
+from hb_data.common.parsing import ParseExecutor
+from hb_data.common.scheduler import DownloadResult, DownloadScheduler, DownloadStatus
+from hb_data.common.text_map_file import get_text_map_file_path, write_text_map_file
 from hb_data.gi.client import GIClient
 from hb_data.gi.client import Language as GILanguage
 from hb_data.hsr.client import TRAILBLAZER_NAME_HASH, HSRClient
@@ -19,7 +28,14 @@ from hb_data.zzz import deob as zzz_deob
 from hb_data.zzz.client import Language as ZZZLanguage
 from hb_data.zzz.client import ZZZClient
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence, Set
+
+    from hb_data.common.base_client import BaseClient
+
 OUTPUT_DIR = Path("textmaps")
+STATE_DIR = Path(".hb_data") / "textmaps"
+_STATE_FILE_NAME = "state.json"
 
 _ZZZ_UPSTREAM_TEXT_MAP_URL = URL(
     "https://git.mero.moe/dimbreath/ZenlessData/raw/branch/master/TextMap"
@@ -30,6 +46,10 @@ _HSR_UPSTREAM_TEXT_MAP_URL = URL(
     "https://gitlab.com/Dimbreath/turnbasedgamedata/-/raw/main/TextMap"
 )
 _HSR_HAS_TWO_PARTS = frozenset({HSRLanguage.KR, HSRLanguage.RU, HSRLanguage.TH})
+_HSR_TRAILBLAZER_NAME = "Trailblazer"
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+_JSON_WHITESPACE = b" \t\r\n"
 
 
 def _extract_zzz_hashes(data: dict[str, Any]) -> set[str]:
@@ -105,88 +125,452 @@ def _extract_hsr_hashes(data: dict[str, Any]) -> set[str]:
     return hashes
 
 
-def _find_hsr_trailblazer_key(text_maps: dict[HSRLanguage, dict[str, str]]) -> str:
-    """Locate the upstream text map key for the Trailblazer's name by its EN value.
+class _StrippedTextMap(NamedTuple):
+    entries: dict[str, str]
+    """The kept entries, in upstream order."""
+    scanned: int
+    """How many upstream entries were parsed."""
+    found_key: str | None = None
+    """The first key whose value was searched for, see `_TextMapFilter`."""
+
+    def merge(self, other: _StrippedTextMap) -> _StrippedTextMap:
+        """Merge like ``{**self, **other}`` would the full upstream maps."""
+        return _StrippedTextMap(
+            {**self.entries, **other.entries},
+            self.scanned + other.scanned,
+            self.found_key if self.found_key is not None else other.found_key,
+        )
+
 
-    The key is re-keyed to the stable TRAILBLAZER_NAME_HASH sentinel when writing
-    stripped text maps, so an upstream re-key self-heals on the next generation run.
-    """
-    en_map = text_maps.get(HSRLanguage.EN, {})
-    key = next((k for k, v in en_map.items() if v == "Trailblazer"), None)
-    if key is None:
-        msg = 'HSR: no key with value "Trailblazer" found in the EN text map'
-        raise RuntimeError(msg)
-    return key
+def _find_run_end(buffer: bytearray) -> int:
+    """Find where the complete entries in a text map's buffered lines end, -1 if nowhere yet.
 
+    The last line with content is always left out, it may be partial or the object's closing
+    brace, which would end up inside the braces a run is wrapped in.
+    """
+    return buffer.rfind(b"\n", 0, len(buffer.rstrip(_JSON_WHITESPACE)))
 
-async def _fetch_json(session: aiohttp.ClientSession, url: URL) -> dict[str, str]:
-    async with session.get(url) as resp:
-        resp.raise_for_status()
-        return orjson.loads(await resp.read())
 
+class _TextMapFilter:
+    """Incrementally parses an upstream text map, keeping only the needed entries.
 
-async def _fetch_zzz_text_maps(session: aiohttp.ClientSession) -> dict[ZZZLanguage, dict[str, str]]:
-    async def _fetch(lang: ZZZLanguage) -> tuple[ZZZLanguage, dict[str, str]]:
-        def _get_url(overwrite: bool = False) -> URL:
-            if lang is ZZZLanguage.CHS:
-                stem = "TextMapOverwrite" if overwrite else "TextMap"
-            else:
-                stem = f"TextMap_{lang.value}Overwrite" if overwrite else f"TextMap_{lang.value}"
-            return _ZZZ_UPSTREAM_TEXT_MAP_URL / f"{stem}TemplateTb.json"
+    Upstream text maps are pretty-printed, one entry per line, and JSON strings can't contain
+    raw newlines, so the downloaded lines before the last one are a run of complete entries.
+    Each run is parsed and stripped as soon as it arrives, so only the kept entries and a
+    partial line are held in memory, never the full map. Should a run not parse on its own,
+    e.g. if upstream stops pretty-printing, the rest is buffered and parsed in one go.
 
-        # Fetch the base text map
-        base_map = await _fetch_json(session, _get_url())
+    Args:
+        keys: The keys to keep.
+        find_value: Also keep the first entry with this value, and record its key.
+    """
 
-        # Try to fetch and merge the overwrite text map
+    def __init__(self, keys: Set[str], *, find_value: str | None = None) -> None:
+        self._keys = keys
+        self._find_value = find_value
+        self._buffer = bytearray()
+        self._started = False
+        self._streaming = True
+        self._entries: dict[str, str] = {}
+        self._scanned = 0
+        self._found_key: str | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        self._buffer += chunk
+        if not self._streaming:
+            return
+        if not self._started:
+            start = self._buffer.lstrip(_JSON_WHITESPACE)
+            if not start:
+                return
+            if not start.startswith(b"{"):
+                self._streaming = False
+                return
+            # Runs are parsed wrapped in braces of their own
+            del self._buffer[: len(self._buffer) - len(start) + 1]
+            self._started = True
+
+        end = _find_run_end(self._buffer)
+        if end == -1:
+            return
+        run = self._buffer[:end].strip(_JSON_WHITESPACE + b",")
         try:
-            overwrite_map = await _fetch_json(session, _get_url(overwrite=True))
-            base_map.update(overwrite_map)
-            logger.info(f"  ZZZ/{lang}: Merged {len(overwrite_map)} overwrite entries")
-        except aiohttp.ClientResponseError as e:
-            if e.status != 404:
-                raise
+            self._keep(orjson.loads(b"{%s}" % run))
+        except orjson.JSONDecodeError:
+            self._streaming = False
+            return
+        del self._buffer[:end]
+
+    def close(self) -> _StrippedTextMap:
+        """Parse what's left of the input.
+
+        Raises:
+            orjson.JSONDecodeError: If the input isn't valid JSON.
+            TypeError: If the input isn't a JSON object.
+        """
+        if self._started:
+            text_map = orjson.loads(b"{%s" % self._buffer.lstrip(_JSON_WHITESPACE + b","))
+        else:
+            text_map = orjson.loads(self._buffer)
+        if not isinstance(text_map, dict):
+            msg = f"Expected a text map to be a JSON object, got {type(text_map).__name__}"
+            raise TypeError(msg)
+        self._keep(text_map)
+        return _StrippedTextMap(self._entries, self._scanned, self._found_key)
+
+    def _keep(self, text_map: dict[str, str]) -> None:
+        self._scanned += len(text_map)
+        if self._find_value is None or self._found_key is not None:
+            self._entries.update({k: v for k, v in text_map.items() if k in self._keys})
+            return
+
+        for key, value in text_map.items():
+            if self._found_key is None and value == self._find_value:
+                self._found_key = key
+                self._entries[key] = value
+            elif key in self._keys:
+                self._entries[key] = value
+
+
+@functools.cache
+def _load_keys(keys: bytes) -> frozenset[str]:
+    """Decode the keys sent to a worker, once per worker and set of keys."""
+    return frozenset(orjson.loads(keys))
+
+
+def _strip_text_map(content: bytes, keys: bytes, find_value: str | None) -> _StrippedTextMap:
+    """Strip a complete text map, or a batch of its entries, run in the process pool."""
+    text_map_filter = _TextMapFilter(_load_keys(keys), find_value=find_value)
+    text_map_filter.feed(content)
+    return text_map_filter.close()
+
+
+class _TextMapStripper:
+    """Strips a streamed upstream text map with `_TextMapFilter`, in a process pool if given.
+
+    Without a pool, chunks are stripped on the event loop as they arrive. With one, the entries
+    are cut into batches at line ends once ``parser.threshold`` bytes came in, and each batch
+    is stripped by a worker while the next one downloads. Only one batch per text map is in
+    the pool at a time, so memory stays bounded if the download outpaces the workers, and
+    cores are kept busy by the text maps downloading concurrently.
+
+    The batches are merged in order, so the result is the same as stripping the whole text map
+    at once. Should a batch not parse on its own, `orjson.JSONDecodeError` is raised and the
+    text map has to be stripped without a pool.
+    """
 
-        return lang, base_map
+    def __init__(
+        self, keys: Set[str], *, find_value: str | None, parser: ParseExecutor | None
+    ) -> None:
+        self._find_value = find_value
+        self._parser = parser
+        self._filter = _TextMapFilter(keys, find_value=find_value)
+        # Sorted, so workers decode each set of keys only once
+        self._encoded_keys = orjson.dumps(sorted(keys)) if parser is not None else b""
+        self._buffer = bytearray()
+        self._started = False
+        self._pending: asyncio.Future[_StrippedTextMap] | None = None
+        self._entries: dict[str, str] = {}
+        self._scanned = 0
+        self._found_key: str | None = None
+
+    async def feed(self, chunk: bytes) -> None:
+        if self._parser is None:
+            self._filter.feed(chunk)
+            return
+
+        self._buffer += chunk
+        if not self._started:
+            start = self._buffer.lstrip(_JSON_WHITESPACE)
+            if not start.startswith(b"{"):
+                # Not an object or nothing yet, either way it's left to `close`
+                return
+            del self._buffer[: len(self._buffer) - len(start) + 1]
+            self._started = True
+
+        if len(self._buffer) < self._parser.threshold:
+            return
+        end = _find_run_end(self._buffer)
+        if end == -1:
+            return
+        batch = b"{%s}" % self._buffer[:end].strip(_JSON_WHITESPACE + b",")
+        del self._buffer[:end]
+        await self._submit(self._parser, batch)
+
+    async def close(self) -> _StrippedTextMap:
+        """Strip what's left of the input and merge the batches.
+
+        Raises:
+            orjson.JSONDecodeError: If the input, or a batch of it, isn't valid JSON.
+            TypeError: If the input isn't a JSON object.
+        """
+        if self._parser is None:
+            return self._filter.close()
+
+        if self._started:
+            await self._submit(self._parser, b"{%s" % self._buffer.lstrip(_JSON_WHITESPACE + b","))
+        else:
+            await self._submit(self._parser, bytes(self._buffer))
+        self._buffer.clear()
+        await self._merge_pending()
+        return _StrippedTextMap(self._entries, self._scanned, self._found_key)
+
+    async def _submit(self, parser: ParseExecutor, batch: bytes) -> None:
+        await self._merge_pending()
+        # Past the first match, a batch keeps the value's entries only if they're needed
+        find_value = self._find_value if self._found_key is None else None
+        self._pending = asyncio.ensure_future(
+            parser.run(_strip_text_map, batch, self._encoded_keys, find_value)
+        )
 
-    return dict(await asyncio.gather(*[_fetch(lang) for lang in ZZZLanguage]))
+    async def _merge_pending(self) -> None:
+        if self._pending is None:
+            return
+        batch, self._pending = await self._pending, None
+        self._entries.update(batch.entries)
+        self._scanned += batch.scanned
+        if self._found_key is None:
+            self._found_key = batch.found_key
 
 
-async def _fetch_gi_text_maps(session: aiohttp.ClientSession) -> dict[GILanguage, dict[str, str]]:
-    async def _fetch_one(lang: GILanguage, stem: str) -> dict[str, str]:
-        if lang in _GI_HAS_TWO_PARTS:
-            part0, part1 = await asyncio.gather(
-                _fetch_json(session, _GI_UPSTREAM_TEXT_MAP_URL / f"{stem}{lang.value}_0.json"),
-                _fetch_json(session, _GI_UPSTREAM_TEXT_MAP_URL / f"{stem}{lang.value}_1.json"),
-            )
-            return {**part0, **part1}
-        return await _fetch_json(session, _GI_UPSTREAM_TEXT_MAP_URL / f"{stem}{lang.value}.json")
-
-    async def _fetch(lang: GILanguage) -> tuple[GILanguage, dict[str, str]]:
-        # Upstream keys the two map families differently: character names (and other
-        # long-lived strings) resolve via classic hashes in TextMap_Medium*, while newer
-        # content like MW costumes/items resolves via the re-keyed hashes in TextMap*.
-        # Merge both so all get_* translation calls can look up their hashes.
-        medium, regular = await asyncio.gather(
-            _fetch_one(lang, "TextMap_Medium"), _fetch_one(lang, "TextMap")
-        )
-        return lang, {**medium, **regular}
+def _raise_for_failures(results: list[DownloadResult]) -> None:
+    """Stripping against a partial set of data tables would silently drop hashes, so bail out."""
+    failed = [result for result in results if result.status is DownloadStatus.FAILED]
+    if failed:
+        msg = f"Failed to download {len(failed)} data table(s): {[str(r.url) for r in failed]}"
+        raise RuntimeError(msg) from failed[0].error
 
-    return dict(await asyncio.gather(*[_fetch(lang) for lang in GILanguage]))
 
+def _get_zzz_text_map_urls(lang: ZZZLanguage) -> list[URL]:
+    """The base text map, then the overwrite text map upstream may not have."""
+    if lang is ZZZLanguage.CHS:
+        stems = ("TextMap", "TextMapOverwrite")
+    else:
+        stems = (f"TextMap_{lang.value}", f"TextMap_{lang.value}Overwrite")
+    return [_ZZZ_UPSTREAM_TEXT_MAP_URL / f"{stem}TemplateTb.json" for stem in stems]
 
-async def _fetch_hsr_text_maps(session: aiohttp.ClientSession) -> dict[HSRLanguage, dict[str, str]]:
-    async def _fetch(lang: HSRLanguage) -> tuple[HSRLanguage, dict[str, str]]:
-        if lang in _HSR_HAS_TWO_PARTS:
-            part0, part1 = await asyncio.gather(
-                _fetch_json(session, _HSR_UPSTREAM_TEXT_MAP_URL / f"TextMap{lang.value}_0.json"),
-                _fetch_json(session, _HSR_UPSTREAM_TEXT_MAP_URL / f"TextMap{lang.value}_1.json"),
-            )
-            return lang, {**part0, **part1}
-        return lang, await _fetch_json(
-            session, _HSR_UPSTREAM_TEXT_MAP_URL / f"TextMap{lang.value}.json"
+
+def _get_gi_text_map_urls(lang: GILanguage) -> list[URL]:
+    # Upstream keys the two map families differently: character names (and other
+    # long-lived strings) resolve via classic hashes in TextMap_Medium*, while newer
+    # content like MW costumes/items resolves via the re-keyed hashes in TextMap*.
+    # Merge both so all get_* translation calls can look up their hashes.
+    suffixes = ("_0", "_1") if lang in _GI_HAS_TWO_PARTS else ("",)
+    return [
+        _GI_UPSTREAM_TEXT_MAP_URL / f"{stem}{lang.value}{suffix}.json"
+        for stem in ("TextMap_Medium", "TextMap")
+        for suffix in suffixes
+    ]
+
+
+def _get_hsr_text_map_urls(lang: HSRLanguage) -> list[URL]:
+    suffixes = ("_0", "_1") if lang in _HSR_HAS_TWO_PARTS else ("",)
+    return [_HSR_UPSTREAM_TEXT_MAP_URL / f"TextMap{lang.value}{suffix}.json" for suffix in suffixes]
+
+
+@dataclass(slots=True)
+class _TextMapState:
+    """What a game's text maps were last stripped to."""
+
+    hashes: list[str]
+    trailblazer_key: str | None = None
+
+
+def _load_state(path: Path) -> _TextMapState | None:
+    try:
+        return _TextMapState(**orjson.loads(path.read_bytes()))
+    except FileNotFoundError:
+        return None
+    except (orjson.JSONDecodeError, TypeError) as e:
+        logger.warning(f"Ignoring corrupt text map state {path}: {e}")
+        return None
+
+
+def _save_state(path: Path, state: _TextMapState) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.parent / f".tmp_{uuid.uuid4().hex}_{path.name}"
+    try:
+        temp_path.write_bytes(orjson.dumps(asdict(state), option=orjson.OPT_INDENT_2))
+        temp_path.replace(path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+class _TextMapUpdater:
+    """Fetches, strips and writes a game's text maps, optionally only the ones that changed.
+
+    The validators upstream sent for each text map are recorded in a manifest, and the hashes
+    they were stripped to in a state file, both under ``STATE_DIR``. With ``incremental``, an
+    output file is only rewritten if one of its upstream files or the needed hashes changed
+    since, or if it's missing; an unchanged one costs a ``304 Not Modified`` per upstream file.
+
+    Args:
+        game: The game's name, used in logs and to place its state.
+        client: The client whose session and scheduler are used for downloading.
+        incremental: Only rewrite the text maps that changed since the last run.
+        binary: Whether binary text maps are written too.
+        parser: The process pool text maps are stripped in, on the event loop if ``None``.
+    """
+
+    def __init__(
+        self,
+        game: str,
+        client: BaseClient,
+        *,
+        incremental: bool,
+        binary: bool,
+        parser: ParseExecutor | None,
+    ) -> None:
+        self._game = game
+        self._client = client
+        self._incremental = incremental
+        self._binary = binary
+        self._parser = parser
+        self._state_dir = STATE_DIR / game.lower()
+        self._manifest = Manifest(self._state_dir / MANIFEST_FILE_NAME)
+        self.previous: _TextMapState | None = None
+        """The state of the last run, ``None`` if there wasn't one."""
+        self.rewritten = 0
+        self.unchanged = 0
+
+    async def load(self) -> None:
+        self._manifest = await Manifest.load(self._state_dir)
+        self.previous = await asyncio.to_thread(_load_state, self._state_dir / _STATE_FILE_NAME)
+
+    async def save(self, state: _TextMapState) -> None:
+        """Record what the text maps were generated from, once they're all written."""
+        await self._manifest.save()
+        await asyncio.to_thread(_save_state, self._state_dir / _STATE_FILE_NAME, state)
+
+    def describe_hash_change(self, hashes: Set[str]) -> str | None:
+        """Why the needed hashes differ from the last run's, ``None`` if they don't."""
+        if self.previous is None:
+            return "no previous run"
+        previous = set(self.previous.hashes)
+        if previous == hashes:
+            return None
+        return f"needed hashes changed (+{len(hashes - previous)}/-{len(previous - hashes)})"
+
+    async def update(
+        self,
+        path: Path,
+        urls: Sequence[URL],
+        keys: Set[str],
+        *,
+        key_change: str | None,
+        find_value: str | None = None,
+    ) -> tuple[_StrippedTextMap, str] | None:
+        """Fetch the upstream text maps of an output file and merge them in order.
+
+        Args:
+            path: The output file.
+            urls: Its upstream text maps, the ones after the first may be missing upstream.
+            keys: The keys to keep.
+            key_change: Why the keys differ from the last run's, ``None`` if they don't.
+            find_value: See `_TextMapFilter`.
+
+        Returns:
+            The merged text map and why it has to be rewritten, ``None`` if it doesn't.
+        """
+        reason = await self._get_rewrite_reason(path, key_change)
+        text_maps = await asyncio.gather(
+            *[
+                self._fetch(
+                    url, keys, revalidate=reason is None, optional=i > 0, find_value=find_value
+                )
+                for i, url in enumerate(urls)
+            ]
+        )
+        changed = [
+            url.name for url, text_map in zip(urls, text_maps, strict=True) if text_map is not None
+        ]
+        if not changed:
+            logger.info(f"  {self._game}: {path.name} unchanged")
+            self.unchanged += 1
+            return None
+
+        # The unchanged upstream files are part of the output too
+        unchanged = [i for i, text_map in enumerate(text_maps) if text_map is None]
+        refetched = await asyncio.gather(
+            *[
+                self._fetch(urls[i], keys, revalidate=False, optional=i > 0, find_value=find_value)
+                for i in unchanged
+            ]
+        )
+        for i, text_map in zip(unchanged, refetched, strict=True):
+            text_maps[i] = text_map
+        return (
+            functools.reduce(_StrippedTextMap.merge, text_maps),
+            reason or f"upstream changed: {', '.join(changed)}",
         )
 
-    return dict(await asyncio.gather(*[_fetch(lang) for lang in HSRLanguage]))
+    async def write(self, path: Path, text_map: _StrippedTextMap, reason: str) -> None:
+        entries, scanned, _ = text_map
+        logger.info(
+            f"  {self._game}: {len(entries)}/{scanned} entries kept → {path.name} ({reason})"
+        )
+        await _write_text_map(path, entries, binary=self._binary)
+        self.rewritten += 1
+
+    async def _get_rewrite_reason(self, path: Path, key_change: str | None) -> str | None:
+        if not self._incremental:
+            return "full run"
+        if key_change is not None:
+            return key_change
+
+        paths = [path, get_text_map_file_path(path)] if self._binary else [path]
+        for output_path in paths:
+            if not await aiofiles.os.path.exists(output_path):
+                return f"{output_path.name} missing"
+        return None
+
+    async def _fetch(
+        self, url: URL, keys: Set[str], *, revalidate: bool, optional: bool, find_value: str | None
+    ) -> _StrippedTextMap | None:
+        """Download an upstream text map, stripping it to ``keys`` while it streams in.
+
+        Returns:
+            The stripped text map, empty if it's optional and missing upstream. ``None`` if
+            revalidating and it didn't change since the last run.
+        """
+        entry = self._manifest.get(url) if revalidate else None
+        headers: dict[str, str] = {}
+        if entry is not None and entry.etag is not None:
+            headers[hdrs.IF_NONE_MATCH] = entry.etag
+        if entry is not None and entry.last_modified is not None:
+            headers[hdrs.IF_MODIFIED_SINCE] = entry.last_modified
+
+        async def _fetch(parser: ParseExecutor | None) -> _StrippedTextMap | None:
+            stripper = _TextMapStripper(keys, find_value=find_value, parser=parser)
+            async with self._client.session.get(url, headers=headers) as resp:
+                if resp.status == 304 and headers:
+                    return None
+                if resp.status == 404 and optional:
+                    self._manifest.pop(url)
+                    # It only changed if it existed on the last run
+                    return None if revalidate and entry is None else _StrippedTextMap({}, 0)
+                resp.raise_for_status()
+
+                size = 0
+                async for chunk in resp.content.iter_chunked(_STREAM_CHUNK_SIZE):
+                    await stripper.feed(chunk)
+                    size += len(chunk)
+                validators = ManifestEntry(
+                    etag=resp.headers.get(hdrs.ETAG),
+                    last_modified=resp.headers.get(hdrs.LAST_MODIFIED),
+                    size=size,
+                )
+
+            text_map = await stripper.close()
+            self._manifest.set(url, validators)
+            return text_map
+
+        if self._parser is not None:
+            try:
+                return await self._client.scheduler.run(url, lambda: _fetch(self._parser))
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"{url} can't be stripped in batches ({e}), retrying in one go")
+        return await self._client.scheduler.run(url, lambda: _fetch(None))
 
 
 async def _write_json(path: Path, data: dict) -> None:
@@ -195,101 +579,210 @@ async def _write_json(path: Path, data: dict) -> None:
         await f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
-async def generate_zzz(output_dir: Path, *, force: bool) -> None:
-    """Download ZZZ data tables and full upstream text maps, strip to needed hashes, write output."""
-    client = ZZZClient()
+async def _write_text_map(path: Path, data: dict[str, str], *, binary: bool) -> None:
+    """Write a stripped text map as JSON and, if requested, as a binary text map next to it."""
+    await _write_json(path, data)
+    if binary:
+        await asyncio.to_thread(write_text_map_file, get_text_map_file_path(path), data)
+
+
+async def generate_zzz(  # ruff: ignore[too-many-arguments]
+    output_dir: Path,
+    *,
+    force: bool,
+    binary: bool,
+    incremental: bool,
+    scheduler: DownloadScheduler,
+    parser: ParseExecutor | None,
+) -> _TextMapUpdater:
+    """Download ZZZ data tables and upstream text maps, stripped to needed hashes, write output.
+
+    The overwrite text maps upstream has for some languages are merged over the base ones.
+    """
+    client = ZZZClient(scheduler=scheduler)
     await client.start()
     try:
-        await client.download_data_tables(force=force)
-        text_maps = await _fetch_zzz_text_maps(client.session)
+        _raise_for_failures(await client.download_data_tables(force=force, refresh=incremental))
         hashes = _extract_zzz_hashes(client._data)
         logger.info(f"ZZZ: {len(hashes)} unique hashes extracted")
 
-        tasks = []
-        for lang in ZZZLanguage:
-            full_map = text_maps.get(lang, {})
-            stripped = {k: v for k, v in full_map.items() if k in hashes}
+        updater = _TextMapUpdater(
+            "ZZZ", client, incremental=incremental, binary=binary, parser=parser
+        )
+        await updater.load()
+        key_change = updater.describe_hash_change(hashes)
+
+        async def _generate(lang: ZZZLanguage) -> None:
             file_name = (
                 "TextMapTemplateTb.json"
                 if lang is ZZZLanguage.CHS
                 else f"TextMap_{lang.value}TemplateTb.json"
             )
-            logger.info(f"  ZZZ/{lang}: {len(stripped)}/{len(full_map)} entries kept → {file_name}")
-            tasks.append(_write_json(output_dir / "zzz" / file_name, stripped))
+            path = output_dir / "zzz" / file_name
+            update = await updater.update(
+                path, _get_zzz_text_map_urls(lang), hashes, key_change=key_change
+            )
+            if update is not None:
+                await updater.write(path, *update)
 
-        await asyncio.gather(*tasks)
+        await asyncio.gather(*[_generate(lang) for lang in ZZZLanguage])
+        await updater.save(_TextMapState(sorted(hashes)))
     finally:
         await client.close()
+    return updater
 
 
-async def generate_gi(output_dir: Path, *, force: bool) -> None:
-    """Download GI data tables and full upstream text maps, strip to needed hashes, write output.
+async def generate_gi(  # ruff: ignore[too-many-arguments]
+    output_dir: Path,
+    *,
+    force: bool,
+    binary: bool,
+    incremental: bool,
+    scheduler: DownloadScheduler,
+    parser: ParseExecutor | None,
+) -> _TextMapUpdater:
+    """Download GI data tables and upstream text maps, stripped to needed hashes, write output.
 
-    RU and TH have split upstream files; we merge them here before stripping.
+    RU and TH have split upstream files; we merge their stripped parts here.
     We always write a single file per language (TextMapRU.json, TextMapTH.json).
     """
-    client = GIClient()
+    client = GIClient(scheduler=scheduler)
     await client.start()
     try:
-        await client.download_data_tables(force=force)
-        text_maps = await _fetch_gi_text_maps(client.session)
+        _raise_for_failures(await client.download_data_tables(force=force, refresh=incremental))
         hashes = _extract_gi_hashes(client._data)
         logger.info(f"GI: {len(hashes)} unique hashes extracted")
 
-        tasks = []
-        for lang in GILanguage:
-            full_map = text_maps.get(lang, {})
-            stripped = {k: v for k, v in full_map.items() if k in hashes}
-            file_name = f"TextMap{lang.value}.json"
-            logger.info(f"  GI/{lang}: {len(stripped)}/{len(full_map)} entries kept → {file_name}")
-            tasks.append(_write_json(output_dir / "gi" / file_name, stripped))
+        updater = _TextMapUpdater(
+            "GI", client, incremental=incremental, binary=binary, parser=parser
+        )
+        await updater.load()
+        key_change = updater.describe_hash_change(hashes)
 
-        await asyncio.gather(*tasks)
+        async def _generate(lang: GILanguage) -> None:
+            path = output_dir / "gi" / f"TextMap{lang.value}.json"
+            update = await updater.update(
+                path, _get_gi_text_map_urls(lang), hashes, key_change=key_change
+            )
+            if update is not None:
+                await updater.write(path, *update)
+
+        await asyncio.gather(*[_generate(lang) for lang in GILanguage])
+        await updater.save(_TextMapState(sorted(hashes)))
     finally:
         await client.close()
+    return updater
 
 
-async def generate_hsr(output_dir: Path, *, force: bool) -> None:
-    """Download HSR data tables and full upstream text maps, strip to needed hashes, write output.
+async def generate_hsr(  # ruff: ignore[too-many-arguments]
+    output_dir: Path,
+    *,
+    force: bool,
+    binary: bool,
+    incremental: bool,
+    scheduler: DownloadScheduler,
+    parser: ParseExecutor | None,
+) -> _TextMapUpdater:
+    """Download HSR data tables and upstream text maps, stripped to needed hashes, write output.
 
-    KR, RU, and TH have split upstream files; we merge them here before stripping.
+    KR, RU, and TH have split upstream files; we merge their stripped parts here.
     We always write a single file per language (TextMapKR.json, TextMapRU.json, TextMapTH.json).
+
+    The Trailblazer's name is written under TRAILBLAZER_NAME_HASH. Its upstream key is located
+    by its EN value, so EN is fetched first and the other languages are stripped to that key
+    too. An upstream re-key then self-heals on the next generation run.
     """
-    client = HSRClient()
+    client = HSRClient(scheduler=scheduler)
     await client.start()
     try:
-        await client.download_data_tables(force=force)
-        text_maps = await _fetch_hsr_text_maps(client.session)
+        _raise_for_failures(await client.download_data_tables(force=force, refresh=incremental))
         hashes = _extract_hsr_hashes(client._data)
         logger.info(f"HSR: {len(hashes)} unique hashes extracted")
 
-        trailblazer_key = _find_hsr_trailblazer_key(text_maps)
+        updater = _TextMapUpdater(
+            "HSR", client, incremental=incremental, binary=binary, parser=parser
+        )
+        await updater.load()
+        key_change = updater.describe_hash_change(hashes)
+        previous_key = updater.previous.trailblazer_key if updater.previous else None
+
+        en_path = output_dir / "hsr" / f"TextMap{HSRLanguage.EN.value}.json"
+        en_update = await updater.update(
+            en_path,
+            _get_hsr_text_map_urls(HSRLanguage.EN),
+            hashes,
+            # An unchanged EN text map is only of use if the key found in it was recorded
+            key_change=key_change or (None if previous_key else "no previous Trailblazer key"),
+            find_value=_HSR_TRAILBLAZER_NAME,
+        )
+        trailblazer_key = en_update[0].found_key if en_update else previous_key
+        if trailblazer_key is None:
+            msg = f'HSR: no key with value "{_HSR_TRAILBLAZER_NAME}" found in the EN text map'
+            raise RuntimeError(msg)
         logger.info(f"HSR: Trailblazer name key located: {trailblazer_key}")
+        if key_change is None and trailblazer_key != previous_key:
+            key_change = "Trailblazer key changed"
+
+        def _rekey(text_map: _StrippedTextMap) -> None:
+            entries = text_map.entries
+            value = (
+                entries.get(trailblazer_key)
+                if trailblazer_key in hashes
+                else entries.pop(trailblazer_key, None)
+            )
+            if value:
+                entries[TRAILBLAZER_NAME_HASH] = value
+
+        async def _generate(lang: HSRLanguage) -> None:
+            path = output_dir / "hsr" / f"TextMap{lang.value}.json"
+            update = (
+                en_update
+                if lang is HSRLanguage.EN
+                else await updater.update(
+                    path,
+                    _get_hsr_text_map_urls(lang),
+                    hashes | {trailblazer_key},
+                    key_change=key_change,
+                )
+            )
+            if update is not None:
+                _rekey(update[0])
+                await updater.write(path, *update)
 
-        tasks = []
-        for lang in HSRLanguage:
-            full_map = text_maps.get(lang, {})
-            stripped = {k: v for k, v in full_map.items() if k in hashes}
-            if v := full_map.get(trailblazer_key):
-                stripped[TRAILBLAZER_NAME_HASH] = v
-            file_name = f"TextMap{lang.value}.json"
-            logger.info(f"  HSR/{lang}: {len(stripped)}/{len(full_map)} entries kept → {file_name}")
-            tasks.append(_write_json(output_dir / "hsr" / file_name, stripped))
-
-        await asyncio.gather(*tasks)
+        await asyncio.gather(*[_generate(lang) for lang in HSRLanguage])
+        await updater.save(_TextMapState(sorted(hashes), trailblazer_key))
     finally:
         await client.close()
+    return updater
 
 
-async def main(*, force: bool) -> None:
+async def main(*, force: bool, binary: bool, incremental: bool = False, jobs: int = 1) -> None:
     """Entry point: generate stripped text maps for all games."""
     output_dir = OUTPUT_DIR
     await asyncio.to_thread(output_dir.mkdir, parents=True, exist_ok=True)
-    await asyncio.gather(
-        generate_zzz(output_dir, force=force),
-        generate_gi(output_dir, force=force),
-        generate_hsr(output_dir, force=force),
+    pool = (
+        ParseExecutor(max_workers=jobs, use_processes=True)
+        if jobs > 1
+        else contextlib.nullcontext()
     )
+    async with DownloadScheduler() as scheduler, pool as parser:
+        updaters = await asyncio.gather(
+            *[
+                generate(
+                    output_dir,
+                    force=force,
+                    binary=binary,
+                    incremental=incremental,
+                    scheduler=scheduler,
+                    parser=parser,
+                )
+                for generate in (generate_zzz, generate_gi, generate_hsr)
+            ]
+        )
+
+    logger.info("Summary:")
+    for game, updater in zip(("ZZZ", "GI", "HSR"), updaters, strict=True):
+        logger.info(f"  {game}: {updater.rewritten} rewritten, {updater.unchanged} unchanged")
 
 
 if __name__ == "__main__":
@@ -301,5 +794,26 @@ if __name__ == "__main__":
         action="store_true",
         help="Re-download data files even if already cached in .hb_data/",
     )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="Also write each text map in the binary format clients can memory-map",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Only rewrite the text maps whose upstream files or needed hashes changed since the "
+            f"last run, as recorded in {STATE_DIR}/"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Strip text maps in this many processes, on the main one if 1 (default: 1)",
+    )
     args = parser.parse_args()
-    asyncio.run(main(force=args.force))
+    asyncio.run(
+        main(force=args.force, binary=args.binary, incremental=args.incremental, jobs=args.jobs)
+    )
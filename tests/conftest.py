@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import shutil
+from typing import TYPE_CHECKING
+
+import pytest
+
+from scripts.benchmark import write_fixtures
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture(scope="session")
+def fixtures_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A directory whose ``.hb_data`` holds the benchmark's synthetic fixtures, never modify it."""
+    directory = tmp_path_factory.mktemp("fixtures")
+    write_fixtures(directory, scale=1)
+    return directory
+
+
+@pytest.fixture
+def data_dir(fixtures_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run the test in a copy of the fixtures, clients find their data in ``.hb_data``."""
+    shutil.copytree(fixtures_dir / ".hb_data", tmp_path / ".hb_data")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+from typing import TYPE_CHECKING, Any
+
+import orjson
+import pytest
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+
+from hb_data import CacheCompression, GIClient, TextMapMode
+from hb_data.common.cache_compression import (
+    CacheEncoder,
+    decompress,
+    ensure_supported,
+    get_compressor,
+    is_compressed,
+)
+from hb_data.gi import Language
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from yarl import URL
+
+CONTENT = orjson.dumps([{"id": i, "name": f"旅行者 {i}"} for i in range(2000)])
+
+
+@pytest.fixture(params=list(CacheCompression))
+def compression(request: pytest.FixtureRequest) -> CacheCompression:
+    try:
+        ensure_supported(request.param)
+    except RuntimeError:
+        pytest.skip(f"{request.param} isn't installed")
+    return request.param
+
+
+def _compress(compression: CacheCompression, content: bytes) -> bytes:
+    compressor = get_compressor(compression)
+    return compressor.compress(content) + compressor.flush()
+
+
+def _encode(compression: CacheCompression | None, content: bytes, chunk_size: int) -> bytes:
+    encoder = CacheEncoder(compression)
+    chunks = [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
+    return b"".join(map(encoder.encode, chunks)) + encoder.flush()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 65536])
+def test_encoded_files_round_trip(compression: CacheCompression, chunk_size: int) -> None:
+    encoded = _encode(compression, CONTENT, chunk_size)
+
+    assert is_compressed(encoded)
+    assert len(encoded) < len(CONTENT)
+    assert decompress(encoded) == CONTENT
+
+
+def test_bodies_shorter_than_a_magic_number_round_trip(compression: CacheCompression) -> None:
+    for content in (b"", b"["):
+        assert decompress(_encode(compression, content, 1)) == content
+
+
+def test_plain_files_are_written_as_is() -> None:
+    assert _encode(None, CONTENT, 3) == CONTENT
+    assert decompress(CONTENT) == CONTENT
+
+
+def test_compressed_bodies_are_not_compressed_twice(compression: CacheCompression) -> None:
+    for body_compression in (CacheCompression.GZIP, compression):
+        body = _compress(body_compression, CONTENT)
+        assert _encode(compression, body, 3) == body
+
+
+async def _download(url: URL, compression: CacheCompression | None) -> list[Any]:
+    async with GIClient(
+        upstream_url=url, text_map_url=url, cache_compression=compression
+    ) as client:
+        await client.download(langs=[Language.EN])
+        return client.get_characters()
+
+
+def _serve(directory: Path) -> web.Application:
+    async def serve(request: web.Request) -> web.FileResponse:  # ruff: ignore[unused-async]
+        path = directory / request.match_info["file_name"]
+        if not path.exists():
+            raise web.HTTPNotFound
+        return web.FileResponse(path)
+
+    app = web.Application()
+    app.router.add_get("/gi/{path:.*}/{file_name}", serve)
+    app.router.add_get("/gi/{file_name}", serve)
+    return app
+
+
+def test_downloads_round_trip(
+    compression: CacheCompression,
+    fixtures_dir: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def main() -> None:
+        async with TestServer(_serve(fixtures_dir / ".hb_data" / "gi")) as server:
+            url = server.make_url("/gi")
+            monkeypatch.chdir(tmp_path / "plain")
+            expected = await _download(url, None)
+            monkeypatch.chdir(tmp_path / "compressed")
+            assert await _download(url, compression) == expected
+
+        paths = list((tmp_path / "compressed" / ".hb_data" / "gi").glob("[!.]*.json"))
+        assert paths
+        for path in paths:
+            assert is_compressed(path.read_bytes()), path
+            plain_path = tmp_path / "plain" / path.relative_to(tmp_path / "compressed")
+            assert decompress(path.read_bytes()) == plain_path.read_bytes()
+
+    (tmp_path / "plain").mkdir()
+    (tmp_path / "compressed").mkdir()
+    asyncio.run(main())
+
+
+def test_gzip_bodies_are_written_without_decoding(tmp_path: Path) -> None:
+    body = gzip.compress(CONTENT)
+    accepted: list[str] = []
+
+    async def serve(request: web.Request) -> web.Response:  # ruff: ignore[unused-async]
+        accepted.append(request.headers[hdrs.ACCEPT_ENCODING])
+        return web.Response(body=body, headers={hdrs.CONTENT_ENCODING: "gzip"})
+
+    async def main() -> None:
+        app = web.Application()
+        app.router.add_get("/Table.json", serve)
+        async with (
+            TestServer(app) as server,
+            GIClient(cache_compression=CacheCompression.GZIP) as client,
+        ):
+            path = tmp_path / "Table.json"
+            await client._download_file(server.make_url("/Table.json"), path)
+            # The transfer encoding is the file's, as sent
+            assert path.read_bytes() == body
+            assert await client._read_json(path) == orjson.loads(CONTENT)
+
+    asyncio.run(main())
+    assert accepted == ["gzip"]
+
+
+@pytest.mark.usefixtures("data_dir")
+@pytest.mark.parametrize("text_map_mode", list(TextMapMode))
+def test_plain_and_compressed_files_are_read_alike(
+    compression: CacheCompression, text_map_mode: TextMapMode, data_dir: Path
+) -> None:
+    async def get_catalogs(client_compression: CacheCompression | None) -> list[Any]:
+        async with GIClient(
+            cache_compression=client_compression, text_map_mode=text_map_mode
+        ) as client:
+            await client.download(langs=[Language.EN])
+            return [client.get_characters(), client.get_traveler_elements()]
+
+    async def main() -> None:
+        expected = await get_catalogs(None)
+        # A cache downloaded before compression was turned on, it's read as is
+        assert await get_catalogs(compression) == expected
+        directory = data_dir / ".hb_data" / "gi"
+        assert not is_compressed((directory / "AvatarExcelConfigData.json").read_bytes())
+
+        # Some files compressed since, the rest still plain
+        for file_name in ("AvatarExcelConfigData.json", "TextMapEN.json"):
+            path = directory / file_name
+            path.write_bytes(_compress(compression, path.read_bytes()))
+        assert await get_catalogs(compression) == expected
+        assert await get_catalogs(None) == expected
+
+    asyncio.run(main())
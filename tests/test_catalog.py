@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from hb_data import GIClient, ZZZClient
+from hb_data.gi import Language
+
+
+async def _read(client: GIClient | ZZZClient) -> None:
+    await client.read_text_maps()
+    await client.read_data()
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_callers_share_cached_entities() -> None:
+    async def main() -> None:
+        async with GIClient(lazy=True) as client:
+            await _read(client)
+            first = client.get_characters()
+            second = client.get_characters()
+
+            assert first is not second
+            assert all(a is b for a, b in zip(first, second, strict=True))
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_changing_the_returned_list_does_not_change_the_cache() -> None:
+    async def main() -> None:
+        async with ZZZClient(lazy=True, use_snapshot=False) as client:
+            await _read(client)
+            weapons = client.get_weapons()
+            count = len(weapons)
+            weapons.clear()
+
+            assert len(client.get_weapons()) == count
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_deep_copies_leave_the_cache_alone() -> None:
+    async def main() -> None:
+        async with GIClient(lazy=True) as client:
+            await _read(client)
+            character = client.get_characters()[0].model_copy(deep=True)
+            name = client.get_characters()[0].name
+            character.name = f"{name}!"
+
+            assert client.get_characters()[0].name == name
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_each_language_has_its_own_entities() -> None:
+    async def main() -> None:
+        async with GIClient(lazy=True) as client:
+            await _read(client)
+            english = client.get_characters(lang=Language.EN)
+            japanese = client.get_characters(lang=Language.JP)
+
+            assert not any(a is b for a, b in zip(english, japanese, strict=True))
+
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import pytest
+
+from hb_data.common.dict_utils import (
+    Join,
+    index_by,
+    join,
+    merge_dicts_by_different_keys,
+    merge_dicts_by_key,
+)
+
+WEAPONS = [{"ItemID": 1, "Atk": 10}, {"ItemID": 2, "Atk": 20}, {"ItemID": 3, "Atk": 30}]
+ITEMS = [
+    {"ItemID": 1, "Name": "a", "Rarity": 4},
+    {"ItemID": 2, "Name": "b", "Rarity": 5},
+    {"ItemID": 9, "Name": "z", "Rarity": 3},
+]
+
+
+def test_inner_join_drops_rows_without_a_match() -> None:
+    assert join(WEAPONS, Join(ITEMS, left_key="ItemID")) == [
+        {"ItemID": 1, "Atk": 10, "Name": "a", "Rarity": 4},
+        {"ItemID": 2, "Atk": 20, "Name": "b", "Rarity": 5},
+    ]
+
+
+def test_left_join_keeps_rows_without_a_match() -> None:
+    result = join(WEAPONS, Join(ITEMS, left_key="ItemID", how="left"))
+
+    assert [row["ItemID"] for row in result] == [1, 2, 3]
+    assert result[2] == {"ItemID": 3, "Atk": 30}
+
+
+def test_join_does_not_mutate_its_input() -> None:
+    rows = [{"ItemID": 1, "Atk": 10}]
+    result = join(rows, Join(ITEMS, left_key="ItemID"))
+
+    assert rows == [{"ItemID": 1, "Atk": 10}]
+    assert result[0] is not rows[0]
+
+
+def test_rows_missing_the_left_key_have_no_match() -> None:
+    rows = [{"Atk": 10}, {"ItemID": 1}]
+
+    assert join(rows, Join(ITEMS, left_key="ItemID")) == [{"ItemID": 1, "Name": "a", "Rarity": 4}]
+    assert join(rows, Join(ITEMS, left_key="ItemID", how="left"))[0] == {"Atk": 10}
+
+
+def test_different_and_composite_keys() -> None:
+    avatars = [{"ID": 1}, {"ID": 2}]
+    levels = [{"AvatarID": 1, "Level": 1, "Hp": 100}, {"AvatarID": 1, "Level": 2, "Hp": 200}]
+
+    assert join(avatars, Join(ITEMS, left_key="ID", right_key="ItemID")) == [
+        {"ID": 1, "ItemID": 1, "Name": "a", "Rarity": 4},
+        {"ID": 2, "ItemID": 2, "Name": "b", "Rarity": 5},
+    ]
+    rows = [{"ID": 1, "Level": 2}]
+    stage = Join(levels, left_key=("ID", "Level"), right_key=("AvatarID", "Level"))
+    assert join(rows, stage) == [{"ID": 1, "Level": 2, "AvatarID": 1, "Hp": 200}]
+
+
+def test_columns_projects_the_match() -> None:
+    result = join(WEAPONS, Join(ITEMS, left_key="ItemID", columns=("Name", "Missing")))
+
+    assert result[0] == {"ItemID": 1, "Atk": 10, "Name": "a"}
+
+
+def test_many_collects_every_match() -> None:
+    avatars = [{"ID": 1}, {"ID": 2}]
+    skins = [
+        {"AvatarID": 1, "SkinID": 10, "Tags": ["DefaultSkin"]},
+        {"AvatarID": 1, "SkinID": 11, "Tags": []},
+        {"AvatarID": 3, "SkinID": 30, "Tags": []},
+    ]
+    stage = Join(
+        skins, left_key="ID", right_key="AvatarID", how="left", columns=("SkinID",), many="skins"
+    )
+
+    assert join(avatars, stage) == [
+        {"ID": 1, "skins": [{"SkinID": 10}, {"SkinID": 11}]},
+        {"ID": 2, "skins": []},
+    ]
+
+
+def test_inner_many_drops_rows_without_matches() -> None:
+    avatars = [{"ID": 1}, {"ID": 2}]
+    skins = [{"AvatarID": 1, "SkinID": 10}]
+    stage = Join(skins, left_key="ID", right_key="AvatarID", many="skins")
+
+    assert join(avatars, stage) == [{"ID": 1, "skins": [{"AvatarID": 1, "SkinID": 10}]}]
+
+
+def test_duplicate_right_keys_match_the_last_row() -> None:
+    items = [{"ItemID": 1, "Name": "old"}, {"ItemID": 1, "Name": "new"}]
+
+    assert join([{"ItemID": 1}], Join(items, left_key="ItemID")) == [{"ItemID": 1, "Name": "new"}]
+    assert index_by(items, "ItemID") == {1: {"ItemID": 1, "Name": "new"}}
+
+
+def test_right_side_wins_key_collisions_and_later_stages_see_earlier_columns() -> None:
+    rows = [{"ID": 1, "Name": "left"}]
+    bases = [{"ID": 1, "Name": "right", "ItemID": 7}]
+    items = [{"ItemID": 7, "Rarity": 5}]
+
+    assert join(rows, Join(bases, left_key="ID"), Join(items, left_key="ItemID")) == [
+        {"ID": 1, "Name": "right", "ItemID": 7, "Rarity": 5}
+    ]
+
+
+def test_lookup_replaces_indexing_the_rows() -> None:
+    index = index_by(ITEMS, "ItemID")
+    looked_up: list[set[int]] = []
+
+    def lookup(item_ids: set[int]) -> dict[int, dict]:
+        looked_up.append(item_ids)
+        return {item_id: index[item_id] for item_id in item_ids if item_id in index}
+
+    inner = join(WEAPONS, Join((), left_key="ItemID", lookup=lookup))
+    left = join(WEAPONS, Join((), left_key="ItemID", how="left", lookup=lookup))
+
+    assert inner == join(WEAPONS, Join(ITEMS, left_key="ItemID"))
+    assert left == join(WEAPONS, Join(ITEMS, left_key="ItemID", how="left"))
+    # Once per join, with every left key value
+    assert looked_up == [{1, 2, 3}, {1, 2, 3}]
+
+
+def test_lookup_cannot_collect_many() -> None:
+    with pytest.raises(ValueError, match="lookup"):
+        Join((), left_key="ID", many="skins", lookup=lambda _: {})
+
+
+def test_matches_merge_dicts_by_key_for_matched_rows() -> None:
+    merged = merge_dicts_by_key([WEAPONS, ITEMS], key="ItemID")
+    weapon_ids = {weapon["ItemID"] for weapon in WEAPONS}
+    item_ids = {item["ItemID"] for item in ITEMS}
+
+    # merge_dicts_by_key unions both sides, the join keeps the weapons that have an item
+    assert join(WEAPONS, Join(ITEMS, left_key="ItemID")) == [
+        row for row in merged if row["ItemID"] in weapon_ids & item_ids
+    ]
+
+
+def test_matches_chained_merge_dicts_by_key() -> None:
+    bases = [{"ID": 1, "Name": "a"}, {"ID": 2, "Name": "b"}]
+    battles = [{"ID": 2, "Hp": 200}, {"ID": 1, "Hp": 100}]
+    uis = [{"ID": 1, "Icon": "x"}, {"ID": 2, "Icon": "y"}]
+
+    assert join(bases, Join(battles, left_key="ID"), Join(uis, left_key="ID")) == (
+        merge_dicts_by_key([bases, battles, uis], key="ID")
+    )
+
+
+def test_merge_dicts_by_different_keys() -> None:
+    avatars = [{"ID": 1, "Hp": 100}, {"ID": 3, "Hp": 300}]
+
+    assert merge_dicts_by_different_keys({"ID": avatars, "ItemID": ITEMS}) == [
+        {"ID": 1, "Hp": 100, "ItemID": 1, "Name": "a", "Rarity": 4}
+    ]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+
+import orjson
+import pytest
+
+from hb_data.common.parsing import ParseExecutor
+from scripts.generate_textmaps import _strip_text_map, _StrippedTextMap, _TextMapStripper
+
+TEXT_MAP = {str(i): f"Text {i}" for i in range(1000)}
+KEYS = frozenset(str(i) for i in range(0, 1000, 7))
+CONTENT = orjson.dumps(TEXT_MAP, option=orjson.OPT_INDENT_2) + b"\n"
+
+
+async def _strip_in_chunks(chunk_size: int, parser: ParseExecutor | None) -> _StrippedTextMap:
+    stripper = _TextMapStripper(KEYS, find_value="Text 500", parser=parser)
+    for start in range(0, len(CONTENT), chunk_size):
+        await stripper.feed(CONTENT[start : start + chunk_size])
+    return await stripper.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 13, 64, 4096, len(CONTENT) - 1, len(CONTENT)])
+@pytest.mark.parametrize("threshold", [None, 1, 1024])
+def test_streamed_strip_matches_one_shot(chunk_size: int, threshold: int | None) -> None:
+    async def strip() -> _StrippedTextMap:
+        if threshold is None:
+            return await _strip_in_chunks(chunk_size, None)
+        async with ParseExecutor(max_workers=2, threshold=threshold) as parser:
+            return await _strip_in_chunks(chunk_size, parser)
+
+    expected = _strip_text_map(CONTENT, orjson.dumps(sorted(KEYS)), "Text 500")
+    assert asyncio.run(strip()) == expected
+    assert expected.scanned == len(TEXT_MAP)
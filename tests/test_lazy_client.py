@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from hb_data import ZZZClient
+from hb_data.common.text_map import TextMapMode
+from hb_data.zzz import Language
+
+
+@pytest.mark.usefixtures("data_dir")
+@pytest.mark.parametrize("mode", [TextMapMode.EAGER, TextMapMode.COMPACT, TextMapMode.MAPPED])
+def test_reads_text_maps_prepare_did_not_name(mode: TextMapMode) -> None:
+    async def main() -> None:
+        async with ZZZClient(lazy=True, text_map_mode=mode) as client:
+            await client.prepare(client.get_weapons, langs=[Language.EN])
+            weapons = client.get_weapons(lang=Language.JA)
+            untranslated = client.get_weapons(lang=None)
+
+            assert weapons
+            assert all(
+                weapon.name != hashed.name
+                for weapon, hashed in zip(weapons, untranslated, strict=True)
+            )
+            assert client.get_weapons(lang=Language.JA) == weapons
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_translate_reads_a_missing_text_map() -> None:
+    async def main() -> None:
+        async with ZZZClient(lazy=True) as client:
+            await client.prepare(client.get_weapons, langs=[Language.EN])
+            text_map_hash = client.get_weapons(lang=None)[0].name
+
+            assert client.translate(text_map_hash, lang=Language.KO) != text_map_hash
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_missing_text_map_asks_for_prepare() -> None:
+    async def main() -> None:
+        async with ZZZClient(lazy=True) as client:
+            await client.prepare(client.get_weapons, langs=[Language.EN])
+            client._get_file_path(client._get_text_map_url(Language.JA)).unlink()
+
+            with pytest.raises(RuntimeError, match="prepare"):
+                client.get_weapons(lang=Language.JA)
+
+    asyncio.run(main())
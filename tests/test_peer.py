@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+
+from hb_data import GIClient, PeerCacheServer
+from hb_data.common.scheduler import DownloadStatus
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+    from yarl import URL
+
+TABLES = {"AvatarExcelConfigData": b'[{"id": 1}]', "AvatarSkillExcelConfigData": b'[{"id": 2}]'}
+
+
+def _get_urls(client: GIClient) -> list[URL]:
+    return [client._get_data_url(file_name) for file_name in TABLES]
+
+
+def test_peer_serves_downloaded_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def serve_upstream(request: web.Request) -> web.Response:  # ruff: ignore[unused-async]
+        return web.Response(body=TABLES[request.match_info["table"]])
+
+    async def main() -> None:
+        upstream = web.Application()
+        upstream.router.add_get("/gi/{path:.+}/{table}.json", serve_upstream)
+        async with TestServer(upstream) as upstream_server:
+            # The serving node downloads from upstream
+            monkeypatch.chdir(tmp_path / "a")
+            upstream_url = upstream_server.make_url("/gi")
+            async with GIClient(lazy=True, upstream_url=upstream_url) as client:
+                results = await client._download_files(_get_urls(client))
+                assert {result.status for result in results} == {DownloadStatus.DOWNLOADED}
+            # Not in the manifest
+            (tmp_path / "a" / ".hb_data" / "gi" / "snapshot.bin").write_bytes(b"snapshot")
+
+        async with PeerCacheServer(directory=tmp_path / "a" / ".hb_data", port=0) as server:
+            # Another node downloads from the serving node
+            monkeypatch.chdir(tmp_path / "b")
+            peer_url = server.url / "gi"
+            async with GIClient(lazy=True, upstream_url=peer_url, text_map_url=peer_url) as client:
+                results = await client._download_files(_get_urls(client))
+                assert {result.status for result in results} == {DownloadStatus.DOWNLOADED}
+                data_dir = tmp_path / "b" / ".hb_data" / "gi"
+                for file_name, content in TABLES.items():
+                    assert (data_dir / f"{file_name}.json").read_bytes() == content
+
+                results = await client._download_files(_get_urls(client), refresh=True)
+                assert {result.status for result in results} == {DownloadStatus.NOT_MODIFIED}
+
+            async with aiohttp.ClientSession() as session:
+                url = peer_url / "ExcelBinOutput" / "AvatarExcelConfigData.json"
+                async with session.get(url) as response:
+                    assert response.status == 200
+                    etag = response.headers[hdrs.ETAG]
+                async with session.get(url, headers={hdrs.IF_NONE_MATCH: etag}) as response:
+                    assert response.status == 304
+
+                for path in ("snapshot.bin", "Missing.json", "ExcelBinOutput/Missing.json"):
+                    async with session.get(peer_url / path) as response:
+                        assert response.status == 404
+                async with session.get(peer_url / ".manifest.json") as response:
+                    assert response.status == 200
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    asyncio.run(main())
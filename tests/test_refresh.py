@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+from typing import TYPE_CHECKING
+
+import orjson
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from hb_data import GIClient
+from hb_data.common.generation import DataGeneration
+from hb_data.common.text_map import TextMapMode
+from hb_data.common.text_map_file import MappedTextMap, write_text_map_file
+from hb_data.gi import Language
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def _rename_first_character(upstream: Path) -> str:
+    """Rename the first character in the upstream English text map, returns its hash."""
+    characters = orjson.loads((upstream / "AvatarExcelConfigData.json").read_bytes())
+    text_map_hash = str(
+        next(row for row in characters if row.get("useType") == "AVATAR_FORMAL")["nameTextMapHash"]
+    )
+    path = upstream / "TextMapEN.json"
+    text_map = orjson.loads(path.read_bytes())
+    text_map[text_map_hash] = "Renamed"
+    path.write_bytes(orjson.dumps(text_map))
+    return text_map_hash
+
+
+def test_pinned_reader_keeps_the_replaced_generation(
+    fixtures_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    upstream = tmp_path / "upstream"
+    shutil.copytree(fixtures_dir / ".hb_data" / "gi", upstream)
+
+    async def serve_upstream(request: web.Request) -> web.FileResponse:  # ruff: ignore[unused-async]
+        path = upstream / request.match_info["file_name"]
+        if not path.exists():
+            raise web.HTTPNotFound
+        return web.FileResponse(path)
+
+    async def main() -> None:
+        app = web.Application()
+        app.router.add_get("/gi/{path:.*}/{file_name}", serve_upstream)
+        app.router.add_get("/gi/{file_name}", serve_upstream)
+        async with TestServer(app) as server:
+            url = server.make_url("/gi")
+            async with GIClient(
+                upstream_url=url, text_map_url=url, text_map_mode=TextMapMode.MAPPED
+            ) as client:
+                await client.download(langs=[Language.EN])
+                name = client.get_characters()[0].name
+                assert not await client.refresh()
+
+                text_map_hash = _rename_first_character(upstream)
+                with client._pinned() as previous:
+                    text_map = previous.mapped_text_maps[Language.EN]
+                    assert await client.refresh()
+                    # Still pinned to the previous generation, its text map still mapped
+                    assert client._generation is previous
+                    assert client.get_characters()[0].name == name
+                    assert client.translate(text_map_hash, lang=Language.EN) == name
+                    assert text_map[text_map_hash] == name
+
+                # Closed once its last reader finished
+                assert previous.retired
+                assert not previous.mapped_text_maps
+                assert text_map._buffer.closed
+                assert client.get_characters()[0].name == "Renamed"
+                assert client.translate(text_map_hash, lang=Language.EN) == "Renamed"
+
+    (tmp_path / "node").mkdir()
+    monkeypatch.chdir(tmp_path / "node")
+    asyncio.run(main())
+
+
+def test_retired_generation_is_closed_with_its_last_pin(tmp_path: Path) -> None:
+    path = tmp_path / "TextMapEN.bin"
+    write_text_map_file(path, {"1": "a"})
+    generation = DataGeneration(mapped_text_maps={"EN": MappedTextMap.open(path)})
+    text_map = generation.mapped_text_maps["EN"]
+
+    assert generation.acquire()
+    generation.retire()
+    assert not text_map._buffer.closed
+    generation.release()
+    assert text_map._buffer.closed
+
+    # Too late to pin it, readers pin the generation that replaced it instead
+    assert not generation.acquire()
+    assert generation.pins == 0
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from yarl import URL
+
+from hb_data import GIClient
+from hb_data.common.scheduler import DownloadScheduler, DownloadStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from pathlib import Path
+
+
+def _flaky(failures: int, error: Exception) -> tuple[list[int], Callable[[], Awaitable[str]]]:
+    calls: list[int] = []
+
+    async def func() -> str:
+        calls.append(1)
+        await asyncio.sleep(0)
+        if len(calls) <= failures:
+            raise error
+        return "ok"
+
+    return calls, func
+
+
+def test_retries_transient_errors() -> None:
+    calls, func = _flaky(2, aiohttp.ClientConnectionError())
+    scheduler = DownloadScheduler(max_retries=3, backoff_base=0)
+
+    assert asyncio.run(scheduler.run(URL("https://a.test/x"), func)) == "ok"
+    assert len(calls) == 3
+
+
+def test_gives_up_once_retries_are_exhausted() -> None:
+    calls, func = _flaky(10, aiohttp.ClientConnectionError())
+    scheduler = DownloadScheduler(max_retries=2, backoff_base=0)
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(scheduler.run(URL("https://a.test/x"), func))
+    assert len(calls) == 3
+
+
+def test_does_not_retry_permanent_errors() -> None:
+    error = aiohttp.ClientResponseError(None, (), status=404)  # pyright: ignore[reportArgumentType]
+    calls, func = _flaky(10, error)
+    scheduler = DownloadScheduler(max_retries=3, backoff_base=0)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(scheduler.run(URL("https://a.test/x"), func))
+    assert len(calls) == 1
+
+
+def test_backoff_is_full_jitter_capped_at_backoff_max() -> None:
+    scheduler = DownloadScheduler(backoff_base=0.5, backoff_max=3.0)
+
+    for attempt, bound in ((0, 0.5), (1, 1.0), (2, 2.0), (3, 3.0), (10, 3.0)):
+        delays = [scheduler._get_backoff(attempt) for _ in range(500)]
+        assert all(0 <= delay <= bound for delay in delays)
+        # Full jitter spreads delays over the whole range rather than around the bound
+        assert min(delays) < bound / 4
+        assert max(delays) > bound * 3 / 4
+
+
+def test_limits_concurrency_per_host() -> None:
+    scheduler = DownloadScheduler(limit_per_host=2)
+    running: dict[str, int] = {"a.test": 0, "b.test": 0}
+    peaks: dict[str, int] = {"a.test": 0, "b.test": 0}
+    peak_total = 0
+
+    def request(host: str) -> Callable[[], Awaitable[None]]:
+        async def func() -> None:
+            nonlocal peak_total
+            running[host] += 1
+            peaks[host] = max(peaks[host], running[host])
+            peak_total = max(peak_total, sum(running.values()))
+            await asyncio.sleep(0.01)
+            running[host] -= 1
+
+        return func
+
+    async def main() -> None:
+        await asyncio.gather(
+            *(
+                scheduler.run(URL(f"https://{host}/{i}"), request(host))
+                for host in running
+                for i in range(6)
+            )
+        )
+
+    asyncio.run(main())
+    assert peaks == {"a.test": 2, "b.test": 2}
+    # Hosts don't wait on each other's limit
+    assert peak_total == 4
+
+
+def test_failed_download_does_not_affect_the_others(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    async def serve(request: web.Request) -> web.Response:  # ruff: ignore[unused-async]
+        if request.match_info["name"] == "missing.json":
+            raise web.HTTPNotFound
+        return web.json_response({"name": request.match_info["name"]})
+
+    async def main() -> list[tuple[str, DownloadStatus]]:
+        app = web.Application()
+        app.router.add_get("/{name}", serve)
+        async with TestServer(app) as server:
+            base_url = server.make_url("")
+            scheduler = DownloadScheduler(backoff_base=0)
+            async with scheduler, GIClient(lazy=True, scheduler=scheduler) as client:
+                urls = [base_url / "a.json", base_url / "missing.json", base_url / "b.json"]
+                results = await client._download_files(urls)
+        return [(result.url.name, result.status) for result in results]
+
+    assert asyncio.run(main()) == [
+        ("a.json", DownloadStatus.DOWNLOADED),
+        ("missing.json", DownloadStatus.FAILED),
+        ("b.json", DownloadStatus.DOWNLOADED),
+    ]
+    assert (tmp_path / ".hb_data" / "gi" / "b.json").exists()
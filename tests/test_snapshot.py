@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from hb_data import GIClient, HSRClient, ZZZClient
+from hb_data.common.snapshot import get_fingerprint, read_snapshot, write_snapshot
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+PAYLOAD = {"data": {"Table": [{"id": 1}]}}
+
+
+def _write(tmp_path: Path) -> tuple[list[Path], Path]:
+    sources = [tmp_path / "a.json", tmp_path / "b.json"]
+    for source in sources:
+        source.write_text('{"x": 1}')
+    snapshot = tmp_path / "snapshot.bin"
+    asyncio.run(write_snapshot(snapshot, asyncio.run(get_fingerprint(sources)), PAYLOAD))
+    return sources, snapshot
+
+
+def _read(sources: list[Path], snapshot: Path) -> dict[str, Any] | None:
+    return asyncio.run(read_snapshot(snapshot, asyncio.run(get_fingerprint(sources))))
+
+
+def test_reads_snapshot_of_unchanged_sources(tmp_path: Path) -> None:
+    sources, snapshot = _write(tmp_path)
+    assert _read(sources, snapshot) == PAYLOAD
+
+
+def test_size_change_invalidates_snapshot(tmp_path: Path) -> None:
+    sources, snapshot = _write(tmp_path)
+    stat = sources[0].stat()
+    sources[0].write_text('{"x": 10}')
+    # Same mtime, only the size tells the files apart
+    os.utime(sources[0], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _read(sources, snapshot) is None
+
+
+def test_mtime_change_invalidates_snapshot(tmp_path: Path) -> None:
+    sources, snapshot = _write(tmp_path)
+    stat = sources[1].stat()
+    os.utime(sources[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert _read(sources, snapshot) is None
+
+
+def test_other_sources_invalidate_snapshot(tmp_path: Path) -> None:
+    sources, snapshot = _write(tmp_path)
+    assert _read(sources[:1], snapshot) is None
+
+
+def test_missing_source_has_no_fingerprint(tmp_path: Path) -> None:
+    sources, _ = _write(tmp_path)
+    sources[0].unlink()
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(get_fingerprint(sources))
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path: Path) -> None:
+    sources, snapshot = _write(tmp_path)
+    snapshot.write_bytes(snapshot.read_bytes()[:20])
+    assert _read(sources, snapshot) is None
+
+
+def test_snapshots_are_opt_in_except_for_zzz() -> None:
+    assert not GIClient()._use_snapshot
+    assert not HSRClient()._use_snapshot
+    assert ZZZClient()._use_snapshot
+    assert GIClient(use_snapshot=True)._use_snapshot
+    assert not ZZZClient(use_snapshot=False)._use_snapshot
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from hb_data import GIClient, SQLiteTableStore, ZZZClient
+from hb_data.common.snapshot import SNAPSHOT_FILE_NAME, read_snapshot
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+ROWS = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 1, "name": "c"}, {"name": "d"}]
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[SQLiteTableStore]:
+    store = SQLiteTableStore(tmp_path / "tables.db")
+    yield store
+    store.close()
+
+
+def test_rows_round_trip(store: SQLiteTableStore) -> None:
+    store.put("gi/Table", ROWS, source="1:2")
+
+    assert "gi/Table" in store
+    assert list(store) == ["gi/Table"]
+    assert store.get_rows("gi/Table") == ROWS
+    assert store.get_source("gi/Table") == "1:2"
+    assert store.get_source("gi/Missing") is None
+
+
+def test_lookups_match_index_by(store: SQLiteTableStore) -> None:
+    store.put("gi/Table", ROWS)
+
+    assert store.is_indexed("gi/Table", "id")
+    # Later rows win
+    assert store.lookup("gi/Table", "id", 1) == {"id": 1, "name": "c"}
+    assert store.lookup("gi/Table", "id", 3) is None
+    # Not indexed, scans the table
+    assert not store.is_indexed("gi/Table", "name")
+    assert store.lookup("gi/Table", "name", "d") == {"name": "d"}
+    with pytest.raises(KeyError):
+        store.lookup("gi/Missing", "id", 1)
+
+
+@pytest.mark.parametrize("key", ["id", "name"])
+def test_lookup_many_matches_lookup(store: SQLiteTableStore, key: str) -> None:
+    store.put("gi/Table", ROWS)
+    values = [row[key] for row in ROWS if key in row] + ["missing"]
+
+    assert store.lookup_many("gi/Table", key, values) == {
+        value: row for value in values if (row := store.lookup("gi/Table", key, value)) is not None
+    }
+
+
+def test_lookup_many_takes_more_values_than_a_statement(store: SQLiteTableStore) -> None:
+    store.put("gi/Table", ROWS)
+
+    assert store.lookup_many("gi/Table", "id", range(5000)) == {
+        1: {"id": 1, "name": "c"},
+        2: {"id": 2, "name": "b"},
+    }
+
+
+def test_put_replaces_the_table(store: SQLiteTableStore) -> None:
+    store.put("gi/Table", ROWS, source="1:2")
+    store.put("gi/Table", [{"ID": 5}], source="3:4")
+
+    assert store.get_rows("gi/Table") == [{"ID": 5}]
+    assert store.get_source("gi/Table") == "3:4"
+    assert store.is_indexed("gi/Table", "ID")
+    assert not store.is_indexed("gi/Table", "id")
+    assert store.lookup("gi/Table", "ID", 5) == {"ID": 5}
+
+
+def test_tables_outlive_the_store(tmp_path: Path, store: SQLiteTableStore) -> None:
+    store.put("gi/Table", ROWS, source="1:2")
+
+    reopened = SQLiteTableStore(tmp_path / "tables.db")
+    assert reopened.get_source("gi/Table") == "1:2"
+    assert reopened.lookup("gi/Table", "id", 2) == {"id": 2, "name": "b"}
+    reopened.close()
+
+
+CATALOGS = {
+    GIClient: ("get_characters", "get_mw_items"),
+    ZZZClient: ("get_characters", "get_weapons"),
+}
+
+
+def _get_catalogs(client: GIClient | ZZZClient) -> list[Any]:
+    return [getattr(client, name)() for name in CATALOGS[type(client)]]
+
+
+@pytest.mark.usefixtures("data_dir")
+@pytest.mark.parametrize("client_cls", list(CATALOGS))
+def test_stored_tables_give_the_same_catalogs(
+    client_cls: type[GIClient | ZZZClient], store: SQLiteTableStore
+) -> None:
+    async def main() -> None:
+        async with client_cls(use_snapshot=False) as client:
+            await client.download()
+            expected = _get_catalogs(client)
+        async with client_cls(use_snapshot=False, table_store=store) as client:
+            await client.download()
+            assert _get_catalogs(client) == expected
+            assert len(list(store)) == len(client._checked_tables)
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_snapshot_only_records_the_sources_of_stored_tables(
+    store: SQLiteTableStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def main() -> None:
+        async with ZZZClient(table_store=store) as client:
+            await client.download()
+            expected = _get_catalogs(client)
+        payload = await read_snapshot(
+            client._data_dir / SNAPSHOT_FILE_NAME, client._snapshot_fingerprint
+        )
+        assert payload is not None
+        assert payload["data"] == {}
+        assert payload["table_sources"]
+        assert None not in payload["table_sources"].values()
+
+        # A restart with the same store restores the snapshot without storing any rows
+        with monkeypatch.context() as m:
+            m.setattr(store, "put", pytest.fail)
+            async with ZZZClient(table_store=store) as client:
+                await client.download()
+                assert client._snapshot_fingerprint is not None
+                assert _get_catalogs(client) == expected
+
+        # Neither an empty store nor no store can restore it, they read the JSON files
+        empty_store = SQLiteTableStore(":memory:")
+        for table_store in (empty_store, None):
+            async with ZZZClient(table_store=table_store) as client:
+                await client.download()
+                assert _get_catalogs(client) == expected
+        assert list(empty_store)
+        empty_store.close()
+
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING
+
+import pytest
+
+from hb_data.common.text_map import CompactTextMaps
+from hb_data.common.text_map_file import (
+    TEXT_MAP_FILE_VERSION,
+    MappedTextMap,
+    encode_text_map,
+    ensure_text_map_file,
+    get_text_map_file_path,
+    write_text_map_file,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+TEXT_MAP = {"100": "Traveler", "2": "", "30": "旅行者", "ключ": "значение", "🌙": "Mond ✨"}
+
+
+@pytest.fixture
+def mapped(tmp_path: Path) -> Iterator[MappedTextMap]:
+    path = tmp_path / "TextMapEN.bin"
+    write_text_map_file(path, TEXT_MAP)
+    text_map = MappedTextMap.open(path)
+    yield text_map
+    text_map.close()
+
+
+def test_mapped_text_map_round_trip(mapped: MappedTextMap) -> None:
+    assert dict(mapped) == TEXT_MAP
+    assert len(mapped) == len(TEXT_MAP)
+    for key, value in TEXT_MAP.items():
+        assert mapped[key] == value
+        assert mapped.get(key) == value
+
+
+def test_mapped_text_map_misses(mapped: MappedTextMap) -> None:
+    for key in ("", "1", "1000", "3", "ключи", "￿"):
+        assert mapped.get(key) is None
+        assert mapped.get(key, "default") == "default"
+        assert key not in mapped
+        with pytest.raises(KeyError):
+            mapped[key]
+
+
+def test_empty_mapped_text_map(tmp_path: Path) -> None:
+    path = tmp_path / "TextMapEN.bin"
+    write_text_map_file(path, {})
+    text_map = MappedTextMap.open(path)
+
+    assert len(text_map) == 0
+    assert text_map.get("1") is None
+    text_map.close()
+
+
+@pytest.mark.parametrize("size", [0, 4, 12, 20, -1])
+def test_truncated_mapped_text_map_is_rejected(tmp_path: Path, size: int) -> None:
+    path = tmp_path / "TextMapEN.bin"
+    path.write_bytes(encode_text_map(TEXT_MAP)[:size])
+
+    with pytest.raises(ValueError):  # ruff: ignore[pytest-raises-too-broad]
+        MappedTextMap.open(path)
+
+
+def test_other_versions_are_rejected(tmp_path: Path) -> None:
+    content = bytearray(encode_text_map(TEXT_MAP))
+    struct.pack_into("<I", content, 8, TEXT_MAP_FILE_VERSION + 1)
+    path = tmp_path / "TextMapEN.bin"
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError, match="version"):
+        MappedTextMap.open(path)
+
+
+def test_other_files_are_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "TextMapEN.bin"
+    path.write_bytes(b'{"1": "a"}' * 10)
+
+    with pytest.raises(ValueError, match="Not a binary text map"):
+        MappedTextMap.open(path)
+
+
+def test_binary_file_follows_the_json_text_map(tmp_path: Path) -> None:
+    json_path = tmp_path / "TextMapEN.json"
+    json_path.write_text('{"1": "a"}')
+
+    assert ensure_text_map_file(json_path)
+    assert not ensure_text_map_file(json_path)
+
+    text_map = MappedTextMap.open(get_text_map_file_path(json_path))
+    assert dict(text_map) == {"1": "a"}
+    text_map.close()
+
+
+def test_compact_text_maps_round_trip() -> None:
+    text_maps = {"EN": TEXT_MAP, "JA": {"30": "旅人", "4": "四"}}
+    store = CompactTextMaps.from_builtins(CompactTextMaps.from_text_maps(text_maps).to_builtins())
+
+    assert store.languages == ["EN", "JA"]
+    for lang, text_map in text_maps.items():
+        assert store.to_dict(lang) == text_map
+        for key, value in text_map.items():
+            assert store.get(key, lang) == value
+
+
+def test_compact_text_maps_misses() -> None:
+    store = CompactTextMaps.from_text_maps({"EN": TEXT_MAP, "JA": {"4": "四"}})
+
+    # In the shared index, but not in this language
+    assert store.get("4", "EN") is None
+    assert store.get("100", "JA") is None
+    # In no language
+    assert store.index("5") is None
+    assert store.get("5", "EN") is None
+    assert store.get("100", "KO") is None
+
+
+def test_merged_replaces_languages_it_already_holds() -> None:
+    store = CompactTextMaps.from_text_maps({"EN": {"1": "old", "2": "two"}, "JA": {"1": "一"}})
+    merged = store.merged({"EN": {"1": "new", "3": "three"}, "KO": {"1": "일"}})
+
+    assert merged.to_dict("EN") == {"1": "new", "3": "three"}
+    assert merged.to_dict("JA") == {"1": "一"}
+    assert merged.to_dict("KO") == {"1": "일"}
+    # The original store is left as it was
+    assert store.to_dict("EN") == {"1": "old", "2": "two"}
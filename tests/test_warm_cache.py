@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from hb_data import GIClient, HSRClient, ZZZClient
+from hb_data.common.warm_cache import (
+    WARM_CACHE_FILE_NAME,
+    MappedRows,
+    publish_warm_cache,
+    read_generation,
+    read_warm_cache,
+)
+from hb_data.zzz import Language
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from hb_data.common.base_client import BaseClient
+
+ROWS = [{"id": 1, "name": "a"}, {"id": 2, "name": "旅行者", "tags": ["x"]}, {"id": 3}]
+
+
+def _publish(tmp_path: Path, **catalogs: bytes) -> Path:
+    path = tmp_path / WARM_CACHE_FILE_NAME
+    publish_warm_cache(
+        path,
+        {"Table": ROWS, "Empty": []},
+        {"Table": "1:2"},
+        {(name, (("lang", "EN"),)): content for name, content in catalogs.items()},
+    )
+    return path
+
+
+def test_tables_are_read_in_place(tmp_path: Path) -> None:
+    cache = read_warm_cache(_publish(tmp_path))
+    assert cache is not None
+    rows = cache.tables["Table"]
+
+    assert isinstance(rows, MappedRows)
+    assert list(rows) == ROWS
+    assert len(rows) == len(ROWS)
+    assert rows[1] == ROWS[1]
+    assert rows[-1] == ROWS[-1]
+    assert rows[1:] == ROWS[1:]
+    with pytest.raises(IndexError):
+        rows[3]
+    assert list(cache.tables["Empty"]) == []
+    assert cache.table_sources == {"Table": "1:2"}
+
+
+def test_catalogs_are_decoded_on_demand(tmp_path: Path) -> None:
+    cache = read_warm_cache(_publish(tmp_path, get_items=b'[{"id": 1}]'))
+    assert cache is not None
+
+    assert list(cache.catalogs) == [("get_items", (("lang", "EN"),))]
+    assert cache.catalogs["get_items", (("lang", "EN"),)]() == [{"id": 1}]
+
+
+def test_generation_increases_with_every_publish(tmp_path: Path) -> None:
+    path = tmp_path / WARM_CACHE_FILE_NAME
+    assert read_generation(path) == 0
+
+    _publish(tmp_path)
+    _publish(tmp_path)
+    cache = read_warm_cache(path)
+
+    assert read_generation(path) == 2
+    assert cache is not None
+    assert cache.generation == 2
+
+
+@pytest.mark.parametrize("size", [0, 10, 30, -5])
+def test_truncated_cache_is_ignored(tmp_path: Path, size: int) -> None:
+    path = _publish(tmp_path)
+    path.write_bytes(path.read_bytes()[:size])
+
+    assert read_warm_cache(path) is None
+
+
+def test_other_files_are_ignored(tmp_path: Path) -> None:
+    path = tmp_path / WARM_CACHE_FILE_NAME
+    path.write_bytes(b"\x80\x05" + b"\x00" * 100)
+
+    assert read_warm_cache(path) is None
+    assert read_generation(path) == 0
+
+
+async def _read(client: BaseClient) -> None:
+    await client.read_text_maps()
+    await client.read_data()
+
+
+@pytest.mark.usefixtures("data_dir")
+def test_reader_gets_the_publishers_catalogs() -> None:
+    async def main() -> None:
+        async with ZZZClient(lazy=True, use_snapshot=False) as publisher:
+            await _read(publisher)
+            characters = publisher.get_characters(lang=Language.DE)
+            rarities = publisher.get_rarity_map()
+            generation = await publisher.publish_warm_cache()
+
+        async with ZZZClient(lazy=True) as reader:
+            assert reader.get_published_generation() == generation
+            assert await reader.load_warm_cache()
+            assert not await reader.load_warm_cache()
+            assert reader.warm_cache_generation == generation
+            assert isinstance(reader._get_table("ItemTemplateTb"), MappedRows)
+
+            published = reader.get_characters(lang=Language.DE)
+            assert published == characters
+            # Equality alone would let e.g. plain ints pass for IntEnums
+            assert type(published[0].element) is type(characters[0].element)
+            assert type(published[0].skins[0]) is type(characters[0].skins[0])
+            assert reader.get_rarity_map() == rarities
+            # Not published, built from the mapped tables
+            async with ZZZClient(lazy=True, use_snapshot=False) as client:
+                await _read(client)
+                assert reader.get_weapons() == client.get_weapons()
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("data_dir")
+@pytest.mark.parametrize("client_cls", [GIClient, HSRClient])
+def test_unpublished_catalogs_are_built_from_the_published_tables(
+    client_cls: type[GIClient | HSRClient],
+) -> None:
+    lang = list(client_cls._LANGUAGE)[-1]
+
+    async def main() -> None:
+        async with client_cls(lazy=True) as publisher:
+            await _read(publisher)
+            characters = publisher.get_characters()
+            await publisher.publish_warm_cache()
+            translated = publisher.get_characters(lang=lang)
+
+        async with client_cls(lazy=True) as reader:
+            assert await reader.load_warm_cache()
+            assert reader.get_characters() == characters
+            assert reader.get_characters(lang=lang) == translated
+
+    asyncio.run(main())